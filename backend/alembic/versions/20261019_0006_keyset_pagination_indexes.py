@@ -0,0 +1,31 @@
+"""Indexes backing keyset pagination on players, users and registrations
+
+Revision ID: 20261019_0006
+Revises: 20260810_0005
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "20261019_0006"
+down_revision: Union[str, None] = "20260810_0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_players_event_id_id", "players", ["event_id", "id"])
+    op.create_index("ix_users_created_at_id", "users", ["created_at", "id"])
+    op.create_index(
+        "ix_registrations_event_registered_id",
+        "player_registrations",
+        ["event_id", "registered_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_registrations_event_registered_id", table_name="player_registrations")
+    op.drop_index("ix_users_created_at_id", table_name="users")
+    op.drop_index("ix_players_event_id_id", table_name="players")
@@ -0,0 +1,50 @@
+"""Move auction state spin/last_result out of raw_firestore into columns
+
+Revision ID: 20261019_0007
+Revises: 20261019_0006
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "20261019_0007"
+down_revision: Union[str, None] = "20261019_0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "auction_states",
+        sa.Column("spin", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    )
+    op.add_column(
+        "auction_states",
+        sa.Column("last_result", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    )
+    op.execute(
+        """
+        UPDATE auction_states
+        SET spin = raw_firestore -> 'spin',
+            last_result = raw_firestore -> 'last_result',
+            raw_firestore = raw_firestore - 'spin' - 'last_result'
+        WHERE raw_firestore ? 'spin' OR raw_firestore ? 'last_result'
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        UPDATE auction_states
+        SET raw_firestore = COALESCE(raw_firestore, '{}'::jsonb)
+            || jsonb_strip_nulls(jsonb_build_object('spin', spin, 'last_result', last_result))
+        WHERE spin IS NOT NULL OR last_result IS NOT NULL
+        """
+    )
+    op.drop_column("auction_states", "last_result")
+    op.drop_column("auction_states", "spin")
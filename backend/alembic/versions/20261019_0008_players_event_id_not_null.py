@@ -0,0 +1,33 @@
+"""Backfill players.event_id from categories and make it NOT NULL
+
+Revision ID: 20261019_0008
+Revises: 20261019_0007
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "20261019_0008"
+down_revision: Union[str, None] = "20261019_0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # category_id and categories.event_id are both NOT NULL, so every row resolves
+    op.execute(
+        """
+        UPDATE players AS p
+        SET event_id = c.event_id
+        FROM categories AS c
+        WHERE p.category_id = c.id AND p.event_id IS NULL
+        """
+    )
+    op.alter_column("players", "event_id", existing_type=sa.String(length=64), nullable=False)
+
+
+def downgrade() -> None:
+    op.alter_column("players", "event_id", existing_type=sa.String(length=64), nullable=True)
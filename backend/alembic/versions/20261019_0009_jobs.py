@@ -0,0 +1,53 @@
+"""Add jobs table for background work (bulk player upload)
+
+Revision ID: 20261019_0009
+Revises: 20261019_0008
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "20261019_0009"
+down_revision: Union[str, None] = "20261019_0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "jobs",
+        sa.Column("id", sa.String(length=64), primary_key=True),
+        sa.Column("kind", sa.String(length=64), nullable=False),
+        sa.Column("event_id", sa.String(length=64), nullable=True),
+        sa.Column("created_by", sa.String(length=128), nullable=True),
+        sa.Column("status", sa.String(length=32), nullable=False, server_default="queued"),
+        sa.Column("dedupe_key", sa.String(length=128), nullable=True),
+        sa.Column("total", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("processed", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("errors", postgresql.JSONB(), nullable=False, server_default="[]"),
+        sa.Column("result", postgresql.JSONB(), nullable=False, server_default="[]"),
+        sa.Column("payload", postgresql.JSONB(), nullable=True),
+        sa.Column("message", sa.Text(), nullable=True),
+        sa.Column("worker_id", sa.String(length=128), nullable=True),
+        sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_jobs_status_heartbeat", "jobs", ["status", "heartbeat_at"])
+    op.create_index("ix_jobs_dedupe_key", "jobs", ["dedupe_key"])
+    op.create_index("ix_jobs_event_id", "jobs", ["event_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_event_id", table_name="jobs")
+    op.drop_index("ix_jobs_dedupe_key", table_name="jobs")
+    op.drop_index("ix_jobs_status_heartbeat", table_name="jobs")
+    op.drop_table("jobs")
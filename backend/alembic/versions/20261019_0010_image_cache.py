@@ -0,0 +1,34 @@
+"""Add image_cache: Drive photo -> content hash -> Cloudinary URL
+
+Revision ID: 20261019_0010
+Revises: 20261019_0009
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "20261019_0010"
+down_revision: Union[str, None] = "20261019_0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "image_cache",
+        sa.Column("source_key", sa.String(length=255), primary_key=True),
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column("secure_url", sa.Text(), nullable=True),
+        sa.Column("content_type", sa.String(length=128), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_image_cache_content_hash", "image_cache", ["content_hash"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_image_cache_content_hash", table_name="image_cache")
+    op.drop_table("image_cache")
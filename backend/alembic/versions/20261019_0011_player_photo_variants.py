@@ -0,0 +1,32 @@
+"""Add players.photo_variants (sized WebP derivative URLs)
+
+Revision ID: 20261019_0011
+Revises: 20261019_0010
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "20261019_0011"
+down_revision: Union[str, None] = "20261019_0010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "players",
+        sa.Column(
+            "photo_variants",
+            postgresql.JSONB(astext_type=sa.Text()),
+            nullable=True,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("players", "photo_variants")
@@ -0,0 +1,40 @@
+"""payment_orders.checked_at and a partial index over open orders
+
+checked_at is the last gateway status check (webhook or reconciler sweep).
+The partial index covers only PENDING/ACTIVE orders, which the reconciler
+scans by age.
+
+Revision ID: 20261019_0012
+Revises: 20261019_0011
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "20261019_0012"
+down_revision: Union[str, None] = "20261019_0011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OPEN = sa.text("status IN ('PENDING', 'ACTIVE')")
+
+
+def upgrade() -> None:
+    op.add_column(
+        "payment_orders",
+        sa.Column("checked_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "ix_payment_orders_open_created",
+        "payment_orders",
+        ["created_at"],
+        postgresql_where=OPEN,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_payment_orders_open_created", table_name="payment_orders")
+    op.drop_column("payment_orders", "checked_at")
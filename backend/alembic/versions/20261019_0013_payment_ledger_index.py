@@ -0,0 +1,35 @@
+"""Payment ledger index in keyset order
+
+The organizer payment list pages newest first by (created_at DESC NULLS
+LAST, order_id DESC). The old (event_id, created_at) index only narrowed
+the rows, so every page sorted all of an event's payments; in the page
+order the first page is a bounded index scan.
+
+Revision ID: 20261019_0013
+Revises: 20261019_0012
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "20261019_0013"
+down_revision: Union[str, None] = "20261019_0012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index("ix_payment_orders_event_created", table_name="payment_orders")
+    op.create_index(
+        "ix_payment_orders_event_created",
+        "payment_orders",
+        ["event_id", sa.text("created_at DESC NULLS LAST"), sa.text("order_id DESC")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_payment_orders_event_created", table_name="payment_orders")
+    op.create_index("ix_payment_orders_event_created", "payment_orders", ["event_id", "created_at"])
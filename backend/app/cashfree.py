@@ -0,0 +1,190 @@
+"""
+Async client for the Cashfree PG orders API.
+
+One pooled httpx.AsyncClient per process, shared by every request, so a slow
+gateway can no longer block the event loop during a registration rush:
+
+  - strict connect/read timeouts; a call fails instead of hanging
+  - at most `concurrency` gateway calls in flight; a caller waits up to
+    `acquire_timeout` for a slot and then gets a "busy" error instead of
+    piling up behind the gateway
+  - GETs are retried on network errors, 429 and 5xx with exponential backoff
+    and jitter; order creation is only retried when the request never reached
+    the gateway, and a 409 reads the existing order, which is returned only
+    if it is ours (same customer and amount)
+
+base_url replaces the sandbox/production host (CASHFREE_BASE_URL), e.g. the
+local stub in app/cashfree_stub.py for offline load tests.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from typing import Any, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+API_VERSION = "2023-08-01"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Failures before any byte reached the gateway; retrying cannot double-create
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class CashfreeError(Exception):
+    """A gateway call failed; status_code is None when there was no response."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, body: str = "") -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.body = body
+
+
+def cashfree_host(mode: str) -> str:
+    return f"https://{'sandbox' if mode == 'sandbox' else 'api'}.cashfree.com"
+
+
+class CashfreeClient:
+    def __init__(
+        self,
+        *,
+        base_url: Optional[str] = None,
+        concurrency: int = 20,
+        timeout: float = 10.0,
+        connect_timeout: float = 3.0,
+        acquire_timeout: float = 5.0,
+        retries: int = 2,
+        backoff_seconds: float = 0.25,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.acquire_timeout = acquire_timeout
+        self.retries = retries
+        self.backoff_seconds = backoff_seconds
+        self.transport = transport
+        self.stats = {"requests": 0, "retries": 0}
+        self._client: Optional[httpx.AsyncClient] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def create_order(self, credentials: dict[str, Any], order: dict[str, Any]) -> dict[str, Any]:
+        """POST /pg/orders; order must carry our order_id."""
+        response = await self._request(
+            "POST", self._url(credentials, "/orders"), credentials, idempotent=False, json=order
+        )
+        if response.status_code == 409:
+            # A repeated call whose first attempt did land, or another order's id
+            existing = await self.get_order(credentials, order["order_id"])
+            if not self._same_order(existing, order):
+                raise CashfreeError(
+                    f"Cashfree order {order['order_id']} already exists for another payment",
+                    status_code=409,
+                    body=response.text,
+                )
+            return existing
+        return self._json(response, "create order")
+
+    @staticmethod
+    def _same_order(existing: dict[str, Any], order: dict[str, Any]) -> bool:
+        def customer(o):
+            return (o.get("customer_details") or {}).get("customer_id")
+
+        try:
+            same_amount = float(existing.get("order_amount")) == float(order.get("order_amount"))
+        except (TypeError, ValueError):
+            return False
+        return same_amount and customer(existing) == customer(order)
+
+    async def get_order(self, credentials: dict[str, Any], order_id: str) -> dict[str, Any]:
+        """GET /pg/orders/{order_id} (order_status, cf_order_id, ...)."""
+        response = await self._request(
+            "GET", self._url(credentials, f"/orders/{order_id}"), credentials, idempotent=True
+        )
+        return self._json(response, "fetch order")
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _url(self, credentials: dict[str, Any], path: str) -> str:
+        host = self.base_url or cashfree_host(credentials.get("cashfree_mode", "sandbox"))
+        return f"{host}/pg{path}"
+
+    @staticmethod
+    def _headers(credentials: dict[str, Any]) -> dict[str, str]:
+        return {
+            "accept": "application/json",
+            "x-api-version": API_VERSION,
+            "x-client-id": credentials["cashfree_app_id"],
+            "x-client-secret": credentials["cashfree_secret_key"],
+        }
+
+    def _pool(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            # Connections and the semaphore belong to one event loop
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout, pool=self.acquire_timeout),
+                limits=httpx.Limits(
+                    max_connections=self.concurrency, max_keepalive_connections=self.concurrency
+                ),
+                transport=self.transport,
+            )
+            self._slots = asyncio.Semaphore(self.concurrency)
+            self._loop = loop
+        return self._client
+
+    async def _request(
+        self, method: str, url: str, credentials: dict[str, Any], *, idempotent: bool, **kwargs
+    ) -> httpx.Response:
+        client = self._pool()
+        response: Optional[httpx.Response] = None
+        error: Optional[Exception] = None
+        for attempt in range(self.retries + 1):
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.acquire_timeout)
+            except asyncio.TimeoutError:
+                raise CashfreeError("Payment gateway is busy, please try again")
+            try:
+                self.stats["requests"] += 1
+                response = await client.request(method, url, headers=self._headers(credentials), **kwargs)
+                error = None
+            except NOT_SENT_ERRORS as e:
+                response, error = None, e
+            except httpx.TransportError as e:
+                if not idempotent:
+                    raise CashfreeError(f"Payment gateway did not respond: {e!r}") from e
+                response, error = None, e
+            finally:
+                self._slots.release()
+
+            if response is not None and not (idempotent and response.status_code in RETRY_STATUSES):
+                return response
+            if attempt < self.retries:
+                self.stats["retries"] += 1
+                logger.warning(f"Cashfree {method} {url} failed (attempt {attempt + 1}), retrying")
+                await asyncio.sleep(self._delay(attempt))
+        if response is not None:
+            return response
+        raise CashfreeError(f"Payment gateway unreachable: {error!r}") from error
+
+    def _delay(self, attempt: int) -> float:
+        base = self.backoff_seconds * (2 ** attempt)
+        return base + random.uniform(0, base / 2)
+
+    @staticmethod
+    def _json(response: httpx.Response, action: str) -> dict[str, Any]:
+        if response.status_code != 200:
+            raise CashfreeError(
+                f"Cashfree {action} failed: {response.status_code}",
+                status_code=response.status_code,
+                body=response.text,
+            )
+        return response.json()
@@ -0,0 +1,194 @@
+"""
+Local stand-in for the Cashfree PG orders API, for offline development and
+load tests of the payment flow.
+
+Run it and point the backend at it:
+
+  cd backend
+  PYTHONPATH=. python -m app.cashfree_stub --port 8089 --latency-ms 150 --error-rate 0.02 --auto-pay
+  CASHFREE_BASE_URL=http://localhost:8089 uvicorn server:app
+
+Implements POST /pg/orders and GET /pg/orders/{order_id} with the fields the
+backend reads, answers a duplicate order_id with 409 like the gateway, and
+adds latency (with jitter) and random 503s. With --auto-pay orders are PAID
+at once; otherwise POST /stub/orders/{order_id}/pay settles one. Either way
+a payment webhook signed with the order's client secret is posted to its
+order_meta.notify_url, like the gateway does.
+GET /stub/stats reports request counts and peak concurrency.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from app.payment_reconcile import webhook_signature
+
+WEBHOOK_TYPES = {
+    "PAID": ("PAYMENT_SUCCESS_WEBHOOK", "SUCCESS"),
+    "FAILED": ("PAYMENT_FAILED_WEBHOOK", "FAILED"),
+    "USER_DROPPED": ("PAYMENT_USER_DROPPED_WEBHOOK", "USER_DROPPED"),
+}
+
+
+def _error(status: int, message: str, code: str, kind: str) -> JSONResponse:
+    return JSONResponse({"message": message, "code": code, "type": kind}, status_code=status)
+
+
+async def send_webhook(order: dict, secret: str, outcome: str = "PAID", delay: float = 0) -> int | None:
+    """POST a signed payment webhook for the order to its notify_url; the status code."""
+    url = (order.get("order_meta") or {}).get("notify_url")
+    if not url:
+        return None
+    await asyncio.sleep(delay)
+    kind, payment_status = WEBHOOK_TYPES[outcome]
+    body = json.dumps({
+        "type": kind,
+        "event_time": datetime.now(timezone.utc).isoformat(),
+        "data": {
+            "order": {
+                "order_id": order["order_id"],
+                "cf_order_id": order["cf_order_id"],
+                "order_amount": order["order_amount"],
+                "order_currency": order["order_currency"],
+            },
+            "payment": {
+                "cf_payment_id": f"pay_{uuid.uuid4().hex[:12]}",
+                "payment_status": payment_status,
+                "payment_amount": order["order_amount"],
+            },
+        },
+    }).encode()
+    timestamp = str(int(datetime.now(timezone.utc).timestamp() * 1000))
+    headers = {
+        "content-type": "application/json",
+        "x-webhook-timestamp": timestamp,
+        "x-webhook-signature": webhook_signature(body, timestamp, secret),
+    }
+    try:
+        async with httpx.AsyncClient(timeout=10) as client:
+            return (await client.post(url, content=body, headers=headers)).status_code
+    except httpx.HTTPError:
+        return None
+
+
+def create_stub_app(
+    latency_ms: float = 0,
+    jitter_ms: float = 0,
+    error_rate: float = 0.0,
+    auto_pay: bool = False,
+) -> FastAPI:
+    app = FastAPI(title="Cashfree stub")
+    state = app.state
+    state.orders = {}
+    state.fail_next = 0  # tests: answer the next N requests with 503
+    state.latency_ms = latency_ms
+    state.stats = {"requests": 0, "active": 0, "max_active": 0, "errors": 0}
+    state.secrets = {}  # order_id -> client secret that created it (signs its webhooks)
+    cf_ids = itertools.count(1)
+
+    @app.middleware("http")
+    async def gateway_conditions(request: Request, call_next):
+        if request.url.path.startswith("/stub/"):
+            return await call_next(request)
+        stats = state.stats
+        stats["requests"] += 1
+        stats["active"] += 1
+        stats["max_active"] = max(stats["max_active"], stats["active"])
+        try:
+            delay = state.latency_ms + random.uniform(0, jitter_ms)
+            if delay:
+                await asyncio.sleep(delay / 1000)
+            if state.fail_next > 0 or random.random() < error_rate:
+                state.fail_next = max(0, state.fail_next - 1)
+                stats["errors"] += 1
+                return _error(503, "stub: service unavailable", "service_unavailable", "api_error")
+            if not (request.headers.get("x-client-id") and request.headers.get("x-client-secret")):
+                return _error(401, "authentication Failed", "request_failed", "authentication_error")
+            return await call_next(request)
+        finally:
+            stats["active"] -= 1
+
+    @app.post("/pg/orders")
+    async def create_order(request: Request):
+        body = await request.json()
+        order_id = body.get("order_id")
+        if not order_id or not body.get("order_amount") or not body.get("customer_details"):
+            return _error(400, "order_id, order_amount and customer_details are required",
+                          "request_invalid", "invalid_request_error")
+        if order_id in state.orders:
+            return _error(409, "order with same id is already present", "order_already_exists",
+                          "invalid_request_error")
+        now = datetime.now(timezone.utc)
+        order = {
+            "cf_order_id": str(next(cf_ids)),
+            "order_id": order_id,
+            "entity": "order",
+            "order_currency": body.get("order_currency", "INR"),
+            "order_amount": body["order_amount"],
+            "order_status": "PAID" if auto_pay else "ACTIVE",
+            "payment_session_id": f"session_stub_{uuid.uuid4().hex}",
+            "order_expiry_time": (now + timedelta(days=30)).isoformat(),
+            "customer_details": body["customer_details"],
+            "order_meta": body.get("order_meta") or {},
+            "created_at": now.isoformat(),
+        }
+        state.orders[order_id] = order
+        state.secrets[order_id] = request.headers["x-client-secret"]
+        if auto_pay:
+            # After the backend has had time to store the order it is creating
+            asyncio.get_running_loop().create_task(send_webhook(order, state.secrets[order_id], delay=1.0))
+        return order
+
+    @app.get("/pg/orders/{order_id}")
+    async def get_order(order_id: str):
+        order = state.orders.get(order_id)
+        if not order:
+            return _error(404, "order not found", "order_not_found", "invalid_request_error")
+        return order
+
+    @app.post("/stub/orders/{order_id}/pay")
+    async def pay_order(order_id: str, outcome: str = "PAID"):
+        """Settle a payment attempt (PAID, FAILED or USER_DROPPED) and send its webhook."""
+        order = state.orders.get(order_id)
+        if not order or outcome not in WEBHOOK_TYPES:
+            return _error(404, "order not found", "order_not_found", "invalid_request_error")
+        if outcome == "PAID":
+            order["order_status"] = "PAID"
+        webhook_status = await send_webhook(order, state.secrets.get(order_id, ""), outcome)
+        return {**order, "webhook_status": webhook_status}
+
+    @app.get("/stub/stats")
+    async def stub_stats():
+        return {**state.stats, "orders": len(state.orders)}
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local Cashfree PG stub")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Added to every gateway call")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Random extra latency, 0..N ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of calls answered with 503")
+    parser.add_argument("--auto-pay", action="store_true", help="Orders are PAID as soon as they are created")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    app = create_stub_app(args.latency_ms, args.jitter_ms, args.error_rate, args.auto_pay)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -25,6 +25,67 @@ class Settings:
         # firestore (default, current production) | postgres (staging/target)
         self.data_backend: str = os.getenv("DATA_BACKEND", "firestore").lower()
         self.database_url: str | None = os.getenv("DATABASE_URL")
+        # Optional streaming replica for read-heavy paths (boards, lists, analytics)
+        self.database_replica_url: str | None = os.getenv("DATABASE_REPLICA_URL") or None
+        # Connection pool — default | pgbouncer (transaction pooling in front of Postgres)
+        self.db_pool_profile: str = os.getenv("DB_POOL_PROFILE", "default").lower()
+        self.db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "5"))
+        self.db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+        self.db_pool_timeout: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+        self.db_pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+        self.db_pool_pre_ping: bool = (
+            os.getenv("DB_POOL_PRE_PING", "true").lower() != "false"
+        )
+        # Per-process cache for events/categories/teams/sponsors (0 disables)
+        self.read_cache_ttl_seconds: float = float(os.getenv("READ_CACHE_TTL_SECONDS", "10"))
+        self.read_cache_max_entries: int = int(os.getenv("READ_CACHE_MAX_ENTRIES", "2048"))
+        # Bulk-upload photo ingestion (Google Drive -> Cloudinary)
+        self.image_ingest_concurrency: int = int(os.getenv("IMAGE_INGEST_CONCURRENCY", "8"))
+        self.image_ingest_per_host: int = int(os.getenv("IMAGE_INGEST_PER_HOST", "4"))
+        self.image_ingest_retries: int = int(os.getenv("IMAGE_INGEST_RETRIES", "3"))
+        # Fetched photo bytes by sha256 (content-addressed; safe to delete)
+        self.image_cache_dir: Path = Path(
+            os.getenv("IMAGE_CACHE_DIR", str(ROOT_DIR / "image_cache"))
+        )
+        # Cashfree gateway calls: one pooled async client per worker
+        # (CASHFREE_BASE_URL replaces the sandbox/api host, e.g. app/cashfree_stub.py)
+        self.cashfree_base_url: str | None = os.getenv("CASHFREE_BASE_URL") or None
+        self.cashfree_timeout_seconds: float = float(os.getenv("CASHFREE_TIMEOUT_SECONDS", "10"))
+        self.cashfree_connect_timeout_seconds: float = float(
+            os.getenv("CASHFREE_CONNECT_TIMEOUT_SECONDS", "3")
+        )
+        self.cashfree_concurrency: int = int(os.getenv("CASHFREE_CONCURRENCY", "20"))
+        self.cashfree_retries: int = int(os.getenv("CASHFREE_RETRIES", "2"))
+        # Payment orders still PENDING/ACTIVE this long after creation are
+        # looked up on the gateway in batches (interval 0 disables the sweep)
+        self.payment_reconcile_interval_seconds: float = float(
+            os.getenv("PAYMENT_RECONCILE_INTERVAL_SECONDS", "60")
+        )
+        self.payment_reconcile_min_age_minutes: float = float(
+            os.getenv("PAYMENT_RECONCILE_MIN_AGE_MINUTES", "10")
+        )
+        self.payment_reconcile_max_age_hours: float = float(
+            os.getenv("PAYMENT_RECONCILE_MAX_AGE_HOURS", "48")
+        )
+        self.payment_reconcile_batch: int = int(os.getenv("PAYMENT_RECONCILE_BATCH", "100"))
+        # Firestore mode: team counters are recounted from sold players, this
+        # many teams per sweep, round-robin (interval 0 disables the sweep)
+        self.team_counter_reconcile_interval_seconds: float = float(
+            os.getenv("TEAM_COUNTER_RECONCILE_INTERVAL_SECONDS", "300")
+        )
+        self.team_counter_reconcile_batch: int = int(os.getenv("TEAM_COUNTER_RECONCILE_BATCH", "50"))
+        # Shared cache for multi-worker coherence (Redis protocol); unset = in-process
+        self.redis_url: str | None = os.getenv("REDIS_URL") or None
+        # Identical concurrent hot GETs (auction state, team lists, live boards)
+        # share one read; results are also reused for this long (0 = in-flight only)
+        self.hot_get_window_ms: float = float(os.getenv("HOT_GET_WINDOW_MS", "100"))
+        # Broadcast token -> event_id lookups (capped at expires_at; 5 s without REDIS_URL)
+        self.broadcast_token_cache_ttl_seconds: float = float(
+            os.getenv("BROADCAST_TOKEN_CACHE_TTL_SECONDS", "300")
+        )
+        self.broadcast_token_cache_size: int = int(
+            os.getenv("BROADCAST_TOKEN_CACHE_SIZE", "10000")
+        )
         self.firebase_credentials_path: str = os.getenv(
             "FIREBASE_CREDENTIALS_PATH",
             str(ROOT_DIR / "firebase-admin.json"),
@@ -34,6 +95,8 @@ class Settings:
             or os.getenv("FIREBASE_CREDENTIALS_JSON")
         )
         self.firebase_project_id: str | None = os.getenv("FIREBASE_PROJECT_ID")
+        # Verified ID tokens kept per worker (each until its exp); 0 disables
+        self.auth_token_cache_size: int = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))
         # Migration tooling
         self.migration_output_dir: Path = Path(
             os.getenv("MIGRATION_OUTPUT_DIR", str(ROOT_DIR / "migration_output"))
@@ -0,0 +1,244 @@
+"""
+Firebase ID-token verification with a local key set and a verified-token cache.
+
+firebase_auth.verify_id_token does an RSA verification per call (and a
+blocking cert fetch whenever Google's certs expire). Here the securetoken
+certificates are kept in memory and refreshed in a background thread before
+they expire, and a verified token is cached under its SHA-256 until its
+own exp, so a client polling or bidding with the same token pays for one
+verification per token lifetime.
+
+Checks mirror firebase_admin: RS256, kid in the current cert set,
+aud == project id, iss == https://securetoken.google.com/<project id>,
+iat/auth_time not in the future, exp not passed, non-empty sub.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+import jwt
+import requests
+from cryptography import x509
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_CERTS_URL = (
+    "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com"
+)
+ISSUER_PREFIX = "https://securetoken.google.com/"
+
+# Refresh this long before the certs' max-age runs out
+REFRESH_MARGIN_SECONDS = 300
+# Retry delay after a failed fetch; also the floor between refresh attempts
+MIN_REFRESH_INTERVAL_SECONDS = 60
+
+CertFetcher = Callable[[], tuple[dict[str, str], float]]
+
+
+class InvalidIdToken(Exception):
+    pass
+
+
+def fetch_google_certs(url: str = GOOGLE_CERTS_URL) -> tuple[dict[str, str], float]:
+    """kid -> PEM certificate map and its Cache-Control max-age in seconds."""
+    resp = requests.get(url, timeout=10)
+    resp.raise_for_status()
+    match = re.search(r"max-age=(\d+)", resp.headers.get("Cache-Control", ""))
+    return resp.json(), float(match.group(1)) if match else 3600.0
+
+
+class IdTokenVerifier:
+    def __init__(
+        self,
+        project_id: Optional[str],
+        *,
+        fetch_certs: CertFetcher = fetch_google_certs,
+        fallback: Optional[Callable[[str], dict[str, Any]]] = None,
+        max_entries: int = 10000,
+        background_refresh: bool = True,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.project_id = project_id
+        self.background_refresh = background_refresh
+        self._fetch_certs = fetch_certs
+        self._fallback = fallback
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._keys: dict[str, Any] = {}
+        self._keys_expire_at = 0.0
+        self._last_fetch_at = 0.0
+        self._refresher: Optional[threading.Thread] = None
+        self._cache: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    # --- key set ---------------------------------------------------------
+
+    def set_certificates(self, certs: dict[str, str], max_age: float) -> None:
+        keys = {
+            kid: x509.load_pem_x509_certificate(pem.encode()).public_key()
+            for kid, pem in certs.items()
+        }
+        with self._lock:
+            self._keys = keys
+            self._keys_expire_at = self._clock() + max_age
+
+    def refresh_keys(self) -> bool:
+        """Fetch the cert set now. False (and keep the old keys) on failure."""
+        self._last_fetch_at = self._clock()
+        try:
+            certs, max_age = self._fetch_certs()
+            self.set_certificates(certs, max_age)
+            return True
+        except Exception as e:
+            logger.warning(f"Firebase cert refresh failed: {e}")
+            return False
+
+    def start_background_refresh(self) -> None:
+        """Load the key set now and keep it fresh from a daemon thread."""
+        with self._lock:
+            if self._refresher is not None:
+                return
+            self._refresher = threading.Thread(
+                target=self._refresh_loop, name="firebase-cert-refresh", daemon=True
+            )
+        if not self._keys:
+            self.refresh_keys()
+        self._refresher.start()
+
+    def _refresh_loop(self) -> None:
+        while True:
+            wait = self._keys_expire_at - self._clock() - REFRESH_MARGIN_SECONDS
+            time.sleep(max(MIN_REFRESH_INTERVAL_SECONDS, wait))
+            self.refresh_keys()
+
+    def _key_for(self, kid: Optional[str]):
+        key = self._keys.get(kid) if kid else None
+        if key is None and self._clock() - self._last_fetch_at >= MIN_REFRESH_INTERVAL_SECONDS:
+            # Google rotated keys before our refresh ran
+            self.refresh_keys()
+            key = self._keys.get(kid) if kid else None
+        if key is None:
+            raise InvalidIdToken(f"ID token has unknown key id {kid!r}")
+        return key
+
+    # --- verification ----------------------------------------------------
+
+    def verify(self, token: str) -> dict[str, Any]:
+        """Decoded claims (with uid = sub), like firebase_auth.verify_id_token."""
+        digest = hashlib.sha256(token.encode()).hexdigest()
+        now = self._clock()
+        with self._lock:
+            entry = self._cache.get(digest)
+            if entry and entry[0] > now:
+                self._cache.move_to_end(digest)
+                self.hits += 1
+                return copy.deepcopy(entry[1])
+            self.misses += 1
+
+        claims = self._verify_uncached(token)
+
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)) and exp > now and self.max_entries > 0:
+            with self._lock:
+                self._cache[digest] = (float(exp), claims)
+                self._cache.move_to_end(digest)
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+        return copy.deepcopy(claims)
+
+    def _verify_uncached(self, token: str) -> dict[str, Any]:
+        if not self.project_id:
+            if self._fallback is None:
+                raise InvalidIdToken("Firebase project id is not configured")
+            return self._fallback(token)
+        if self.background_refresh and self._refresher is None:
+            self.start_background_refresh()
+        elif not self._keys and not self._last_fetch_at:
+            self.refresh_keys()
+
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.PyJWTError as e:
+            raise InvalidIdToken(f"Malformed ID token: {e}") from e
+        if header.get("alg") != "RS256":
+            raise InvalidIdToken("ID token has incorrect algorithm")
+        try:
+            claims = jwt.decode(
+                token,
+                self._key_for(header.get("kid")),
+                algorithms=["RS256"],
+                audience=self.project_id,
+                issuer=ISSUER_PREFIX + self.project_id,
+                # Time claims are checked below against our clock
+                options={"verify_exp": False, "verify_iat": False, "verify_nbf": False},
+            )
+        except jwt.PyJWTError as e:
+            raise InvalidIdToken(f"Invalid ID token: {e}") from e
+
+        now = self._clock()
+        sub = claims.get("sub")
+        if not isinstance(sub, str) or not sub or len(sub) > 128:
+            raise InvalidIdToken("ID token has invalid subject")
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)) or exp <= now:
+            raise InvalidIdToken("ID token has expired")
+        iat = claims.get("iat")
+        if not isinstance(iat, (int, float)) or iat > now:
+            raise InvalidIdToken("ID token has invalid issued-at time")
+        auth_time = claims.get("auth_time")
+        if isinstance(auth_time, (int, float)) and auth_time > now:
+            raise InvalidIdToken("ID token auth_time is in the future")
+        claims["uid"] = sub
+        return claims
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "local_keys": bool(self.project_id),
+                "key_count": len(self._keys),
+                "keys_expire_in_seconds": max(0, round(self._keys_expire_at - self._clock())),
+                "cached_tokens": len(self._cache),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+def _default_project_id() -> Optional[str]:
+    from app.core.config import get_settings
+
+    project_id = get_settings().firebase_project_id
+    if project_id:
+        return project_id
+    try:
+        import firebase_admin
+
+        return firebase_admin.get_app().project_id
+    except Exception:
+        return None
+
+
+_verifier: Optional[IdTokenVerifier] = None
+
+
+def get_id_token_verifier() -> IdTokenVerifier:
+    global _verifier
+    if _verifier is None:
+        from app.core.config import get_settings
+        from firebase_admin import auth
+
+        _verifier = IdTokenVerifier(
+            _default_project_id(),
+            fallback=auth.verify_id_token,
+            max_entries=get_settings().auth_token_cache_size,
+        )
+    return _verifier
@@ -10,7 +10,9 @@ import uuid
 from datetime import datetime, timezone
 from typing import Any, Optional
 
-from sqlalchemy import Select, select
+from sqlalchemy import Select, and_, case, func, insert, literal, or_, select, update
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.dialects.postgresql import JSONB, aggregate_order_by, insert as pg_insert
 from sqlalchemy.orm import Session
 
 from app.data.serializers import (
@@ -18,6 +20,7 @@ from app.data.serializers import (
     bid_to_dict,
     category_to_dict,
     event_to_dict,
+    job_to_dict,
     payment_to_dict,
     player_to_dict,
     registration_to_dict,
@@ -25,13 +28,25 @@ from app.data.serializers import (
     team_to_dict,
     user_to_dict,
 )
-from app.db.session import get_session_factory
+from app.db.session import get_read_session_factory, get_session_factory
+from app.pagination import decode_cursor, encode_cursor
+from app.read_cache import (
+    categories_scope,
+    event_scope,
+    read_cache,
+    sponsors_scope,
+    team_scope,
+    teams_scope,
+)
 from app.models import (
+    OPEN_PAYMENT_STATUSES,
     AuctionState,
     BankDetails,
     Bid,
     Category,
     Event,
+    ImageCacheEntry,
+    Job,
     PaymentGatewaySettings,
     PaymentOrder,
     Player,
@@ -48,6 +63,39 @@ def _session() -> Session:
     return get_session_factory()()
 
 
+def _read_session() -> Session:
+    """Read-only queries: replica when configured, primary after a write in this request."""
+    return get_read_session_factory()()
+
+
+def _status_list(status: Optional[str]) -> list[str]:
+    if not status:
+        return []
+    return [x.strip().lower() for x in str(status).split(",") if x.strip()]
+
+
+def _newest_first_after(q: Select, ts_col, id_col, cursor: Optional[str]) -> Select:
+    """Order by (ts DESC NULLS LAST, id DESC) and start after the cursor row."""
+    q = q.order_by(ts_col.desc().nullslast(), id_col.desc())
+    if not cursor:
+        return q
+    ts_raw, last_id = decode_cursor(cursor)[:2]
+    if ts_raw is None:
+        return q.where(ts_col.is_(None), id_col < last_id)
+    ts = datetime.fromisoformat(ts_raw)
+    return q.where(
+        or_(ts_col < ts, and_(ts_col == ts, id_col < last_id), ts_col.is_(None))
+    )
+
+
+def _newest_first_cursor(rows: list, limit: int, ts_attr: str, id_attr: str) -> Optional[str]:
+    if len(rows) <= limit:
+        return None
+    last = rows[limit - 1]
+    ts = getattr(last, ts_attr)
+    return encode_cursor(ts.isoformat() if ts else None, getattr(last, id_attr))
+
+
 def get_user(uid: str) -> Optional[dict[str, Any]]:
     with _session() as s:
         u = s.get(User, uid)
@@ -101,6 +149,19 @@ def list_users(order_desc: bool = True) -> list[dict[str, Any]]:
         return [user_to_dict(u) for u in s.scalars(q).all()]
 
 
+def list_users_page(
+    limit: int, cursor: Optional[str] = None
+) -> tuple[list[dict[str, Any]], Optional[str]]:
+    """Newest users first, keyset-paginated on (created_at, id)."""
+    with _read_session() as s:
+        q = _newest_first_after(select(User), User.created_at, User.id, cursor)
+        rows = list(s.scalars(q.limit(limit + 1)).all())
+        return (
+            [user_to_dict(u) for u in rows[:limit]],
+            _newest_first_cursor(rows, limit, "created_at", "id"),
+        )
+
+
 def update_user(uid: str, fields: dict[str, Any]) -> dict[str, Any]:
     with _session() as s:
         u = s.get(User, uid)
@@ -132,7 +193,7 @@ def delete_user(uid: str) -> None:
 
 
 def list_events_for_user(uid: str, role: str) -> list[dict[str, Any]]:
-    with _session() as s:
+    with _read_session() as s:
         q = select(Event).order_by(Event.created_at.desc().nullslast())
         if role == "event_organizer":
             q = q.where(Event.created_by == uid)
@@ -140,7 +201,13 @@ def list_events_for_user(uid: str, role: str) -> list[dict[str, Any]]:
 
 
 def get_event(event_id: str) -> Optional[dict[str, Any]]:
-    with _session() as s:
+    return read_cache.get_or_load(
+        "event", event_id, [event_scope(event_id)], lambda: _load_event(event_id)
+    )
+
+
+def _load_event(event_id: str) -> Optional[dict[str, Any]]:
+    with _read_session() as s:
         e = s.get(Event, event_id)
         return event_to_dict(e) if e else None
 
@@ -169,6 +236,7 @@ def create_event(data: dict[str, Any]) -> dict[str, Any]:
         s.add(e)
         s.commit()
         s.refresh(e)
+        read_cache.invalidate(event_scope(e.id))
         return event_to_dict(e)
 
 
@@ -181,10 +249,17 @@ def update_event(event_id: str, fields: dict[str, Any]) -> None:
             if hasattr(e, k):
                 setattr(e, k, v)
         s.commit()
+    read_cache.invalidate(event_scope(event_id))
 
 
 def list_categories(event_id: str) -> list[dict[str, Any]]:
-    with _session() as s:
+    return read_cache.get_or_load(
+        "categories", event_id, [categories_scope(event_id)], lambda: _load_categories(event_id)
+    )
+
+
+def _load_categories(event_id: str) -> list[dict[str, Any]]:
+    with _read_session() as s:
         rows = s.scalars(select(Category).where(Category.event_id == event_id)).all()
         return [category_to_dict(c) for c in rows]
 
@@ -210,6 +285,7 @@ def create_category(data: dict[str, Any]) -> dict[str, Any]:
         s.add(c)
         s.commit()
         s.refresh(c)
+        read_cache.invalidate(categories_scope(c.event_id))
         return category_to_dict(c)
 
 
@@ -230,55 +306,82 @@ def update_category(category_id: str, fields: dict[str, Any]) -> dict[str, Any]:
                 p.base_price = fields["base_price"]
         s.commit()
         s.refresh(c)
+        read_cache.invalidate(categories_scope(c.event_id))
         return category_to_dict(c)
 
 
 def delete_category(category_id: str) -> None:
     with _session() as s:
         players = s.scalars(select(Player).where(Player.category_id == category_id)).all()
+        sold_team_ids = {p.sold_to_team_id for p in players if p.sold_to_team_id}
         for p in players:
             s.delete(p)
         c = s.get(Category, category_id)
+        event_id = c.event_id if c else None
         if c:
             s.delete(c)
         s.commit()
+        read_cache.invalidate(
+            categories_scope(event_id),
+            teams_scope(event_id),
+            *(team_scope(tid) for tid in sold_team_ids),
+        )
+
+
+def _invalidate_team(team_id: Optional[str], event_id: Optional[str]) -> None:
+    """Team purse/count changed (sale, release, edit): drop get_team and list_teams."""
+    read_cache.invalidate(team_scope(team_id), teams_scope(event_id))
 
 
 def list_teams(event_id: str) -> list[dict[str, Any]]:
-    with _session() as s:
-        teams = s.scalars(select(Team).where(Team.event_id == event_id)).all()
-        out = []
-        for t in teams:
-            # Recompute spent like list endpoint does
-            sold = s.scalars(
-                select(Player).where(
-                    Player.sold_to_team_id == t.id, Player.status == "sold"
-                )
-            ).all()
-            spent = sum((p.sold_price or 0) for p in sold)
-            t.spent = spent
-            t.remaining = t.budget - spent
-            t.players_count = len(sold)
-            out.append(team_to_dict(t))
-        s.commit()
-        return out
+    return read_cache.get_or_load(
+        "teams", event_id, [teams_scope(event_id)], lambda: _load_teams(event_id)
+    )
+
+
+def _teams_with_totals(s, where) -> list[dict[str, Any]]:
+    """Teams matching `where` with spent/remaining/players_count recomputed from sold players (read-only)."""
+    team_ids = select(Team.id).where(where)
+    sold = (
+        select(
+            Player.sold_to_team_id.label("team_id"),
+            func.count().label("players_count"),
+            func.coalesce(func.sum(Player.sold_price), 0).label("spent"),
+        )
+        .where(Player.status == "sold", Player.sold_to_team_id.in_(team_ids))
+        .group_by(Player.sold_to_team_id)
+        .subquery()
+    )
+    rows = s.execute(
+        select(Team, sold.c.players_count, sold.c.spent)
+        .outerjoin(sold, sold.c.team_id == Team.id)
+        .where(where)
+    ).all()
+    out = []
+    for t, players_count, spent in rows:
+        d = team_to_dict(t)
+        d["spent"] = int(spent or 0)
+        d["remaining"] = t.budget - d["spent"]
+        d["players_count"] = int(players_count or 0)
+        out.append(d)
+    return out
+
+
+def _load_teams(event_id: str) -> list[dict[str, Any]]:
+    with _read_session() as s:
+        return _teams_with_totals(s, Team.event_id == event_id)
 
 
 def get_team(team_id: str) -> Optional[dict[str, Any]]:
-    with _session() as s:
-        t = s.get(Team, team_id)
-        if not t:
-            return None
-        sold = s.scalars(
-            select(Player).where(Player.sold_to_team_id == t.id, Player.status == "sold")
-        ).all()
-        spent = sum((p.sold_price or 0) for p in sold)
-        t.spent = spent
-        t.remaining = t.budget - spent
-        t.players_count = len(sold)
-        s.commit()
-        s.refresh(t)
-        return team_to_dict(t)
+    return read_cache.get_or_load(
+        "team", team_id, [team_scope(team_id)], lambda: _load_team(team_id)
+    )
+
+
+def _load_team(team_id: str) -> Optional[dict[str, Any]]:
+    with _read_session() as s:
+        teams = _teams_with_totals(s, Team.id == team_id)
+        return teams[0] if teams else None
 
 
 def create_team(data: dict[str, Any]) -> dict[str, Any]:
@@ -305,6 +408,7 @@ def create_team(data: dict[str, Any]) -> dict[str, Any]:
                 u.team_id = t.id
         s.commit()
         s.refresh(t)
+        _invalidate_team(t.id, t.event_id)
         return team_to_dict(t)
 
 
@@ -320,6 +424,7 @@ def update_team(team_id: str, fields: dict[str, Any]) -> dict[str, Any]:
             t.remaining = t.budget - (t.spent or 0)
         s.commit()
         s.refresh(t)
+        _invalidate_team(t.id, t.event_id)
         return team_to_dict(t)
 
 
@@ -327,32 +432,69 @@ def list_players_for_event(
     event_id: str, status: Optional[str] = None
 ) -> list[dict[str, Any]]:
     """List players for an event. status may be a single value or comma-separated list."""
-    with _session() as s:
+    with _read_session() as s:
         q = select(Player).where(Player.event_id == event_id)
-        statuses: list[str] = []
-        if status:
-            statuses = [s.strip().lower() for s in str(status).split(",") if s.strip()]
-            if len(statuses) == 1:
-                q = q.where(Player.status == statuses[0])
-            elif statuses:
-                q = q.where(Player.status.in_(statuses))
-        # Fallback: players only linked via category
-        players = list(s.scalars(q).all())
-        if not players:
-            cat_ids = [
-                c.id
-                for c in s.scalars(
-                    select(Category).where(Category.event_id == event_id)
-                ).all()
-            ]
-            if cat_ids:
-                q2 = select(Player).where(Player.category_id.in_(cat_ids))
-                if len(statuses) == 1:
-                    q2 = q2.where(Player.status == statuses[0])
-                elif statuses:
-                    q2 = q2.where(Player.status.in_(statuses))
-                players = list(s.scalars(q2).all())
-        return [player_to_dict(p) for p in players]
+        statuses = _status_list(status)
+        if len(statuses) == 1:
+            q = q.where(Player.status == statuses[0])
+        elif statuses:
+            q = q.where(Player.status.in_(statuses))
+        return [player_to_dict(p) for p in s.scalars(q).all()]
+
+
+def list_player_summaries(
+    event_id: str, status: Optional[str] = None
+) -> list[dict[str, Any]]:
+    """
+    Column projection for boards and analytics: no stats/extra_fields JSONB.
+    Same status filter semantics as list_players_for_event.
+    """
+    q = select(
+        Player.id,
+        Player.name,
+        Player.category_id,
+        Player.status,
+        Player.base_price,
+        Player.sold_to_team_id,
+        Player.sold_price,
+    ).where(Player.event_id == event_id)
+    statuses = _status_list(status)
+    if len(statuses) == 1:
+        q = q.where(Player.status == statuses[0])
+    elif statuses:
+        q = q.where(Player.status.in_(statuses))
+    with _read_session() as s:
+        return [dict(row._mapping) for row in s.execute(q).all()]
+
+
+def list_players_page(
+    event_id: str,
+    *,
+    limit: int,
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    offset: int = 0,
+) -> tuple[list[dict[str, Any]], Optional[str]]:
+    """
+    One page of event players ordered by id (ix_players_event_id_id).
+    Pass the returned cursor to get the next page; offset is only for
+    legacy clients and is applied in SQL.
+    """
+    q = select(Player).where(Player.event_id == event_id)
+    statuses = _status_list(status)
+    if len(statuses) == 1:
+        q = q.where(Player.status == statuses[0])
+    elif statuses:
+        q = q.where(Player.status.in_(statuses))
+    if cursor:
+        q = q.where(Player.id > decode_cursor(cursor)[0])
+    q = q.order_by(Player.id)
+    if offset:
+        q = q.offset(offset)
+    with _read_session() as s:
+        rows = list(s.scalars(q.limit(limit + 1)).all())
+        next_cursor = encode_cursor(rows[limit - 1].id) if len(rows) > limit else None
+        return [player_to_dict(p) for p in rows[:limit]], next_cursor
 
 
 def get_player(player_id: str) -> Optional[dict[str, Any]]:
@@ -362,7 +504,7 @@ def get_player(player_id: str) -> Optional[dict[str, Any]]:
 
 
 def list_players_for_team(team_id: str) -> list[dict[str, Any]]:
-    with _session() as s:
+    with _read_session() as s:
         rows = s.scalars(
             select(Player).where(
                 Player.sold_to_team_id == team_id, Player.status == "sold"
@@ -372,40 +514,18 @@ def list_players_for_team(team_id: str) -> list[dict[str, Any]]:
 
 
 def list_players_for_category(category_id: str) -> list[dict[str, Any]]:
-    with _session() as s:
+    with _read_session() as s:
         rows = s.scalars(select(Player).where(Player.category_id == category_id)).all()
         return [player_to_dict(p) for p in rows]
 
 
 def clear_current_players(event_id: str, except_player_id: Optional[str] = None) -> int:
     """Reset CURRENT players for an event to AVAILABLE (except optional id)."""
+    q = update(Player).where(Player.event_id == event_id, Player.status == "current")
+    if except_player_id:
+        q = q.where(Player.id != except_player_id)
     with _session() as s:
-        q = select(Player).where(
-            Player.event_id == event_id, Player.status == "current"
-        )
-        # Also match via categories if event_id missing on some rows
-        players = list(s.scalars(q).all())
-        if not players:
-            cat_ids = [
-                c.id
-                for c in s.scalars(
-                    select(Category).where(Category.event_id == event_id)
-                ).all()
-            ]
-            if cat_ids:
-                players = list(
-                    s.scalars(
-                        select(Player).where(
-                            Player.category_id.in_(cat_ids), Player.status == "current"
-                        )
-                    ).all()
-                )
-        fixed = 0
-        for p in players:
-            if except_player_id and p.id == except_player_id:
-                continue
-            p.status = "available"
-            fixed += 1
+        fixed = s.execute(q.values(status="available")).rowcount
         s.commit()
         return fixed
 
@@ -424,38 +544,21 @@ def set_next_player(event_id: str, player_id: str) -> dict[str, Any]:
             raise ValueError("Cannot put a sold player on the block")
 
         # Previous CURRENT players for this event → on_hold (skipped without sale)
-        cat_ids = [
-            c.id
-            for c in s.scalars(select(Category).where(Category.event_id == event_id)).all()
+        held = [
+            {"player_id": pid, "player_name": name}
+            for pid, name in s.execute(
+                update(Player)
+                .where(
+                    Player.event_id == event_id,
+                    Player.status == "current",
+                    Player.id != player_id,
+                )
+                .values(status="on_hold")
+                .returning(Player.id, Player.name)
+            ).all()
         ]
-        if player.event_id:
-            currents = list(
-                s.scalars(
-                    select(Player).where(
-                        Player.event_id == event_id, Player.status == "current"
-                    )
-                ).all()
-            )
-        elif cat_ids:
-            currents = list(
-                s.scalars(
-                    select(Player).where(
-                        Player.category_id.in_(cat_ids), Player.status == "current"
-                    )
-                ).all()
-            )
-        else:
-            currents = []
-
-        held: list[dict[str, Any]] = []
-        for p in currents:
-            if p.id != player_id:
-                p.status = "on_hold"
-                held.append({"player_id": p.id, "player_name": p.name})
 
         player.status = "current"
-        if not player.event_id:
-            player.event_id = event_id
 
         state = s.get(AuctionState, event_id)
         if not state:
@@ -472,10 +575,7 @@ def set_next_player(event_id: str, player_id: str) -> dict[str, Any]:
         state.current_team_name = None
         state.timer_started_at = now
         # Clear any in-progress selection wheel once a player is on the block
-        meta = dict(state.raw_firestore or {}) if isinstance(state.raw_firestore, dict) else {}
-        if "spin" in meta:
-            meta.pop("spin", None)
-            state.raw_firestore = meta
+        state.spin = None
 
         s.commit()
         return {
@@ -486,10 +586,6 @@ def set_next_player(event_id: str, player_id: str) -> dict[str, Any]:
         }
 
 
-def _meta_dict(state: AuctionState) -> dict[str, Any]:
-    return dict(state.raw_firestore or {}) if isinstance(state.raw_firestore, dict) else {}
-
-
 def set_spin_state(event_id: str, spin: Optional[dict[str, Any]]) -> dict[str, Any]:
     """Broadcast spinning-wheel selection to control + public boards."""
     with _session() as s:
@@ -501,12 +597,7 @@ def set_spin_state(event_id: str, spin: Optional[dict[str, Any]]) -> dict[str, A
                 timer_duration=60,
             )
             s.add(state)
-        meta = _meta_dict(state)
-        if spin is None:
-            meta.pop("spin", None)
-        else:
-            meta["spin"] = spin
-        state.raw_firestore = meta
+        state.spin = spin
         s.commit()
         s.refresh(state)
         return auction_state_to_dict(state)
@@ -514,12 +605,10 @@ def set_spin_state(event_id: str, spin: Optional[dict[str, Any]]) -> dict[str, A
 
 def _set_last_result(state: AuctionState, result: dict[str, Any]) -> None:
     """Persist brief sold/unsold snapshot for public boards (12s UI window)."""
-    meta = _meta_dict(state)
-    meta["last_result"] = {
+    state.last_result = {
         **result,
         "at": datetime.now(timezone.utc).isoformat(),
     }
-    state.raw_firestore = meta
 
 
 def mark_player_unsold_atomic(player_id: str, event_id: str) -> dict[str, Any]:
@@ -620,14 +709,43 @@ def finalize_bid_atomic(player_id: str, event_id: str) -> dict[str, Any]:
         state.current_bid = None
         state.current_team_id = None
         state.current_team_name = None
-        s.commit()
-        return {
+        result = {
             "message": "Bid finalized successfully",
             "sold": True,
             "team_id": team.id,
             "team_name": team.name,
             "price": price,
         }
+        s.commit()
+        _invalidate_team(team.id, event_id)
+        return result
+
+
+def _player_values(data: dict[str, Any], event_id: str) -> dict[str, Any]:
+    return {
+        "id": data["id"],
+        "event_id": event_id,
+        "category_id": data["category_id"],
+        "name": data["name"],
+        "base_price": data.get("base_price") or 0,
+        "current_price": data.get("current_price"),
+        "photo_url": data.get("photo_url"),
+        "age": data.get("age"),
+        "position": data.get("position"),
+        "specialty": data.get("specialty"),
+        "stats": data.get("stats"),
+        "status": data.get("status") or "available",
+        "sold_to_team_id": data.get("sold_to_team_id"),
+        "sold_price": data.get("sold_price"),
+        "previous_team": data.get("previous_team"),
+        "cricheroes_link": data.get("cricheroes_link"),
+        "contact_number": data.get("contact_number"),
+        "district": data.get("district"),
+        "identity_proof_url": data.get("identity_proof_url"),
+        "is_priority": bool(data.get("is_priority")),
+        "extra_fields": data.get("extra_fields"),
+        "photo_variants": data.get("photo_variants"),
+    }
 
 
 def create_player(data: dict[str, Any]) -> dict[str, Any]:
@@ -638,45 +756,74 @@ def create_player(data: dict[str, Any]) -> dict[str, Any]:
             cat = s.get(Category, data["category_id"])
             if cat:
                 event_id = cat.event_id
-        p = Player(
-            id=data["id"],
-            event_id=event_id,
-            category_id=data["category_id"],
-            name=data["name"],
-            base_price=data.get("base_price") or 0,
-            current_price=data.get("current_price"),
-            photo_url=data.get("photo_url"),
-            age=data.get("age"),
-            position=data.get("position"),
-            specialty=data.get("specialty"),
-            stats=data.get("stats"),
-            status=data.get("status") or "available",
-            sold_to_team_id=data.get("sold_to_team_id"),
-            sold_price=data.get("sold_price"),
-            previous_team=data.get("previous_team"),
-            cricheroes_link=data.get("cricheroes_link"),
-            contact_number=data.get("contact_number"),
-            district=data.get("district"),
-            identity_proof_url=data.get("identity_proof_url"),
-            is_priority=bool(data.get("is_priority")),
-            extra_fields=data.get("extra_fields"),
-        )
+        if not event_id:
+            raise ValueError("Category not found")
+        p = Player(**_player_values(data, event_id))
         s.add(p)
         s.commit()
         s.refresh(p)
+        if p.sold_to_team_id:
+            _invalidate_team(p.sold_to_team_id, p.event_id)
         return player_to_dict(p)
 
 
+BULK_INSERT_CHUNK = 500
+
+
+def bulk_create_players(
+    event_id: str,
+    rows: list[dict[str, Any]],
+    chunk_size: int = BULK_INSERT_CHUNK,
+    skip_existing: bool = False,
+) -> dict[str, str]:
+    """Insert new players in multi-row INSERTs, one transaction per chunk.
+
+    Rows must already be validated (category belongs to the event). If a
+    chunk is rejected, its rows are retried one by one under savepoints so
+    only the offending rows fail. Returns {player_id: error} for failures.
+
+    skip_existing makes a replay idempotent: ids already present are left
+    alone (ON CONFLICT DO NOTHING) and count as created.
+    """
+    stmt = insert(Player)
+    if skip_existing:
+        stmt = pg_insert(Player).on_conflict_do_nothing(index_elements=["id"])
+    failed: dict[str, str] = {}
+    for start in range(0, len(rows), chunk_size):
+        chunk = [_player_values(r, event_id) for r in rows[start : start + chunk_size]]
+        with _session() as s:
+            try:
+                s.execute(stmt, chunk)
+                s.commit()
+                continue
+            except DBAPIError:
+                s.rollback()
+            for values in chunk:
+                try:
+                    with s.begin_nested():
+                        s.execute(stmt, [values])
+                except DBAPIError as e:
+                    failed[values["id"]] = str(getattr(e, "orig", e)).splitlines()[0]
+            s.commit()
+    return failed
+
+
 def update_player(player_id: str, fields: dict[str, Any]) -> dict[str, Any]:
     with _session() as s:
         p = s.get(Player, player_id)
         if not p:
             raise ValueError("Player not found")
+        previous_team_id = p.sold_to_team_id
+        if "photo_url" in fields and fields["photo_url"] != p.photo_url and "photo_variants" not in fields:
+            # Derivatives belong to the old photo; clients fall back to photo_url
+            p.photo_variants = None
         for k, v in fields.items():
             if hasattr(p, k) and k != "id":
                 setattr(p, k, v)
         s.commit()
         s.refresh(p)
+        for tid in {previous_team_id, p.sold_to_team_id} - {None}:
+            _invalidate_team(tid, p.event_id)
         return player_to_dict(p)
 
 
@@ -684,18 +831,39 @@ def delete_player(player_id: str) -> None:
     with _session() as s:
         p = s.get(Player, player_id)
         if p:
+            team_id, event_id = p.sold_to_team_id, p.event_id
             s.delete(p)
             s.commit()
+            if team_id:
+                _invalidate_team(team_id, event_id)
 
 
 def list_registrations(event_id: str) -> list[dict[str, Any]]:
-    with _session() as s:
+    with _read_session() as s:
         rows = s.scalars(
             select(PlayerRegistration).where(PlayerRegistration.event_id == event_id)
         ).all()
         return [registration_to_dict(r) for r in rows]
 
 
+def list_registrations_page(
+    event_id: str, limit: int, cursor: Optional[str] = None
+) -> tuple[list[dict[str, Any]], Optional[str]]:
+    """Newest registrations first, keyset-paginated on (registered_at, id)."""
+    with _read_session() as s:
+        q = _newest_first_after(
+            select(PlayerRegistration).where(PlayerRegistration.event_id == event_id),
+            PlayerRegistration.registered_at,
+            PlayerRegistration.id,
+            cursor,
+        )
+        rows = list(s.scalars(q.limit(limit + 1)).all())
+        return (
+            [registration_to_dict(r) for r in rows[:limit]],
+            _newest_first_cursor(rows, limit, "registered_at", "id"),
+        )
+
+
 def count_pending_registrations(event_id: str) -> int:
     with _session() as s:
         rows = s.scalars(
@@ -763,6 +931,35 @@ def update_registration(registration_id: str, fields: dict[str, Any]) -> dict[st
         return registration_to_dict(r)
 
 
+def _player_from_registration(
+    r: PlayerRegistration, player_id: str, category_id: str, base_price: int, event_id: str
+) -> dict[str, Any]:
+    """Player column values for an approved registration."""
+    # Carry registration extras (custom form fields + email if present on reg)
+    extra = dict(r.extra_fields or {})
+    if getattr(r, "email", None) and "email" not in extra:
+        extra["email"] = r.email
+    return dict(
+        id=player_id,
+        event_id=event_id,
+        category_id=category_id,
+        name=r.name or "Unknown",
+        base_price=base_price,
+        age=r.age,
+        position=r.position,
+        specialty=r.specialty,
+        previous_team=r.previous_team,
+        cricheroes_link=r.cricheroes_link,
+        contact_number=r.contact_number,
+        district=r.district,
+        identity_proof_url=r.identity_proof_url,
+        stats=r.stats,
+        status="available",
+        photo_url=r.photo_url,
+        extra_fields=extra or None,
+    )
+
+
 def approve_registration_atomic(
     registration_id: str,
     *,
@@ -778,30 +975,9 @@ def approve_registration_atomic(
         if not cat:
             raise ValueError("Category not found")
         player_id = str(uuid.uuid4())
-        # Carry registration extras (custom form fields + email if present on reg)
-        extra = dict(r.extra_fields or {})
-        if getattr(r, "email", None) and "email" not in extra:
-            extra["email"] = r.email
-        p = Player(
-            id=player_id,
-            event_id=r.event_id or cat.event_id,
-            category_id=category_id,
-            name=r.name or "Unknown",
-            base_price=base_price,
-            age=r.age,
-            position=r.position,
-            specialty=r.specialty,
-            previous_team=r.previous_team,
-            cricheroes_link=r.cricheroes_link,
-            contact_number=r.contact_number,
-            district=r.district,
-            identity_proof_url=r.identity_proof_url,
-            stats=r.stats,
-            status="available",
-            photo_url=r.photo_url,
-            extra_fields=extra or None,
-        )
-        s.add(p)
+        s.add(Player(**_player_from_registration(
+            r, player_id, category_id, base_price, r.event_id or cat.event_id
+        )))
         r.status = "approved"
         r.approved_at = datetime.now(timezone.utc)
         r.player_id = player_id
@@ -809,34 +985,91 @@ def approve_registration_atomic(
         return {"player_id": player_id, "registration_id": registration_id}
 
 
+def decide_registrations_bulk(
+    event_id: str,
+    action: str,
+    items: list[dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """Approve or reject many registrations of one event in one transaction.
+
+    items: [{registration_id, category_id, base_price}]; category_id is
+    required to approve and base_price defaults to the category's. Approved
+    players are created with one multi-row INSERT and the registrations
+    updated with one UPDATE. Returns one outcome per item, in order:
+    {registration_id, status: approved|rejected|error, player_id | error}.
+    Already approved registrations are left alone (no second player).
+    """
+    ids = [item["registration_id"] for item in items]
+    with _session() as s:
+        regs = {
+            r.id: r
+            for r in s.execute(
+                select(PlayerRegistration)
+                .where(PlayerRegistration.id.in_(ids), PlayerRegistration.event_id == event_id)
+                .with_for_update()
+            ).scalars()
+        }
+        categories = {
+            c.id: c for c in s.execute(select(Category).where(Category.event_id == event_id)).scalars()
+        }
+
+        outcomes: list[dict[str, Any]] = []
+        players: list[dict[str, Any]] = []
+        decided: dict[str, Optional[str]] = {}  # registration id -> player id
+        for item in items:
+            rid = item["registration_id"]
+            r = regs.get(rid)
+            error = None
+            if not r:
+                error = "Registration not found"
+            elif rid in decided:
+                error = "Duplicate registration id in request"
+            elif r.status == "approved":
+                error = "Registration is already approved"
+            elif action == "approve" and item.get("category_id") not in categories:
+                error = "Category not found in this event" if item.get("category_id") else "category_id is required"
+            if error:
+                outcomes.append({"registration_id": rid, "status": "error", "error": error})
+                continue
+            if action == "reject":
+                decided[rid] = None
+                outcomes.append({"registration_id": rid, "status": "rejected"})
+                continue
+            cat = categories[item["category_id"]]
+            base_price = item.get("base_price")
+            if base_price is None:
+                base_price = cat.base_price or 0
+            player_id = str(uuid.uuid4())
+            players.append(_player_from_registration(r, player_id, cat.id, base_price, event_id))
+            decided[rid] = player_id
+            outcomes.append({"registration_id": rid, "status": "approved", "player_id": player_id})
+
+        if decided:
+            if players:
+                s.execute(insert(Player).values(players))
+            values: dict[str, Any] = {"status": "approved" if action == "approve" else "rejected"}
+            if action == "approve":
+                values["approved_at"] = datetime.now(timezone.utc)
+                values["player_id"] = case(decided, value=PlayerRegistration.id)
+            s.execute(
+                update(PlayerRegistration)
+                .where(PlayerRegistration.id.in_(list(decided)))
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+        s.commit()
+        return outcomes
+
+
 def make_unsold_available(event_id: str) -> int:
     with _session() as s:
-        players = list(
-            s.scalars(
-                select(Player).where(
-                    Player.event_id == event_id, Player.status == "unsold"
-                )
-            ).all()
-        )
-        if not players:
-            cat_ids = [
-                c.id
-                for c in s.scalars(
-                    select(Category).where(Category.event_id == event_id)
-                ).all()
-            ]
-            if cat_ids:
-                players = list(
-                    s.scalars(
-                        select(Player).where(
-                            Player.category_id.in_(cat_ids), Player.status == "unsold"
-                        )
-                    ).all()
-                )
-        for p in players:
-            p.status = "available"
+        count = s.execute(
+            update(Player)
+            .where(Player.event_id == event_id, Player.status == "unsold")
+            .values(status="available")
+        ).rowcount
         s.commit()
-        return len(players)
+        return count
 
 
 def release_player_atomic(player_id: str) -> dict[str, Any]:
@@ -866,7 +1099,9 @@ def release_player_atomic(player_id: str) -> dict[str, Any]:
         team.spent = max(0, (team.spent or 0) - sold_price)
         team.remaining = team.budget - team.spent
         team.players_count = max(0, (team.players_count or 0) - 1)
+        event_id = team.event_id
         s.commit()
+        _invalidate_team(team_id, event_id)
         return {
             "player_id": player_id,
             "player_name": name,
@@ -892,6 +1127,113 @@ def get_auction_state(event_id: str) -> Optional[dict[str, Any]]:
         return d
 
 
+def _json_ts(value: Any) -> Optional[str]:
+    """Normalize a Postgres JSON timestamp to the isoformat used by serializers."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value)).isoformat()
+    except ValueError:
+        return str(value)
+
+
+def get_public_player_board(event_id: str) -> Optional[dict[str, Any]]:
+    """
+    Everything the public live player board needs in one round trip.
+
+    event ⟕ auction state ⟕ current player ⟕ category ⟕ sold team, plus the
+    recent bid trail and sponsors aggregated as JSON. Returns the keyword
+    arguments for public_live.public_player_payload, or None if no event.
+    """
+    recent_bids = (
+        select(Bid.id, Bid.player_id, Bid.team_id, Bid.team_name, Bid.amount, Bid.created_at)
+        .where(
+            Bid.event_id == AuctionState.event_id,
+            or_(
+                AuctionState.current_player_id.is_(None),
+                Bid.player_id == AuctionState.current_player_id,
+            ),
+        )
+        .order_by(Bid.created_at.desc().nullslast())
+        .limit(20)
+        .correlate(AuctionState)
+        .subquery("recent_bids")
+    )
+    bids_json = (
+        select(
+            func.json_agg(
+                aggregate_order_by(
+                    func.json_build_object(
+                        "id", recent_bids.c.id,
+                        "player_id", recent_bids.c.player_id,
+                        "team_id", recent_bids.c.team_id,
+                        "team_name", recent_bids.c.team_name,
+                        "amount", recent_bids.c.amount,
+                        "created_at", recent_bids.c.created_at,
+                    ),
+                    recent_bids.c.created_at.asc().nullsfirst(),
+                )
+            )
+        )
+        .select_from(recent_bids)
+        .correlate(AuctionState)
+        .scalar_subquery()
+    )
+    sponsors_json = (
+        select(
+            func.json_agg(
+                func.json_build_object(
+                    "id", Sponsor.id,
+                    "name", Sponsor.name,
+                    "logo_url", Sponsor.logo_url,
+                    "website", Sponsor.website,
+                    "tier", Sponsor.tier,
+                    "is_active", Sponsor.is_active,
+                )
+            )
+        )
+        .where(Sponsor.event_id == Event.id)
+        .correlate(Event)
+        .scalar_subquery()
+    )
+    q = (
+        select(Event, AuctionState, Player, Category, Team, bids_json, sponsors_json)
+        .outerjoin(AuctionState, AuctionState.event_id == Event.id)
+        .outerjoin(Player, Player.id == AuctionState.current_player_id)
+        .outerjoin(Category, Category.id == Player.category_id)
+        .outerjoin(Team, Team.id == Player.sold_to_team_id)
+        .where(Event.id == event_id)
+    )
+    with _read_session() as s:
+        row = s.execute(q).first()
+        if not row:
+            return None
+        event, state, player, category, team, bids, sponsors = row
+        auction = None
+        if state:
+            auction = auction_state_to_dict(state)
+            auction["bid_history"] = [
+                {
+                    "id": b["id"],
+                    "player_id": b["player_id"],
+                    "event_id": event_id,
+                    "team_id": b["team_id"],
+                    "team_name": b["team_name"],
+                    "amount": b["amount"],
+                    "timestamp": _json_ts(b["created_at"]),
+                }
+                for b in (bids or [])
+            ]
+        return {
+            "event": event_to_dict(event),
+            "auction": auction,
+            "player": player_to_dict(player) if player else None,
+            "category": category_to_dict(category) if category else None,
+            "sold_team": team_to_dict(team) if team else None,
+            "sponsors": sponsors or [],
+        }
+
+
 def upsert_auction_state(event_id: str, fields: dict[str, Any]) -> dict[str, Any]:
     with _session() as s:
         a = s.get(AuctionState, event_id)
@@ -933,8 +1275,7 @@ def place_bid_atomic(
         if not team:
             raise ValueError("Team not found")
 
-        player = s.get(Player, player_id)
-        if not player:
+        if not s.scalar(select(Player.id).where(Player.id == player_id)):
             raise ValueError("Player not found")
 
         current_bid = state.current_bid or 0
@@ -1022,6 +1363,7 @@ def sell_player_atomic(
             state.current_team_name = None
 
         s.commit()
+        _invalidate_team(team_id, event_id)
         return {
             "player": player_to_dict(player),
             "team": team_to_dict(team),
@@ -1029,7 +1371,13 @@ def sell_player_atomic(
 
 
 def list_sponsors(event_id: str) -> list[dict[str, Any]]:
-    with _session() as s:
+    return read_cache.get_or_load(
+        "sponsors", event_id, [sponsors_scope(event_id)], lambda: _load_sponsors(event_id)
+    )
+
+
+def _load_sponsors(event_id: str) -> list[dict[str, Any]]:
+    with _read_session() as s:
         rows = s.scalars(select(Sponsor).where(Sponsor.event_id == event_id)).all()
         return [sponsor_to_dict(x) for x in rows]
 
@@ -1054,6 +1402,7 @@ def create_sponsor(data: dict[str, Any]) -> dict[str, Any]:
         s.add(sp)
         s.commit()
         s.refresh(sp)
+        read_cache.invalidate(sponsors_scope(sp.event_id))
         return sponsor_to_dict(sp)
 
 
@@ -1073,6 +1422,7 @@ def update_sponsor(sponsor_id: str, fields: dict[str, Any]) -> dict[str, Any]:
                 setattr(sp, k, v)
         s.commit()
         s.refresh(sp)
+        read_cache.invalidate(sponsors_scope(sp.event_id))
         return sponsor_to_dict(sp)
 
 
@@ -1081,8 +1431,10 @@ def delete_sponsor(sponsor_id: str) -> None:
         sp = s.get(Sponsor, sponsor_id)
         if not sp:
             raise ValueError("Sponsor not found")
+        event_id = sp.event_id
         s.delete(sp)
         s.commit()
+        read_cache.invalidate(sponsors_scope(event_id))
 
 
 def get_payment(order_id: str) -> Optional[dict[str, Any]]:
@@ -1124,14 +1476,130 @@ def update_payment(order_id: str, fields: dict[str, Any]) -> dict[str, Any]:
         return payment_to_dict(p)
 
 
-def list_payments(event_id: str) -> list[dict[str, Any]]:
+def apply_payment_statuses(updates: list[dict[str, Any]]) -> list[str]:
+    """Gateway statuses for many orders in one transaction; safe to replay.
+
+    updates: [{order_id, status, transaction_id}]. Only open orders
+    (PENDING/ACTIVE) change - PAID, EXPIRED and TERMINATED are final, so a
+    repeated or late webhook never moves an order back. checked_at is set on
+    every listed order. Returns the order ids whose status changed.
+    """
+    if not updates:
+        return []
+    by_id = {u["order_id"]: u for u in updates}
+    ids = list(by_id)
+    now = datetime.now(timezone.utc)
+    new_status = case({k: u["status"] for k, u in by_id.items()}, value=PaymentOrder.order_id)
+    values: dict[str, Any] = {"status": new_status, "verified_at": now, "checked_at": now}
+    transaction_ids = {k: u["transaction_id"] for k, u in by_id.items() if u.get("transaction_id")}
+    if transaction_ids:
+        values["transaction_id"] = func.coalesce(
+            case(transaction_ids, value=PaymentOrder.order_id), PaymentOrder.transaction_id
+        )
+    with _session() as s:
+        changed = list(
+            s.execute(
+                update(PaymentOrder)
+                .where(
+                    PaymentOrder.order_id.in_(ids),
+                    PaymentOrder.status.in_(OPEN_PAYMENT_STATUSES),
+                    PaymentOrder.status != new_status,
+                )
+                .values(**values)
+                .returning(PaymentOrder.order_id)
+                .execution_options(synchronize_session=False)
+            ).scalars()
+        )
+        s.execute(
+            update(PaymentOrder)
+            .where(PaymentOrder.order_id.in_(ids))
+            .values(checked_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        s.commit()
+        return changed
+
+
+def claim_due_payments(
+    created_before: datetime,
+    created_after: datetime,
+    checked_before: datetime,
+    limit: int,
+) -> list[dict[str, Any]]:
+    """Open orders due for a gateway check, oldest first.
+
+    Claimed by stamping checked_at in the same statement; SKIP LOCKED lets
+    reconcilers on several replicas split the batch instead of repeating it.
+    """
+    due = (
+        select(PaymentOrder.order_id)
+        .where(
+            PaymentOrder.status.in_(OPEN_PAYMENT_STATUSES),
+            PaymentOrder.created_at < created_before,
+            PaymentOrder.created_at >= created_after,
+            or_(PaymentOrder.checked_at.is_(None), PaymentOrder.checked_at < checked_before),
+        )
+        .order_by(PaymentOrder.created_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
     with _session() as s:
+        rows = s.execute(
+            update(PaymentOrder)
+            .where(PaymentOrder.order_id.in_(due.scalar_subquery()))
+            .values(checked_at=datetime.now(timezone.utc))
+            .returning(PaymentOrder)
+            .execution_options(synchronize_session=False)
+        ).scalars().all()
+        claimed = [payment_to_dict(p) for p in rows]
+        s.commit()
+        return claimed
+
+
+def list_payments(event_id: str) -> list[dict[str, Any]]:
+    with _read_session() as s:
         rows = s.scalars(
             select(PaymentOrder).where(PaymentOrder.event_id == event_id)
         ).all()
         return [payment_to_dict(p) for p in rows]
 
 
+def list_payments_page(
+    event_id: str, limit: int, cursor: Optional[str] = None
+) -> tuple[list[dict[str, Any]], Optional[str]]:
+    """Newest payments first from ix_payment_orders_event_created."""
+    with _read_session() as s:
+        q = _newest_first_after(
+            select(PaymentOrder).where(PaymentOrder.event_id == event_id),
+            PaymentOrder.created_at,
+            PaymentOrder.order_id,
+            cursor,
+        )
+        rows = list(s.scalars(q.limit(limit + 1)).all())
+        return (
+            [payment_to_dict(p) for p in rows[:limit]],
+            _newest_first_cursor(rows, limit, "created_at", "order_id"),
+        )
+
+
+def payment_totals(event_id: str) -> dict[str, dict[str, int]]:
+    """{status: {count, amount}} for an event in one GROUP BY (no rows loaded)."""
+    with _read_session() as s:
+        rows = s.execute(
+            select(
+                PaymentOrder.status,
+                func.count(),
+                func.coalesce(func.sum(PaymentOrder.amount), 0),
+            )
+            .where(PaymentOrder.event_id == event_id)
+            .group_by(PaymentOrder.status)
+        ).all()
+        return {
+            status: {"count": int(count), "amount": int(amount)}
+            for status, count, amount in rows
+        }
+
+
 def validate_public_token(team_id: str, token: str) -> bool:
     with _session() as s:
         row = s.scalars(
@@ -1190,22 +1658,48 @@ def create_event_broadcast_token(data: dict[str, Any]) -> dict[str, Any]:
         }
 
 
-def resolve_event_broadcast_token(token: str) -> Optional[str]:
-    """Return event_id if token is valid, else None. Strict validation only."""
+def get_event_broadcast_token(token: str) -> Optional[dict[str, Any]]:
+    """event_id and expires_at of a live (unrevoked, unexpired) token, else None."""
     if not token or len(token) < 16:
         return None
     with _session() as s:
-        row = s.scalars(
-            select(PublicEventBroadcastToken).where(
+        row = s.execute(
+            select(PublicEventBroadcastToken.event_id, PublicEventBroadcastToken.expires_at)
+            .where(
                 PublicEventBroadcastToken.token == token,
                 PublicEventBroadcastToken.revoked.is_(False),
             )
+            .limit(1)
         ).first()
         if not row:
             return None
         if row.expires_at and row.expires_at < datetime.now(timezone.utc):
             return None
-        return row.event_id
+        return {"event_id": row.event_id, "expires_at": row.expires_at}
+
+
+def resolve_event_broadcast_token(token: str) -> Optional[str]:
+    """Return event_id if token is valid, else None. Strict validation only."""
+    row = get_event_broadcast_token(token)
+    return row["event_id"] if row else None
+
+
+def revoke_event_broadcast_tokens(event_id: str) -> list[str]:
+    """Revoke every live broadcast token of an event; returns the tokens."""
+    with _session() as s:
+        tokens = list(
+            s.scalars(
+                update(PublicEventBroadcastToken)
+                .where(
+                    PublicEventBroadcastToken.event_id == event_id,
+                    PublicEventBroadcastToken.revoked.is_(False),
+                )
+                .values(revoked=True)
+                .returning(PublicEventBroadcastToken.token)
+            )
+        )
+        s.commit()
+        return tokens
 
 
 def list_available_team_admins() -> list[dict[str, Any]]:
@@ -1336,6 +1830,227 @@ def upsert_payment_gateway_settings(data: dict[str, Any], updated_by: str) -> di
         return _gateway_to_dict(g)
 
 
+# --- ingested images (app/image_cache.py) ---
+
+
+def get_image_source(source_key: str) -> Optional[dict[str, Any]]:
+    with _session() as s:
+        e = s.get(ImageCacheEntry, source_key)
+        if not e:
+            return None
+        return {
+            "source_key": e.source_key,
+            "content_hash": e.content_hash,
+            "secure_url": e.secure_url,
+            "content_type": e.content_type,
+        }
+
+
+def find_image_url_by_hash(content_hash: str) -> Optional[str]:
+    with _session() as s:
+        return s.scalar(
+            select(ImageCacheEntry.secure_url)
+            .where(
+                ImageCacheEntry.content_hash == content_hash,
+                ImageCacheEntry.secure_url.is_not(None),
+            )
+            .limit(1)
+        )
+
+
+def upsert_image_source(
+    source_key: str, content_hash: str, secure_url: Optional[str], content_type: Optional[str]
+) -> None:
+    now = datetime.now(timezone.utc)
+    values = {
+        "content_hash": content_hash,
+        "secure_url": secure_url,
+        "content_type": content_type,
+        "updated_at": now,
+    }
+    with _session() as s:
+        s.execute(
+            pg_insert(ImageCacheEntry)
+            .values(source_key=source_key, created_at=now, **values)
+            .on_conflict_do_update(index_elements=["source_key"], set_=values)
+        )
+        s.commit()
+
+
+# --- background jobs (app/jobs.py) ---
+
+
+def create_job(data: dict[str, Any]) -> dict[str, Any]:
+    with _session() as s:
+        now = datetime.now(timezone.utc)
+        j = Job(
+            id=data["id"],
+            kind=data["kind"],
+            event_id=data.get("event_id"),
+            created_by=data.get("created_by"),
+            status="queued",
+            dedupe_key=data.get("dedupe_key"),
+            total=data.get("total") or 0,
+            processed=0,
+            created_count=0,
+            error_count=len(data.get("errors") or []),
+            errors=list(data.get("errors") or []),
+            result=[],
+            payload=data.get("payload"),
+            created_at=now,
+            updated_at=now,
+        )
+        s.add(j)
+        s.commit()
+        s.refresh(j)
+        return job_to_dict(j)
+
+
+def get_job(job_id: str) -> Optional[dict[str, Any]]:
+    with _session() as s:
+        j = s.get(Job, job_id)
+        return job_to_dict(j) if j else None
+
+
+def get_job_payload(job_id: str) -> Any:
+    with _session() as s:
+        return s.scalar(select(Job.payload).where(Job.id == job_id))
+
+
+def find_active_job(kind: str, dedupe_key: str) -> Optional[dict[str, Any]]:
+    """Latest job with this dedupe key that has not failed."""
+    with _session() as s:
+        j = s.scalars(
+            select(Job)
+            .where(Job.kind == kind, Job.dedupe_key == dedupe_key, Job.status != "failed")
+            .order_by(Job.created_at.desc())
+            .limit(1)
+        ).first()
+        return job_to_dict(j) if j else None
+
+
+def claim_job(job_id: str, worker_id: str, stale_before: datetime) -> Optional[dict[str, Any]]:
+    """Atomically take a queued job, or a running one whose worker stopped heartbeating."""
+    now = datetime.now(timezone.utc)
+    with _session() as s:
+        claimed = s.scalar(
+            update(Job)
+            .where(
+                Job.id == job_id,
+                or_(
+                    Job.status == "queued",
+                    and_(Job.status == "running", Job.heartbeat_at < stale_before),
+                ),
+            )
+            .values(
+                status="running",
+                worker_id=worker_id,
+                heartbeat_at=now,
+                updated_at=now,
+                started_at=func.coalesce(Job.started_at, now),
+            )
+            .returning(Job.id)
+        )
+        s.commit()
+        return get_job(job_id) if claimed else None
+
+
+def heartbeat_job(job_id: str, worker_id: str) -> bool:
+    """False if the job was taken over by another worker."""
+    with _session() as s:
+        hit = s.scalar(
+            update(Job)
+            .where(Job.id == job_id, Job.worker_id == worker_id, Job.status == "running")
+            .values(heartbeat_at=datetime.now(timezone.utc))
+            .returning(Job.id)
+        )
+        s.commit()
+        return hit is not None
+
+
+def checkpoint_job(
+    job_id: str,
+    worker_id: str,
+    processed: int,
+    errors: list[dict[str, Any]],
+    result: list[dict[str, Any]],
+) -> bool:
+    """Record progress up to `processed` and append this step's errors/results.
+
+    The arrays are appended in SQL (jsonb ||), so a step costs its own size
+    rather than a rewrite of everything recorded so far.
+    """
+    now = datetime.now(timezone.utc)
+    with _session() as s:
+        hit = s.scalar(
+            update(Job)
+            .where(Job.id == job_id, Job.worker_id == worker_id, Job.status == "running")
+            .values(
+                processed=processed,
+                errors=Job.errors.op("||")(literal(list(errors), JSONB)),
+                result=Job.result.op("||")(literal(list(result), JSONB)),
+                error_count=Job.error_count + len(errors),
+                created_count=Job.created_count + len(result),
+                heartbeat_at=now,
+                updated_at=now,
+            )
+            .returning(Job.id)
+        )
+        s.commit()
+        return hit is not None
+
+
+def finish_job(job_id: str, worker_id: str, status: str, message: Optional[str]) -> bool:
+    now = datetime.now(timezone.utc)
+    with _session() as s:
+        hit = s.scalar(
+            update(Job)
+            .where(Job.id == job_id, Job.worker_id == worker_id, Job.status == "running")
+            .values(status=status, message=message, finished_at=now, updated_at=now)
+            .returning(Job.id)
+        )
+        s.commit()
+        return hit is not None
+
+
+def requeue_job(job_id: str, worker_id: Optional[str] = None) -> bool:
+    """Put a job back in the queue: a failed one (retry), or this worker's (shutdown)."""
+    if worker_id is None:
+        owned = Job.status == "failed"
+    else:
+        owned = and_(Job.status == "running", Job.worker_id == worker_id)
+    with _session() as s:
+        hit = s.scalar(
+            update(Job)
+            .where(Job.id == job_id, owned)
+            .values(
+                status="queued",
+                worker_id=None,
+                finished_at=None,
+                updated_at=datetime.now(timezone.utc),
+            )
+            .returning(Job.id)
+        )
+        s.commit()
+        return hit is not None
+
+
+def list_resumable_jobs(stale_before: datetime) -> list[str]:
+    with _session() as s:
+        return list(
+            s.scalars(
+                select(Job.id)
+                .where(
+                    or_(
+                        Job.status == "queued",
+                        and_(Job.status == "running", Job.heartbeat_at < stale_before),
+                    )
+                )
+                .order_by(Job.created_at)
+            ).all()
+        )
+
+
 def health_check() -> bool:
     with _session() as s:
         s.execute(select(1))
@@ -100,6 +100,7 @@ def player_to_dict(p) -> dict[str, Any]:
         "identity_proof_url": p.identity_proof_url,
         "is_priority": bool(p.is_priority),
         "extra_fields": getattr(p, "extra_fields", None),
+        "photo_variants": getattr(p, "photo_variants", None),
     }
 
 
@@ -148,9 +149,6 @@ def sponsor_to_dict(s) -> dict[str, Any]:
 
 
 def auction_state_to_dict(a) -> dict[str, Any]:
-    meta = a.raw_firestore if isinstance(a.raw_firestore, dict) else {}
-    last_result = meta.get("last_result") if isinstance(meta, dict) else None
-    spin = meta.get("spin") if isinstance(meta, dict) else None
     return {
         "id": f"auction_{a.event_id}",
         "event_id": a.event_id,
@@ -162,8 +160,8 @@ def auction_state_to_dict(a) -> dict[str, Any]:
         "timer_duration": a.timer_duration,
         "status": a.status,
         "bid_history": [],  # filled by get_auction_state from bids table
-        "last_result": last_result,
-        "spin": spin,
+        "last_result": a.last_result,
+        "spin": a.spin,
     }
 
 
@@ -195,4 +193,29 @@ def payment_to_dict(p) -> dict[str, Any]:
         "registration_id": p.registration_id,
         "created_at": _iso(p.created_at),
         "verified_at": _iso(p.verified_at),
+        "checked_at": _iso(p.checked_at),
+    }
+
+
+def job_to_dict(j) -> dict[str, Any]:
+    return {
+        "id": j.id,
+        "kind": j.kind,
+        "event_id": j.event_id,
+        "created_by": j.created_by,
+        "status": j.status,
+        "dedupe_key": j.dedupe_key,
+        "total": j.total or 0,
+        "processed": j.processed or 0,
+        "created_count": j.created_count or 0,
+        "error_count": j.error_count or 0,
+        "errors": list(j.errors or []),
+        "result": list(j.result or []),
+        "message": j.message,
+        "worker_id": j.worker_id,
+        "heartbeat_at": _iso(j.heartbeat_at),
+        "created_at": _iso(j.created_at),
+        "updated_at": _iso(j.updated_at),
+        "started_at": _iso(j.started_at),
+        "finished_at": _iso(j.finished_at),
     }
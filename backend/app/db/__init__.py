@@ -1,3 +1,19 @@
-from app.db.session import SessionLocal, get_db, get_engine, get_session_factory
+from app.db.session import (
+    SessionLocal,
+    get_db,
+    get_engine,
+    get_pool_stats,
+    get_read_session_factory,
+    get_session_factory,
+    pin_reads_to_primary,
+)
 
-__all__ = ["SessionLocal", "get_db", "get_engine", "get_session_factory"]
+__all__ = [
+    "SessionLocal",
+    "get_db",
+    "get_engine",
+    "get_pool_stats",
+    "get_read_session_factory",
+    "get_session_factory",
+    "pin_reads_to_primary",
+]
@@ -0,0 +1,94 @@
+"""Instrumented connection pool — checkout wait times and timeouts for ops."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.pool import Pool, QueuePool
+
+# Upper bounds (ms) of the checkout wait histogram; last bucket is +Inf
+WAIT_BUCKETS_MS: tuple[float, ...] = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+class PoolStats:
+    """Thread-safe counters for pool checkouts. One instance per process."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.wait_ms_total = 0.0
+            self.wait_ms_max = 0.0
+            self.wait_histogram = [0] * (len(WAIT_BUCKETS_MS) + 1)
+
+    def observe_wait(self, seconds: float) -> None:
+        ms = seconds * 1000.0
+        idx = len(WAIT_BUCKETS_MS)
+        for i, bound in enumerate(WAIT_BUCKETS_MS):
+            if ms <= bound:
+                idx = i
+                break
+        with self._lock:
+            self.checkouts += 1
+            self.wait_ms_total += ms
+            self.wait_ms_max = max(self.wait_ms_max, ms)
+            self.wait_histogram[idx] += 1
+
+    def record_timeout(self, seconds: float) -> None:
+        with self._lock:
+            self.timeouts += 1
+            self.wait_ms_max = max(self.wait_ms_max, seconds * 1000.0)
+
+    def snapshot(self, pool: Pool | None = None) -> dict[str, Any]:
+        with self._lock:
+            labels = [f"le_{int(b)}ms" for b in WAIT_BUCKETS_MS] + ["le_inf"]
+            out: dict[str, Any] = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms_avg": round(self.wait_ms_total / self.checkouts, 3)
+                if self.checkouts
+                else 0.0,
+                "wait_ms_max": round(self.wait_ms_max, 3),
+                "wait_histogram": dict(zip(labels, self.wait_histogram)),
+            }
+        if pool is not None:
+            out.update(pool_status(pool))
+        return out
+
+
+def pool_status(pool: Pool) -> dict[str, Any]:
+    """Point-in-time sizing of one pool."""
+    if not isinstance(pool, QueuePool):
+        return {"pool_class": type(pool).__name__}
+    return {
+        "pool_class": type(pool).__name__,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "timeout": pool.timeout(),
+    }
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait for a connection."""
+
+    def _do_get(self):  # type: ignore[override]
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            pool_stats.record_timeout(time.perf_counter() - start)
+            raise
+        pool_stats.observe_wait(time.perf_counter() - start)
+        return conn
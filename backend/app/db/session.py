@@ -3,16 +3,48 @@
 from __future__ import annotations
 
 from collections.abc import Generator
-from typing import Optional
+from contextvars import ContextVar
+from typing import Any, Optional
 
-from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import Session, sessionmaker
 
-from app.core.config import get_settings
+from app.core.config import Settings, get_settings
+from app.db.pool import InstrumentedQueuePool, pool_status, pool_stats
 
 _engine: Optional[Engine] = None
 SessionLocal: Optional[sessionmaker] = None
+_replica_engine: Optional[Engine] = None
+ReplicaSessionLocal: Optional[sessionmaker] = None
+
+# Read-your-writes: once this request/task commits on the primary, its later
+# reads stay on the primary instead of a possibly lagging replica.
+_reads_pinned: ContextVar[bool] = ContextVar("reads_pinned_to_primary", default=False)
+
+
+def engine_options(settings: Settings, url: Optional[str] = None) -> dict[str, Any]:
+    """create_engine kwargs for the configured pool profile."""
+    url = url or settings.database_url
+    opts: dict[str, Any] = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "future": True,
+    }
+    if settings.db_pool_profile == "pgbouncer":
+        # Transaction pooling: a server connection is only ours for one
+        # transaction, so no server-side prepared statements and no long-lived
+        # session state. PgBouncer does the multiplexing; keep the local pool
+        # small so many workers don't hold idle client slots.
+        opts["pool_size"] = min(settings.db_pool_size, 2)
+        opts["pool_recycle"] = -1
+        if url and make_url(url).get_driver_name() == "psycopg":
+            opts["connect_args"] = {"prepare_threshold": None}
+    return opts
 
 
 def get_engine() -> Engine:
@@ -20,20 +52,14 @@ def get_engine() -> Engine:
     if _engine is None:
         settings = get_settings()
         url = settings.require_database_url()
-        _engine = create_engine(
-            url,
-            pool_pre_ping=True,
-            pool_recycle=1800,
-            pool_size=5,
-            max_overflow=10,
-            future=True,
-        )
+        _engine = create_engine(url, **engine_options(settings))
         SessionLocal = sessionmaker(
             bind=_engine,
             autoflush=False,
             autocommit=False,
             future=True,
         )
+        event.listen(SessionLocal, "after_commit", _pin_reads_after_commit)
     return _engine
 
 
@@ -44,6 +70,54 @@ def get_session_factory() -> sessionmaker:
     return SessionLocal
 
 
+def _pin_reads_after_commit(session: Session) -> None:
+    _reads_pinned.set(True)
+
+
+def pin_reads_to_primary() -> None:
+    _reads_pinned.set(True)
+
+
+def reads_pinned_to_primary() -> bool:
+    return _reads_pinned.get()
+
+
+def get_replica_engine() -> Optional[Engine]:
+    """Engine for DATABASE_REPLICA_URL, or None when no replica is configured."""
+    global _replica_engine, ReplicaSessionLocal
+    if _replica_engine is None:
+        settings = get_settings()
+        if not settings.database_replica_url:
+            return None
+        _replica_engine = create_engine(
+            settings.database_replica_url,
+            **engine_options(settings, settings.database_replica_url),
+        )
+        ReplicaSessionLocal = sessionmaker(
+            bind=_replica_engine,
+            autoflush=False,
+            autocommit=False,
+            future=True,
+        )
+    return _replica_engine
+
+
+def get_read_session_factory() -> sessionmaker:
+    """Replica sessions for read-only queries; primary when pinned or no replica."""
+    if _reads_pinned.get() or get_replica_engine() is None:
+        return get_session_factory()
+    assert ReplicaSessionLocal is not None
+    return ReplicaSessionLocal
+
+
+def get_pool_stats() -> dict[str, Any]:
+    """Live pool counters plus checkout wait histogram."""
+    out = pool_stats.snapshot(_engine.pool if _engine is not None else None)
+    if _replica_engine is not None:
+        out["replica"] = pool_status(_replica_engine.pool)
+    return out
+
+
 def get_db() -> Generator[Session, None, None]:
     """FastAPI dependency: one session per request."""
     factory = get_session_factory()
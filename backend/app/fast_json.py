@@ -0,0 +1,79 @@
+"""
+Single-pass JSON for large, trusted list responses.
+
+pg_repo already returns plain dicts in the API shape. Building a Pydantic
+model per row only for FastAPI to dump and re-validate it against
+response_model costs several conversions per row. project_rows keeps the
+keys and defaults that response_model filtering would produce, and
+json_response serializes the result once with orjson.
+"""
+
+from __future__ import annotations
+
+import typing
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Iterable, Mapping, Optional
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pydantic_core import PydanticUndefined
+
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as _FastResponse
+except ImportError:  # optional; stdlib json is still correct, just slower
+    orjson = None
+    _FastResponse = JSONResponse
+
+
+def _nested_model(annotation: Any) -> Optional[type[BaseModel]]:
+    """PlayerStats for Optional[PlayerStats]; None for scalar fields."""
+    candidates = typing.get_args(annotation) or (annotation,)
+    for arg in candidates:
+        if isinstance(arg, type) and issubclass(arg, BaseModel):
+            return arg
+    return None
+
+
+@lru_cache(maxsize=None)
+def _field_plan(model: type[BaseModel]) -> tuple[tuple[str, Any, Any], ...]:
+    plan = []
+    for name, field in model.model_fields.items():
+        if field.default_factory is not None:
+            default = field.default_factory()
+        elif field.default is PydanticUndefined:
+            default = None
+        else:
+            default = field.default
+        if isinstance(default, Enum):
+            default = default.value
+        nested = _nested_model(field.annotation)
+        plan.append((name, default, _field_plan(nested) if nested else None))
+    return tuple(plan)
+
+
+def _project(row: Mapping[str, Any], plan) -> dict[str, Any]:
+    out = {}
+    for name, default, nested in plan:
+        value = row.get(name, default)
+        if nested is not None and isinstance(value, Mapping):
+            value = _project(value, nested)
+        out[name] = value
+    return out
+
+
+def project_rows(rows: Iterable[Mapping[str, Any]], model: type[BaseModel]) -> list[dict[str, Any]]:
+    """Shape trusted rows like List[model] output, without validating them.
+
+    Only for rows built by our own serializers: types are not coerced.
+    """
+    plan = _field_plan(model)
+    return [_project(row, plan) for row in rows]
+
+
+def json_response(
+    content: Any, status_code: int = 200, headers: Optional[Mapping[str, str]] = None
+) -> JSONResponse:
+    """Returning a Response skips response_model, so set headers here."""
+    return _FastResponse(content=content, status_code=status_code, headers=headers)
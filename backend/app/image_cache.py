@@ -0,0 +1,127 @@
+"""
+Content-addressed cache for ingested player photos.
+
+Two layers, both keyed so a repeat import makes no external calls:
+
+  ImageIndex   source key ("drive:<file id>") -> content hash + Cloudinary URL,
+               and content hash -> URL (the same photo shared under another
+               Drive link is uploaded once). Postgres image_cache table or
+               Firestore image_cache collection.
+  BlobStore    fetched bytes on local disk under IMAGE_CACHE_DIR, by sha256,
+               so a failed Cloudinary upload is retried without re-downloading.
+
+Index rows without a URL mean "downloaded, not uploaded yet". Cache failures
+are logged by the caller and never fail an ingest.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def drive_source_key(file_id: str) -> str:
+    return f"drive:{file_id}"
+
+
+class BlobStore:
+    """Immutable files named by their sha256 ({root}/ab/abcdef...)."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+
+    def path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def get(self, digest: str) -> Optional[bytes]:
+        try:
+            return self.path(digest).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def put(self, data: bytes) -> str:
+        digest = content_hash(data)
+        target = self.path(digest)
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename so readers never see a partial file
+            fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=".tmp-")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, target)
+        return digest
+
+
+class MemoryImageIndex:
+    """In-process index (tests, and deployments without a database)."""
+
+    def __init__(self) -> None:
+        self.sources: dict[str, dict[str, Any]] = {}
+
+    def lookup(self, source_key: str) -> Optional[dict[str, Any]]:
+        return self.sources.get(source_key)
+
+    def url_for_hash(self, digest: str) -> Optional[str]:
+        for entry in self.sources.values():
+            if entry["content_hash"] == digest and entry.get("secure_url"):
+                return entry["secure_url"]
+        return None
+
+    def remember(self, source_key: str, digest: str, secure_url: Optional[str], content_type: Optional[str]) -> None:
+        self.sources[source_key] = {
+            "source_key": source_key,
+            "content_hash": digest,
+            "secure_url": secure_url,
+            "content_type": content_type,
+        }
+
+
+class PgImageIndex:
+    """image_cache table via pg_repo."""
+
+    def __init__(self, repo) -> None:
+        self.repo = repo
+
+    def lookup(self, source_key: str) -> Optional[dict[str, Any]]:
+        return self.repo.get_image_source(source_key)
+
+    def url_for_hash(self, digest: str) -> Optional[str]:
+        return self.repo.find_image_url_by_hash(digest)
+
+    def remember(self, source_key: str, digest: str, secure_url: Optional[str], content_type: Optional[str]) -> None:
+        self.repo.upsert_image_source(source_key, digest, secure_url, content_type)
+
+
+class FirestoreImageIndex:
+    """image_cache/{source_key} documents."""
+
+    def __init__(self, db) -> None:
+        self.db = db
+
+    def lookup(self, source_key: str) -> Optional[dict[str, Any]]:
+        snap = self.db.collection('image_cache').document(source_key).get()
+        return snap.to_dict() if snap.exists else None
+
+    def url_for_hash(self, digest: str) -> Optional[str]:
+        for doc in self.db.collection('image_cache').where('content_hash', '==', digest).stream():
+            url = doc.to_dict().get('secure_url')
+            if url:
+                return url
+        return None
+
+    def remember(self, source_key: str, digest: str, secure_url: Optional[str], content_type: Optional[str]) -> None:
+        self.db.collection('image_cache').document(source_key).set({
+            'source_key': source_key,
+            'content_hash': digest,
+            'secure_url': secure_url,
+            'content_type': content_type,
+            'updated_at': datetime.now(timezone.utc).isoformat(),
+        })
@@ -0,0 +1,93 @@
+"""
+Sized WebP derivatives of player photos for lists, the spin wheel and
+broadcast overlays (full-resolution Drive/Cloudinary photos are several MB).
+
+Derivatives are generated with Pillow when a photo is ingested and written
+next to the original bytes under IMAGE_CACHE_DIR:
+
+  derivatives/<ab>/<sha256>/<variant>.webp
+
+They are named by the content hash of the source image, so a URL never
+changes meaning and is served with an immutable, one-year cache lifetime.
+Players store relative URLs ({variant: "/api/media/<sha256>/<variant>.webp"}).
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+# variant -> longest edge in px (never upscaled)
+VARIANTS = {
+    "thumb": 96,
+    "card": 320,
+    "broadcast": 960,
+}
+WEBP_QUALITY = 80
+MEDIA_PATH = "/api/media"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+_DIGEST = re.compile(r"^[0-9a-f]{64}$")
+
+
+def is_digest(value: str) -> bool:
+    return bool(_DIGEST.match(value or ""))
+
+
+def derivative_urls(digest: str) -> dict[str, str]:
+    return {variant: f"{MEDIA_PATH}/{digest}/{variant}.webp" for variant in VARIANTS}
+
+
+def clean_variants(value) -> Optional[dict[str, str]]:
+    """photo_variants from a client payload, limited to our own media URLs."""
+    if not isinstance(value, dict):
+        return None
+    out = {
+        k: v for k, v in value.items()
+        if k in VARIANTS and isinstance(v, str) and v.startswith(MEDIA_PATH + "/")
+    }
+    return out or None
+
+
+class DerivativeStore:
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root) / "derivatives"
+
+    def path(self, digest: str, variant: str) -> Path:
+        return self.root / digest[:2] / digest / f"{variant}.webp"
+
+    def has_all(self, digest: str) -> bool:
+        return all(self.path(digest, v).exists() for v in VARIANTS)
+
+    def generate(self, data: bytes, digest: str) -> Optional[dict[str, str]]:
+        """Write every variant (skipping existing ones); URLs, or None if not an image."""
+        if self.has_all(digest):
+            return derivative_urls(digest)
+        from PIL import Image, ImageOps, UnidentifiedImageError
+
+        try:
+            with Image.open(io.BytesIO(data)) as source:
+                image = ImageOps.exif_transpose(source)
+                image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+        except (UnidentifiedImageError, OSError, ValueError):
+            return None
+
+        folder = self.root / digest[:2] / digest
+        folder.mkdir(parents=True, exist_ok=True)
+        for variant, size in VARIANTS.items():
+            target = self.path(digest, variant)
+            if target.exists():
+                continue
+            resized = image.copy()
+            resized.thumbnail((size, size), Image.LANCZOS)
+            buf = io.BytesIO()
+            resized.save(buf, "WEBP", quality=WEBP_QUALITY, method=4)
+            fd, tmp = tempfile.mkstemp(dir=folder, prefix=".tmp-")
+            with os.fdopen(fd, "wb") as f:
+                f.write(buf.getvalue())
+            os.replace(tmp, target)
+        return derivative_urls(digest)
@@ -0,0 +1,261 @@
+"""
+Google Drive -> Cloudinary photo ingestion for bulk uploads.
+
+Each Drive link is downloaded (lh3.googleusercontent.com first, then the
+drive.google.com export URL) and pushed to Cloudinary with an unsigned
+upload. ImageIngestPool.ingest_many runs these concurrently on one pooled
+httpx.AsyncClient:
+
+  - at most `concurrency` transfers in flight, `per_host` per host
+    (Drive throttles bursts from one client)
+  - downloads are retried on 429 / 5xx / network errors with exponential
+    backoff and jitter, honouring a numeric Retry-After; uploads only on 429
+    and on failures before the request was sent, so a retry cannot create
+    a second Cloudinary asset
+  - identical links are fetched once
+
+With a DerivativeStore (app/image_derivatives.py) each ingested photo also
+gets sized WebP derivatives; pool.variants maps each url to their URLs.
+
+With an ImageIndex and BlobStore (app/image_cache.py) a Drive file that
+was ingested before costs no network I/O: its Cloudinary URL comes from the
+index, bytes already fetched come from disk, and a photo whose content hash
+is already on Cloudinary (same picture, different link) is not re-uploaded.
+
+Failures are logged and reported as None; callers keep the original link.
+Base URLs are parameters so tests can point the pool at a local stub.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import re
+from typing import Any, Iterable, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from app.image_cache import BlobStore, content_hash, drive_source_key
+from app.image_derivatives import DerivativeStore, derivative_urls
+
+logger = logging.getLogger(__name__)
+
+DRIVE_ID_PATTERNS = [
+    r'drive\.google\.com/file/d/([a-zA-Z0-9_-]+)',
+    r'drive\.google\.com/open\?id=([a-zA-Z0-9_-]+)',
+    r'drive\.google\.com/uc\?id=([a-zA-Z0-9_-]+)',
+    r'lh3\.googleusercontent\.com/d/([a-zA-Z0-9_-]+)',
+    r'id=([a-zA-Z0-9_-]+)',
+]
+
+DRIVE_DOWNLOAD_URLS = (
+    "https://lh3.googleusercontent.com/d/{file_id}",
+    "https://drive.google.com/uc?export=view&id={file_id}",
+)
+CLOUDINARY_API = "https://api.cloudinary.com"
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Non-idempotent requests (uploads): the gateway rejected or never got them
+UPLOAD_RETRY_STATUSES = {429}
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+MAX_RETRY_AFTER_SECONDS = 30.0
+
+
+def is_drive_url(url: str) -> bool:
+    return 'drive.google.com' in url or 'googleusercontent.com' in url
+
+
+def extract_drive_file_id(url: str) -> Optional[str]:
+    for pattern in DRIVE_ID_PATTERNS:
+        match = re.search(pattern, url)
+        if match:
+            return match.group(1)
+    return None
+
+
+class ImageIngestPool:
+    def __init__(
+        self,
+        cloud_name: str,
+        upload_preset: str,
+        *,
+        folder: str = "auction_players",
+        concurrency: int = 8,
+        per_host: int = 4,
+        retries: int = 3,
+        backoff_seconds: float = 0.5,
+        download_timeout: float = 10.0,
+        upload_timeout: float = 30.0,
+        drive_urls: Iterable[str] = DRIVE_DOWNLOAD_URLS,
+        cloudinary_api: str = CLOUDINARY_API,
+        index=None,
+        blobs: Optional[BlobStore] = None,
+        derivatives: Optional[DerivativeStore] = None,
+    ) -> None:
+        self.cloud_name = cloud_name
+        self.upload_preset = upload_preset
+        self.folder = folder
+        self.concurrency = max(1, concurrency)
+        self.per_host = max(1, per_host)
+        self.retries = retries
+        self.backoff_seconds = backoff_seconds
+        self.download_timeout = download_timeout
+        self.upload_timeout = upload_timeout
+        self.drive_urls = tuple(drive_urls)
+        self.upload_url = f"{cloudinary_api.rstrip('/')}/v1_1/{cloud_name}/image/upload"
+        self.index = index
+        self.blobs = blobs
+        self.derivatives = derivatives
+        self.stats = {"cached": 0, "downloads": 0, "uploads": 0}
+        self.variants: dict[str, dict[str, str]] = {}
+        self._digests: dict[str, str] = {}
+        self._digest_locks: dict[str, asyncio.Lock] = {}
+
+    async def ingest_many(self, urls: Iterable[str]) -> dict[str, Optional[str]]:
+        """{drive_url: cloudinary_url or None} for every distinct url."""
+        unique = list(dict.fromkeys(u for u in urls if u))
+        if not unique:
+            return {}
+        # Different link forms of one Drive file are ingested once
+        file_ids = {url: extract_drive_file_id(url) for url in unique}
+        for url, file_id in file_ids.items():
+            if not file_id:
+                logger.warning(f"Could not extract file ID from URL: {url}")
+        distinct = list(dict.fromkeys(f for f in file_ids.values() if f))
+
+        limits = httpx.Limits(
+            max_connections=self.concurrency, max_keepalive_connections=self.concurrency
+        )
+        slots = asyncio.Semaphore(self.concurrency)
+        host_slots: dict[str, asyncio.Semaphore] = {}
+
+        async with httpx.AsyncClient(limits=limits, follow_redirects=True) as client:
+
+            async def one(file_id: str) -> Optional[str]:
+                async with slots:
+                    try:
+                        return await self._ingest(client, host_slots, file_id)
+                    except Exception as e:
+                        logger.error(f"Image ingestion failed for Drive file {file_id}: {e}")
+                        return None
+
+            results = dict(zip(distinct, await asyncio.gather(*(one(f) for f in distinct))))
+        if self.derivatives is not None:
+            for url, file_id in file_ids.items():
+                if file_id in self._digests and results.get(file_id):
+                    self.variants[url] = derivative_urls(self._digests[file_id])
+        return {url: results.get(file_id) if file_id else None for url, file_id in file_ids.items()}
+
+    async def _cache(self, method: str, *args) -> Any:
+        """Index call off the event loop; errors are logged and read as a miss."""
+        if self.index is None:
+            return None
+        try:
+            return await asyncio.to_thread(getattr(self.index, method), *args)
+        except Exception as e:
+            logger.warning(f"Image cache {method} failed: {e}")
+            return None
+
+    async def _ingest(self, client, host_slots, file_id: str) -> Optional[str]:
+        source_key = drive_source_key(file_id)
+        known = await self._cache("lookup", source_key) or {}
+        if known.get("secure_url"):
+            # Derivatives missing on this host are rebuilt when first requested
+            self.stats["cached"] += 1
+            self._digests[file_id] = known["content_hash"]
+            return known["secure_url"]
+
+        image = None
+        if known.get("content_hash") and self.blobs is not None:
+            data = await asyncio.to_thread(self.blobs.get, known["content_hash"])
+            if data is not None:
+                image = (data, known.get("content_type") or "image/jpeg")
+        if image is None:
+            image = await self._download(client, host_slots, file_id)
+        if image is None:
+            logger.warning(f"Could not download image from Google Drive: {file_id}")
+            return None
+
+        if self.blobs is not None:
+            digest = await asyncio.to_thread(self.blobs.put, image[0])
+        else:
+            digest = content_hash(image[0])
+        if self.derivatives is not None:
+            if await asyncio.to_thread(self.derivatives.generate, image[0], digest):
+                self._digests[file_id] = digest
+        # Same picture already on Cloudinary under another Drive link; the
+        # lock makes concurrent copies of one picture wait for one upload
+        async with self._digest_locks.setdefault(digest, asyncio.Lock()):
+            secure_url = await self._cache("url_for_hash", digest)
+            if not secure_url:
+                secure_url = await self._upload(client, host_slots, file_id, image)
+            await self._cache("remember", source_key, digest, secure_url, image[1])
+        return secure_url
+
+    async def _download(self, client, host_slots, file_id: str) -> Optional[tuple[bytes, str]]:
+        for template in self.drive_urls:
+            response = await self._request(
+                client, host_slots, "GET", template.format(file_id=file_id),
+                timeout=self.download_timeout,
+            )
+            if (
+                response is not None
+                and response.status_code == 200
+                and response.headers.get("content-type", "").startswith("image/")
+            ):
+                self.stats["downloads"] += 1
+                return response.content, response.headers["content-type"]
+        return None
+
+    async def _upload(self, client, host_slots, file_id: str, image: tuple[bytes, str]) -> Optional[str]:
+        response = await self._request(
+            client, host_slots, "POST", self.upload_url,
+            idempotent=False,
+            timeout=self.upload_timeout,
+            files={"file": (file_id, image[0], image[1])},
+            data={
+                "upload_preset": self.upload_preset,
+                "folder": self.folder,
+                "resource_type": "image",
+            },
+        )
+        if response is None or response.status_code != 200:
+            detail = f"{response.status_code} - {response.text[:200]}" if response is not None else "no response"
+            logger.error(f"Cloudinary upload failed for {file_id}: {detail}")
+            return None
+        self.stats["uploads"] += 1
+        secure_url = response.json().get("secure_url")
+        logger.info(f"Successfully uploaded image to Cloudinary: {secure_url}")
+        return secure_url
+
+    async def _request(
+        self, client, host_slots, method: str, url: str, *, idempotent: bool = True, **kwargs
+    ):
+        """Response after retries, or None if every attempt hit a network error."""
+        host = urlparse(url).netloc
+        slot = host_slots.setdefault(host, asyncio.Semaphore(self.per_host))
+        retry_statuses = RETRY_STATUSES if idempotent else UPLOAD_RETRY_STATUSES
+        response = None
+        for attempt in range(self.retries + 1):
+            try:
+                async with slot:
+                    response = await client.request(method, url, **kwargs)
+                if response.status_code not in retry_statuses:
+                    return response
+            except httpx.TransportError as e:
+                logger.debug(f"{method} {url} failed (attempt {attempt + 1}): {e}")
+                if not idempotent and not isinstance(e, NOT_SENT_ERRORS):
+                    return None  # may have reached Cloudinary
+                response = None
+            if attempt < self.retries:
+                await asyncio.sleep(self._delay(attempt, response))
+        return response
+
+    def _delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), MAX_RETRY_AFTER_SECONDS)
+        base = self.backoff_seconds * (2 ** attempt)
+        return base + random.uniform(0, base / 2)
@@ -0,0 +1,414 @@
+"""
+Background jobs for work that outlives an HTTP request (bulk player upload).
+
+A job stores its input (payload), a checkpoint (processed) and the result
+so far, so the worker running it can die at any point and another one
+continues where it stopped:
+
+  queued  -> running      claim(): exactly one worker wins
+  running -> completed | failed
+  running with a heartbeat older than stale_after  -> claimable again
+
+Handlers work through the payload in steps and call ctx.checkpoint() after
+each. A step can be replayed after a crash, so it must be idempotent
+(pre-assigned ids, insert-if-absent).
+
+JobRunner runs handlers as asyncio tasks in the API process; its sweep loop
+picks up queued jobs and jobs orphaned by a restart or a dead replica.
+
+Stores: PgJobStore (jobs table) and FirestoreJobStore (jobs collection).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_SECONDS = 15.0
+STALE_AFTER_SECONDS = 60.0
+FIRESTORE_PAYLOAD_CHUNK = 200  # rows per payload doc (1 MiB document limit)
+
+
+class JobLost(Exception):
+    """The job was taken over by another worker; stop without writing."""
+
+
+class PgJobStore:
+    """jobs table via pg_repo."""
+
+    def __init__(self, repo) -> None:
+        self.repo = repo
+
+    def create(self, job: dict[str, Any]) -> dict[str, Any]:
+        return self.repo.create_job(job)
+
+    def get(self, job_id: str) -> Optional[dict[str, Any]]:
+        return self.repo.get_job(job_id)
+
+    def payload(self, job_id: str) -> Any:
+        return self.repo.get_job_payload(job_id)
+
+    def find_active(self, kind: str, dedupe_key: str) -> Optional[dict[str, Any]]:
+        return self.repo.find_active_job(kind, dedupe_key)
+
+    def claim(self, job_id: str, worker_id: str, stale_before: datetime) -> Optional[dict[str, Any]]:
+        return self.repo.claim_job(job_id, worker_id, stale_before)
+
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        return self.repo.heartbeat_job(job_id, worker_id)
+
+    def checkpoint(self, job_id: str, worker_id: str, processed: int, errors: list, result: list) -> bool:
+        return self.repo.checkpoint_job(job_id, worker_id, processed, errors, result)
+
+    def finish(self, job_id: str, worker_id: str, status: str, message: Optional[str]) -> bool:
+        return self.repo.finish_job(job_id, worker_id, status, message)
+
+    def requeue(self, job_id: str, worker_id: Optional[str] = None) -> bool:
+        return self.repo.requeue_job(job_id, worker_id)
+
+    def resumable(self, stale_before: datetime) -> list[str]:
+        return self.repo.list_resumable_jobs(stale_before)
+
+
+class FirestoreJobStore:
+    """
+    jobs/{id} documents holding status and counters only (1 MiB document
+    limit): the payload is split over jobs/{id}/payload/{n}, and each
+    checkpoint's results and errors go to their own jobs/{id}/steps/{processed}.
+    """
+
+    def __init__(self, db) -> None:
+        self.db = db
+
+    def _ref(self, job_id: str):
+        return self.db.collection('jobs').document(job_id)
+
+    def _update_if(
+        self,
+        job_id: str,
+        allowed: Callable[[dict], bool],
+        fields: Callable[[dict], dict],
+        also: Optional[Callable[[Any], None]] = None,
+    ):
+        """Transactional read-check-write (plus `also(transaction)` writes); the updated job, or None if not allowed."""
+        from firebase_admin import firestore
+
+        ref = self._ref(job_id)
+
+        @firestore.transactional
+        def run(transaction):
+            snap = ref.get(transaction=transaction)
+            job = snap.to_dict() if snap.exists else None
+            if job is None or not allowed(job):
+                return None
+            changes = fields(job)
+            transaction.update(ref, changes)
+            if also is not None:
+                also(transaction)
+            return {**job, **changes}
+
+        return run(self.db.transaction())
+
+    def create(self, job: dict[str, Any]) -> dict[str, Any]:
+        now = datetime.now(timezone.utc)
+        rows = list(job.get('payload') or [])
+        errors = list(job.get('errors') or [])
+        doc = {
+            'id': job['id'],
+            'kind': job['kind'],
+            'event_id': job.get('event_id'),
+            'created_by': job.get('created_by'),
+            'status': 'queued',
+            'dedupe_key': job.get('dedupe_key'),
+            'total': job.get('total') or 0,
+            'processed': 0,
+            'created_count': 0,
+            'error_count': len(errors),
+            'message': None,
+            'worker_id': None,
+            'heartbeat_at': None,
+            'created_at': now,
+            'updated_at': now,
+            'started_at': None,
+            'finished_at': None,
+            'payload_chunks': 0,
+        }
+        batch = self.db.batch()
+        for n, start in enumerate(range(0, len(rows), FIRESTORE_PAYLOAD_CHUNK)):
+            batch.set(
+                self._ref(job['id']).collection('payload').document(str(n)),
+                {'rows': rows[start:start + FIRESTORE_PAYLOAD_CHUNK]},
+            )
+            doc['payload_chunks'] = n + 1
+        # Validation errors found before the job was queued
+        for n, start in enumerate(range(0, len(errors), FIRESTORE_PAYLOAD_CHUNK)):
+            batch.set(
+                self._step(job['id'], f"{0:010d}-{n:04d}"),
+                {'errors': errors[start:start + FIRESTORE_PAYLOAD_CHUNK], 'result': []},
+            )
+        # Job doc last so it is never visible without its payload
+        batch.set(self._ref(job['id']), doc)
+        batch.commit()
+        return {**self._public(doc), 'errors': errors, 'result': []}
+
+    def _step(self, job_id: str, step_id: str):
+        return self._ref(job_id).collection('steps').document(step_id)
+
+    @staticmethod
+    def _public(job: dict[str, Any]) -> dict[str, Any]:
+        out = {k: v for k, v in job.items() if k != 'payload_chunks'}
+        for key in ('heartbeat_at', 'created_at', 'updated_at', 'started_at', 'finished_at'):
+            if isinstance(out.get(key), datetime):
+                out[key] = out[key].isoformat()
+        return out
+
+    def get(self, job_id: str) -> Optional[dict[str, Any]]:
+        snap = self._ref(job_id).get()
+        if not snap.exists:
+            return None
+        errors, result = [], []
+        for step in sorted(self._ref(job_id).collection('steps').stream(), key=lambda d: d.id):
+            data = step.to_dict()
+            errors.extend(data.get('errors') or [])
+            result.extend(data.get('result') or [])
+        return {**self._public(snap.to_dict()), 'errors': errors, 'result': result}
+
+    def payload(self, job_id: str) -> Any:
+        chunks = sorted(
+            self._ref(job_id).collection('payload').stream(), key=lambda d: int(d.id)
+        )
+        return [row for chunk in chunks for row in chunk.to_dict().get('rows', [])]
+
+    def find_active(self, kind: str, dedupe_key: str) -> Optional[dict[str, Any]]:
+        docs = [
+            d.to_dict()
+            for d in self.db.collection('jobs').where('dedupe_key', '==', dedupe_key).stream()
+        ]
+        docs = [d for d in docs if d.get('kind') == kind and d.get('status') != 'failed']
+        if not docs:
+            return None
+        return self.get(max(docs, key=lambda d: d['created_at'])['id'])
+
+    def claim(self, job_id: str, worker_id: str, stale_before: datetime) -> Optional[dict[str, Any]]:
+        now = datetime.now(timezone.utc)
+        job = self._update_if(
+            job_id,
+            lambda j: _claimable(j, stale_before),
+            lambda j: {
+                'status': 'running',
+                'worker_id': worker_id,
+                'heartbeat_at': now,
+                'updated_at': now,
+                'started_at': j.get('started_at') or now,
+            },
+        )
+        return self._public(job) if job else None
+
+    def _owned(self, worker_id: str) -> Callable[[dict], bool]:
+        return lambda j: j.get('worker_id') == worker_id and j.get('status') == 'running'
+
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        now = datetime.now(timezone.utc)
+        return self._update_if(job_id, self._owned(worker_id), lambda j: {'heartbeat_at': now}) is not None
+
+    def checkpoint(self, job_id: str, worker_id: str, processed: int, errors: list, result: list) -> bool:
+        now = datetime.now(timezone.utc)
+
+        def fields(job):
+            return {
+                'processed': processed,
+                'error_count': (job.get('error_count') or 0) + len(errors),
+                'created_count': (job.get('created_count') or 0) + len(result),
+                'heartbeat_at': now,
+                'updated_at': now,
+            }
+
+        def write_step(transaction):
+            # Keyed by `processed`: a step replayed after a takeover overwrites itself
+            transaction.set(
+                self._step(job_id, f"{processed:010d}"),
+                {'errors': list(errors), 'result': list(result)},
+            )
+
+        return self._update_if(job_id, self._owned(worker_id), fields, write_step) is not None
+
+    def finish(self, job_id: str, worker_id: str, status: str, message: Optional[str]) -> bool:
+        now = datetime.now(timezone.utc)
+        return self._update_if(
+            job_id,
+            self._owned(worker_id),
+            lambda j: {'status': status, 'message': message, 'finished_at': now, 'updated_at': now},
+        ) is not None
+
+    def requeue(self, job_id: str, worker_id: Optional[str] = None) -> bool:
+        if worker_id is None:
+            allowed = lambda j: j.get('status') == 'failed'
+        else:
+            allowed = self._owned(worker_id)
+        return self._update_if(
+            job_id,
+            allowed,
+            lambda j: {
+                'status': 'queued',
+                'worker_id': None,
+                'finished_at': None,
+                'updated_at': datetime.now(timezone.utc),
+            },
+        ) is not None
+
+    def resumable(self, stale_before: datetime) -> list[str]:
+        docs = self.db.collection('jobs').where('status', 'in', ['queued', 'running']).stream()
+        jobs = [d.to_dict() for d in docs]
+        return [j['id'] for j in sorted(jobs, key=lambda j: j['created_at']) if _claimable(j, stale_before)]
+
+
+def _claimable(job: dict[str, Any], stale_before: datetime) -> bool:
+    if job.get('status') == 'queued':
+        return True
+    heartbeat = job.get('heartbeat_at')
+    return job.get('status') == 'running' and (heartbeat is None or heartbeat < stale_before)
+
+
+class JobContext:
+    """Handed to a handler: where to resume from, and how to record progress."""
+
+    def __init__(self, runner: "JobRunner", job: dict[str, Any]) -> None:
+        self.runner = runner
+        self.job_id = job['id']
+        self.processed = job.get('processed') or 0
+        self.created_count = job.get('created_count') or 0
+        self.error_count = job.get('error_count') or 0
+        self.message: Optional[str] = None
+
+    async def checkpoint(self, processed: int, errors: list = (), result: list = ()) -> None:
+        """Everything before `processed` is done; raises JobLost if no longer ours."""
+        ok = await run_in_threadpool(
+            self.runner.store.checkpoint,
+            self.job_id, self.runner.worker_id, processed, list(errors), list(result),
+        )
+        if not ok:
+            raise JobLost(self.job_id)
+        self.processed = processed
+        self.created_count += len(result)
+        self.error_count += len(errors)
+
+
+Handler = Callable[[dict[str, Any], Any, JobContext], Awaitable[None]]
+
+
+class JobRunner:
+    def __init__(
+        self,
+        store,
+        *,
+        worker_id: Optional[str] = None,
+        heartbeat_seconds: float = HEARTBEAT_SECONDS,
+        stale_after_seconds: float = STALE_AFTER_SECONDS,
+    ) -> None:
+        self.store = store
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.heartbeat_seconds = heartbeat_seconds
+        self.stale_after_seconds = stale_after_seconds
+        self.handlers: dict[str, Handler] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._sweeper: Optional[asyncio.Task] = None
+
+    def handler(self, kind: str) -> Callable[[Handler], Handler]:
+        def register(fn: Handler) -> Handler:
+            self.handlers[kind] = fn
+            return fn
+        return register
+
+    def _stale_before(self) -> datetime:
+        return datetime.now(timezone.utc) - timedelta(seconds=self.stale_after_seconds)
+
+    def submit(self, job_id: str) -> None:
+        """Start the job in this process (no-op if it is already running here)."""
+        task = self._tasks.get(job_id)
+        if task is not None and not task.done():
+            return
+        task = asyncio.get_running_loop().create_task(self.run(job_id))
+        self._tasks[job_id] = task
+
+        def forget(done: asyncio.Task) -> None:
+            if self._tasks.get(job_id) is done:
+                del self._tasks[job_id]
+
+        task.add_done_callback(forget)
+
+    async def run(self, job_id: str) -> Optional[str]:
+        """Claim and run one job; its final status, or None if it was not ours."""
+        job = await run_in_threadpool(self.store.claim, job_id, self.worker_id, self._stale_before())
+        if job is None:
+            return None
+        handler = self.handlers.get(job['kind'])
+        ctx = JobContext(self, job)
+        beat = asyncio.create_task(self._heartbeat(job_id))
+        try:
+            if handler is None:
+                raise RuntimeError(f"No handler for job kind {job['kind']!r}")
+            payload = await run_in_threadpool(self.store.payload, job_id)
+            await handler(job, payload, ctx)
+            status, message = 'completed', ctx.message
+        except JobLost:
+            logger.warning(f"Job {job_id} was taken over by another worker")
+            return None
+        except asyncio.CancelledError:
+            # Shutting down: hand the job back so the next worker starts at once
+            try:
+                await asyncio.shield(run_in_threadpool(self.store.requeue, job_id, self.worker_id))
+            except Exception as e:
+                logger.warning(f"Requeueing job {job_id} on shutdown failed: {e}")
+            raise
+        except Exception as e:
+            logger.exception(f"Job {job_id} failed")
+            status, message = 'failed', str(e)
+        finally:
+            beat.cancel()
+        await run_in_threadpool(self.store.finish, job_id, self.worker_id, status, message)
+        return status
+
+    async def _heartbeat(self, job_id: str) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                await run_in_threadpool(self.store.heartbeat, job_id, self.worker_id)
+            except Exception as e:
+                logger.warning(f"Heartbeat for job {job_id} failed: {e}")
+
+    async def resume_pending(self) -> list[str]:
+        """Submit queued jobs and running jobs whose worker went away."""
+        job_ids = await run_in_threadpool(self.store.resumable, self._stale_before())
+        for job_id in job_ids:
+            self.submit(job_id)
+        return job_ids
+
+    async def _sweep(self) -> None:
+        while True:
+            try:
+                resumed = await self.resume_pending()
+                if resumed:
+                    logger.info(f"Resuming jobs: {', '.join(resumed)}")
+            except Exception as e:
+                logger.warning(f"Job sweep failed: {e}")
+            await asyncio.sleep(self.stale_after_seconds / 2)
+
+    def start(self) -> None:
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.get_running_loop().create_task(self._sweep())
+
+    async def stop(self) -> None:
+        tasks = [t for t in [self._sweeper, *self._tasks.values()] if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._sweeper = None
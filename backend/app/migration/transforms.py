@@ -130,7 +130,7 @@ def transform_player(doc_id: str, data: dict[str, Any]) -> dict[str, Any]:
     stats = data.get("stats") if isinstance(data.get("stats"), dict) else data.get("stats")
     return {
         "id": data.get("id") or doc_id,
-        "event_id": data.get("event_id"),  # may be None — backfilled later
+        "event_id": data.get("event_id"),  # usually absent; resolved from category on load
         "category_id": data.get("category_id"),
         "name": data.get("name") or "Unnamed player",
         "base_price": as_int(data.get("base_price"), 0) or 0,
@@ -211,6 +211,10 @@ def transform_auction_state(doc_id: str, data: dict[str, Any]) -> dict[str, Any]
         "timer_started_at": parse_dt(data.get("timer_started_at")),
         "timer_duration": as_int(data.get("timer_duration"), 60) or 60,
         "status": data.get("status") or "not_started",
+        "spin": data.get("spin") if isinstance(data.get("spin"), dict) else None,
+        "last_result": data.get("last_result")
+        if isinstance(data.get("last_result"), dict)
+        else None,
         "raw_firestore": data,
     }
 
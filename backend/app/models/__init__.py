@@ -1,11 +1,14 @@
 """SQLAlchemy ORM models — primary keys preserve existing Firestore/Firebase IDs."""
 
 from app.models.entities import (
+    OPEN_PAYMENT_STATUSES,
     AuctionState,
     BankDetails,
     Bid,
     Category,
     Event,
+    ImageCacheEntry,
+    Job,
     MigrationQuarantine,
     MigrationRun,
     PaymentGatewaySettings,
@@ -32,8 +35,11 @@ __all__ = [
     "PublicTeamToken",
     "PublicEventBroadcastToken",
     "PaymentOrder",
+    "OPEN_PAYMENT_STATUSES",
     "BankDetails",
     "PaymentGatewaySettings",
+    "Job",
+    "ImageCacheEntry",
     "MigrationRun",
     "MigrationQuarantine",
 ]
@@ -3,6 +3,9 @@ PostgreSQL ORM entities for PowerAuction.
 
 Primary keys use TEXT and preserve existing Firestore document IDs /
 Firebase UIDs / Cashfree order IDs as specified in the master plan.
+
+raw_firestore is an audit copy of the source document; it is never
+serialized, so it is deferred and only loaded when accessed explicitly.
 """
 
 from __future__ import annotations
@@ -21,6 +24,7 @@ from sqlalchemy import (
     Text,
     UniqueConstraint,
     func,
+    text,
 )
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -30,6 +34,7 @@ from app.db.base import Base
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (Index("ix_users_created_at_id", "created_at", "id"),)
 
     id: Mapped[str] = mapped_column(String(128), primary_key=True)  # firebase_uid
     email: Mapped[str] = mapped_column(String(320), nullable=False, unique=True)
@@ -41,7 +46,7 @@ class User(Base):
         String(64), ForeignKey("teams.id", use_alter=True, name="fk_users_team_id"), nullable=True, index=True
     )
     created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
-    raw_firestore: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+    raw_firestore: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True, deferred=True)
 
 
 class Event(Base):
@@ -66,7 +71,7 @@ class Event(Base):
     has_registration_limit: Mapped[bool] = mapped_column(Boolean, default=False)
     registration_limit: Mapped[Optional[int]] = mapped_column(Integer)
     registration_form_config: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True)
-    raw_firestore: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+    raw_firestore: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True, deferred=True)
 
     categories: Mapped[list["Category"]] = relationship(back_populates="event")
     teams: Mapped[list["Team"]] = relationship(back_populates="event")
@@ -84,7 +89,7 @@ class Category(Base):
     max_players: Mapped[int] = mapped_column(Integer, default=0)
     color: Mapped[Optional[str]] = mapped_column(String(64))
     base_price: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
-    raw_firestore: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+    raw_firestore: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True, deferred=True)
 
     event: Mapped["Event"] = relationship(back_populates="categories")
     players: Mapped[list["Player"]] = relationship(back_populates="category")
@@ -112,7 +117,7 @@ class Team(Base):
     original_spent: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     original_remaining: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     original_players_count: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
-    raw_firestore: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+    raw_firestore: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True, deferred=True)
 
     event: Mapped["Event"] = relationship(back_populates="teams")
 
@@ -121,14 +126,13 @@ class Player(Base):
     __tablename__ = "players"
     __table_args__ = (
         Index("ix_players_event_status", "event_id", "status"),
+        Index("ix_players_event_id_id", "event_id", "id"),
         Index("ix_players_category_id", "category_id"),
         Index("ix_players_sold_team_status", "sold_to_team_id", "status"),
     )
 
     id: Mapped[str] = mapped_column(String(64), primary_key=True)
-    event_id: Mapped[Optional[str]] = mapped_column(
-        String(64), ForeignKey("events.id"), nullable=True
-    )  # nullable until backfill passes gate
+    event_id: Mapped[str] = mapped_column(String(64), ForeignKey("events.id"), nullable=False)
     category_id: Mapped[str] = mapped_column(String(64), ForeignKey("categories.id"), nullable=False)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     base_price: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -150,14 +154,19 @@ class Player(Base):
     identity_proof_url: Mapped[Optional[str]] = mapped_column(Text)
     is_priority: Mapped[bool] = mapped_column(Boolean, default=False)
     extra_fields: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True)
-    raw_firestore: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+    # {variant: url} WebP derivatives (app/image_derivatives.py)
+    photo_variants: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+    raw_firestore: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True, deferred=True)
 
     category: Mapped["Category"] = relationship(back_populates="players")
 
 
 class PlayerRegistration(Base):
     __tablename__ = "player_registrations"
-    __table_args__ = (Index("ix_registrations_event_status", "event_id", "status"),)
+    __table_args__ = (
+        Index("ix_registrations_event_status", "event_id", "status"),
+        Index("ix_registrations_event_registered_id", "event_id", "registered_at", "id"),
+    )
 
     id: Mapped[str] = mapped_column(String(64), primary_key=True)
     event_id: Mapped[str] = mapped_column(String(64), ForeignKey("events.id"), nullable=False)
@@ -179,7 +188,7 @@ class PlayerRegistration(Base):
     identity_proof_url: Mapped[Optional[str]] = mapped_column(Text)
     stats: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB)
     extra_fields: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True)
-    raw_firestore: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+    raw_firestore: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True, deferred=True)
 
 
 class Sponsor(Base):
@@ -199,7 +208,7 @@ class Sponsor(Base):
     tier: Mapped[Optional[str]] = mapped_column(String(64))
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
-    raw_firestore: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+    raw_firestore: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True, deferred=True)
 
 
 class AuctionState(Base):
@@ -219,7 +228,10 @@ class AuctionState(Base):
     timer_started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     timer_duration: Mapped[int] = mapped_column(Integer, default=60)
     status: Mapped[str] = mapped_column(String(64), nullable=False)
-    raw_firestore: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+    # Selection wheel broadcast and brief sold/unsold snapshot for public boards
+    spin: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+    last_result: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+    raw_firestore: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True, deferred=True)
 
 
 class Bid(Base):
@@ -236,7 +248,7 @@ class Bid(Base):
     team_name: Mapped[Optional[str]] = mapped_column(String(255))
     amount: Mapped[int] = mapped_column(Integer, nullable=False)
     created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
-    raw_firestore: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+    raw_firestore: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True, deferred=True)
 
 
 class PublicTeamToken(Base):
@@ -252,7 +264,7 @@ class PublicTeamToken(Base):
     expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     created_by: Mapped[Optional[str]] = mapped_column(String(128))
-    raw_firestore: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+    raw_firestore: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True, deferred=True)
 
 
 class PublicEventBroadcastToken(Base):
@@ -274,9 +286,24 @@ class PublicEventBroadcastToken(Base):
     revoked: Mapped[bool] = mapped_column(Boolean, default=False)
 
 
+# Orders the customer can still pay (Cashfree order_status ACTIVE, or not checked yet)
+OPEN_PAYMENT_STATUSES = ("PENDING", "ACTIVE")
+OPEN_PAYMENT_SQL = "status IN ('PENDING', 'ACTIVE')"
+
+
 class PaymentOrder(Base):
     __tablename__ = "payment_orders"
-    __table_args__ = (Index("ix_payment_orders_event_created", "event_id", "created_at"),)
+    __table_args__ = (
+        # Keyset order of the payment ledger (newest first)
+        Index(
+            "ix_payment_orders_event_created",
+            "event_id",
+            text("created_at DESC NULLS LAST"),
+            text("order_id DESC"),
+        ),
+        # Open orders only, scanned by age by the payment reconciler
+        Index("ix_payment_orders_open_created", "created_at", postgresql_where=text(OPEN_PAYMENT_SQL)),
+    )
 
     order_id: Mapped[str] = mapped_column(String(128), primary_key=True)
     event_id: Mapped[str] = mapped_column(String(64), ForeignKey("events.id"), nullable=False)
@@ -292,7 +319,9 @@ class PaymentOrder(Base):
     registration_id: Mapped[Optional[str]] = mapped_column(String(64))
     created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     verified_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
-    raw_firestore: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+    # Last gateway status check (webhook or reconciler)
+    checked_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    raw_firestore: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True, deferred=True)
 
 
 class BankDetails(Base):
@@ -310,7 +339,7 @@ class BankDetails(Base):
     upi_id: Mapped[Optional[str]] = mapped_column(String(128))
     created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
-    raw_firestore: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+    raw_firestore: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True, deferred=True)
 
 
 class PaymentGatewaySettings(Base):
@@ -325,7 +354,57 @@ class PaymentGatewaySettings(Base):
     created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     updated_by: Mapped[Optional[str]] = mapped_column(String(128))
-    raw_firestore: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+    raw_firestore: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True, deferred=True)
+
+
+class ImageCacheEntry(Base):
+    """Ingested photo: source (e.g. drive:<file id>) -> content hash -> Cloudinary URL."""
+
+    __tablename__ = "image_cache"
+    __table_args__ = (Index("ix_image_cache_content_hash", "content_hash"),)
+
+    source_key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    secure_url: Mapped[Optional[str]] = mapped_column(Text)
+    content_type: Mapped[Optional[str]] = mapped_column(String(128))
+    created_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+
+
+class Job(Base):
+    """Background job; payload is the input, processed the resume checkpoint."""
+
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_status_heartbeat", "status", "heartbeat_at"),
+        Index("ix_jobs_dedupe_key", "dedupe_key"),
+        Index("ix_jobs_event_id", "event_id"),
+    )
+
+    id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    kind: Mapped[str] = mapped_column(String(64), nullable=False)
+    event_id: Mapped[Optional[str]] = mapped_column(String(64))
+    created_by: Mapped[Optional[str]] = mapped_column(String(128))
+    status: Mapped[str] = mapped_column(String(32), default="queued")
+    dedupe_key: Mapped[Optional[str]] = mapped_column(String(128))
+    total: Mapped[int] = mapped_column(Integer, default=0)
+    processed: Mapped[int] = mapped_column(Integer, default=0)
+    created_count: Mapped[int] = mapped_column(Integer, default=0)
+    error_count: Mapped[int] = mapped_column(Integer, default=0)
+    errors: Mapped[list[Any]] = mapped_column(JSONB, default=list)
+    result: Mapped[list[Any]] = mapped_column(JSONB, default=list)
+    payload: Mapped[Optional[Any]] = mapped_column(JSONB, nullable=True, deferred=True)
+    message: Mapped[Optional[str]] = mapped_column(Text)
+    worker_id: Mapped[Optional[str]] = mapped_column(String(128))
+    heartbeat_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    created_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
 
 
 class MigrationRun(Base):
@@ -0,0 +1,41 @@
+"""
+Opaque keyset cursors for large list endpoints (Postgres and Firestore).
+
+A cursor encodes the sort key of the last row on a page; the next page
+starts strictly after it, so pages never materialize the full list.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+from typing import Any, Optional
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(*values: Any) -> str:
+    raw = json.dumps(list(values), separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list[Any]:
+    """Inverse of encode_cursor. Raises ValueError for malformed cursors."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(values, list) or not values:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def page_size(limit: Optional[int]) -> int:
+    """DEFAULT_PAGE_SIZE when no limit is given. Raises ValueError outside 1..MAX_PAGE_SIZE."""
+    if limit is None:
+        return DEFAULT_PAGE_SIZE
+    if not 1 <= int(limit) <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    return int(limit)
@@ -0,0 +1,241 @@
+"""
+Payment status from the gateway without waiting for the browser.
+
+Before, an order only left PENDING when the customer's browser called
+/api/payments/verify; abandoned sessions stayed PENDING and customers
+created new orders. Two server-side paths now update payment_orders, both
+through the same idempotent store.apply():
+
+  webhook     POST /api/payments/webhook, signed by Cashfree with
+              base64(HMAC-SHA256(client secret, x-webhook-timestamp + raw body))
+  reconciler  every `interval` seconds, open orders older than `min_age`
+              (customer gone, webhook lost) are claimed in one batch, looked
+              up on the pooled gateway client and written in one transaction
+
+Only open orders (PENDING/ACTIVE) change; PAID, EXPIRED and TERMINATED are
+final, so replayed or out-of-order webhooks are harmless.
+
+Stores: PgPaymentStore (payment_orders table) and FirestorePaymentStore
+(payment_orders collection; the due-orders query needs a composite index
+on status + created_at).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.cashfree import CashfreeError
+from app.models import OPEN_PAYMENT_STATUSES
+
+logger = logging.getLogger(__name__)
+
+# Webhook type -> order status (Cashfree keeps an order payable after a
+# failed or abandoned attempt, so those leave it ACTIVE)
+WEBHOOK_STATUSES = {
+    "PAYMENT_SUCCESS_WEBHOOK": "PAID",
+    "PAYMENT_FAILED_WEBHOOK": "ACTIVE",
+    "PAYMENT_USER_DROPPED_WEBHOOK": "ACTIVE",
+}
+
+
+def webhook_signature(raw_body: bytes, timestamp: str, secret: str) -> str:
+    digest = hmac.new(secret.encode(), timestamp.encode() + raw_body, hashlib.sha256).digest()
+    return base64.b64encode(digest).decode()
+
+
+def verify_webhook_signature(raw_body: bytes, timestamp: str, signature: str, secret: str) -> bool:
+    if not (timestamp and signature and secret):
+        return False
+    return hmac.compare_digest(webhook_signature(raw_body, timestamp, secret), signature)
+
+
+def webhook_update(payload: dict[str, Any]) -> Optional[dict[str, Any]]:
+    """
+    {order_id, status, transaction_id, amount} from a webhook body; None for
+    other events. transaction_id is the cf_order_id, as written by order
+    creation, verify and the reconciler (None keeps the stored one).
+    """
+    status = WEBHOOK_STATUSES.get(payload.get("type"))
+    data = payload.get("data") or {}
+    order = data.get("order") or {}
+    payment = data.get("payment") or {}
+    if not status or not order.get("order_id"):
+        return None
+    return {
+        "order_id": str(order["order_id"]),
+        "status": status,
+        "transaction_id": str(order["cf_order_id"]) if order.get("cf_order_id") else None,
+        "amount": payment.get("payment_amount", order.get("order_amount")),
+    }
+
+
+class PgPaymentStore:
+    """payment_orders table via pg_repo."""
+
+    def __init__(self, repo) -> None:
+        self.repo = repo
+
+    def get(self, order_id: str) -> Optional[dict[str, Any]]:
+        return self.repo.get_payment(order_id)
+
+    def apply(self, updates: list[dict[str, Any]]) -> list[str]:
+        return self.repo.apply_payment_statuses(updates)
+
+    def claim_due(
+        self, created_before: datetime, created_after: datetime, checked_before: datetime, limit: int
+    ) -> list[dict[str, Any]]:
+        return self.repo.claim_due_payments(created_before, created_after, checked_before, limit)
+
+
+class FirestorePaymentStore:
+    """payment_orders/{order_id} documents (ISO timestamps)."""
+
+    def __init__(self, db) -> None:
+        self.db = db
+
+    def get(self, order_id: str) -> Optional[dict[str, Any]]:
+        snap = self.db.collection('payment_orders').document(order_id).get()
+        return snap.to_dict() if snap.exists else None
+
+    def apply(self, updates: list[dict[str, Any]]) -> list[str]:
+        from firebase_admin import firestore
+
+        now = datetime.now(timezone.utc).isoformat()
+        changed = []
+        for update in updates:
+            ref = self.db.collection('payment_orders').document(update['order_id'])
+
+            @firestore.transactional
+            def run(transaction):
+                snap = ref.get(transaction=transaction)
+                if not snap.exists:
+                    return False
+                order = snap.to_dict()
+                if order.get('status') not in OPEN_PAYMENT_STATUSES or order.get('status') == update['status']:
+                    transaction.update(ref, {'checked_at': now})
+                    return False
+                fields = {'status': update['status'], 'verified_at': now, 'checked_at': now}
+                if update.get('transaction_id'):
+                    fields['transaction_id'] = update['transaction_id']
+                transaction.update(ref, fields)
+                return True
+
+            if run(self.db.transaction()):
+                changed.append(update['order_id'])
+        return changed
+
+    def claim_due(
+        self, created_before: datetime, created_after: datetime, checked_before: datetime, limit: int
+    ) -> list[dict[str, Any]]:
+        query = (
+            self.db.collection('payment_orders')
+            .where('status', 'in', list(OPEN_PAYMENT_STATUSES))
+            .where('created_at', '<', created_before.isoformat())
+            .where('created_at', '>=', created_after.isoformat())
+            .order_by('created_at')
+        )
+        due = []
+        for doc in query.stream():
+            order = doc.to_dict()
+            if (order.get('checked_at') or '') < checked_before.isoformat():
+                due.append(order)
+                if len(due) >= limit:
+                    break
+        if due:
+            now = datetime.now(timezone.utc).isoformat()
+            batch = self.db.batch()
+            for order in due:
+                batch.update(self.db.collection('payment_orders').document(order['order_id']), {'checked_at': now})
+            batch.commit()
+        return due
+
+
+class PaymentReconciler:
+    def __init__(
+        self,
+        store,
+        client,
+        credentials: Callable[[], dict[str, Any]],
+        *,
+        interval_seconds: float = 60.0,
+        min_age_seconds: float = 600.0,
+        max_age_seconds: float = 48 * 3600.0,
+        batch_size: int = 100,
+        concurrency: int = 4,
+    ) -> None:
+        self.store = store
+        self.client = client
+        self.credentials = credentials
+        self.interval_seconds = interval_seconds
+        self.min_age_seconds = min_age_seconds
+        self.max_age_seconds = max_age_seconds
+        self.batch_size = batch_size
+        # Leaves most gateway slots to customers checking out right now
+        self.concurrency = max(1, concurrency)
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self) -> dict[str, int]:
+        """Check one batch of due orders; {'checked', 'changed', 'failed'}."""
+        now = datetime.now(timezone.utc)
+        orders = await run_in_threadpool(
+            self.store.claim_due,
+            now - timedelta(seconds=self.min_age_seconds),
+            now - timedelta(seconds=self.max_age_seconds),
+            # An order still open is checked again after another min_age
+            now - timedelta(seconds=self.min_age_seconds),
+            self.batch_size,
+        )
+        if not orders:
+            return {'checked': 0, 'changed': 0, 'failed': 0}
+        credentials = await run_in_threadpool(self.credentials)
+        slots = asyncio.Semaphore(self.concurrency)
+
+        async def check(order: dict[str, Any]) -> Optional[dict[str, Any]]:
+            async with slots:
+                try:
+                    gateway = await self.client.get_order(credentials, order['order_id'])
+                except CashfreeError as e:
+                    logger.warning(f"Reconcile {order['order_id']} failed: {e}")
+                    return None
+            if not gateway.get('order_status'):
+                return None
+            return {
+                'order_id': order['order_id'],
+                'status': gateway['order_status'],
+                'transaction_id': gateway.get('cf_order_id'),
+            }
+
+        results = await asyncio.gather(*(check(o) for o in orders))
+        updates = [r for r in results if r]
+        changed = await run_in_threadpool(self.store.apply, updates) if updates else []
+        if changed:
+            logger.info(f"Reconciled {len(changed)} payment orders: {', '.join(changed)}")
+        return {'checked': len(orders), 'changed': len(changed), 'failed': len(orders) - len(updates)}
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                # A full batch means more are due: go again without waiting
+                while (await self.run_once())['checked'] >= self.batch_size:
+                    pass
+            except Exception as e:
+                logger.warning(f"Payment reconcile sweep failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
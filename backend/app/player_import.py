@@ -0,0 +1,186 @@
+"""
+Excel/CSV player import: streaming read and column-wise validation.
+
+read_player_sheet yields the sheet as DataFrame chunks so a 10k-row upload
+never holds more than chunk_rows parsed rows at once:
+
+  .xlsx  openpyxl read-only mode (rows are streamed from the zip)
+  .csv   pandas read_csv(chunksize=...)
+  .xls   pandas read_excel (legacy format; no streaming reader, one chunk)
+
+validate_player_frame normalizes and checks a chunk with vectorized pandas
+operations (no iterrows / per-cell isna) and returns ready player docs
+plus per-row errors; Excel row numbers are kept for the error report.
+"""
+
+from __future__ import annotations
+
+import io
+import uuid
+from typing import Any, Iterator
+
+import pandas as pd
+
+REQUIRED_COLUMNS = ['name', 'phone', 'email', 'position', 'specialty']
+STAT_FIELDS = ['matches', 'runs', 'wickets', 'goals', 'assists']
+TEXT_FIELDS = ['position', 'specialty', 'previous_team', 'photo_url']
+DEFAULT_BASE_PRICE = 1000
+CHUNK_ROWS = 2000
+HEADER_ROWS = 1  # Excel row of the first data row is index + HEADER_ROWS + 1
+SUPPORTED_EXTENSIONS = ('.xlsx', '.xls', '.csv')
+
+
+class SheetError(ValueError):
+    """The file as a whole cannot be imported (format, missing columns)."""
+
+
+def read_player_sheet(contents: bytes, filename: str, chunk_rows: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    DataFrame chunks indexed by data row (0 = first data row). Fully empty
+    rows are dropped but keep their place, so index + HEADER_ROWS + 1 is
+    the row in the sheet.
+    """
+    name = filename.lower()
+    if name.endswith('.xlsx'):
+        chunks = _read_xlsx(contents, chunk_rows)
+    elif name.endswith('.csv'):
+        chunks = _read_csv(contents, chunk_rows)
+    elif name.endswith('.xls'):
+        chunks = iter([pd.read_excel(io.BytesIO(contents))])
+    else:
+        raise SheetError("File must be an Excel or CSV file (.xlsx, .xls or .csv)")
+
+    for df in chunks:
+        df.columns = [str(c).strip() for c in df.columns]
+        missing = [c for c in REQUIRED_COLUMNS if c not in df.columns]
+        if missing:
+            raise SheetError(f"Missing required columns: {', '.join(missing)}")
+        yield df
+
+
+def _read_csv(contents: bytes, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    start = 0
+    chunks = pd.read_csv(
+        io.BytesIO(contents), chunksize=chunk_rows, dtype=str, keep_default_na=True, skip_blank_lines=False
+    )
+    for df in chunks:
+        df.index = pd.RangeIndex(start, start + len(df))
+        start += len(df)
+        yield df[df.notna().any(axis=1)]
+
+
+def _read_xlsx(contents: bytes, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(io.BytesIO(contents), read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            raise SheetError("The sheet is empty")
+        columns = ['' if h is None else str(h) for h in header]
+        batch, index = [], []
+        for position, values in enumerate(rows):
+            if all(v is None for v in values):
+                continue  # blank separators and formatted but empty rows at the end
+            batch.append(values)
+            index.append(position)
+            if len(batch) >= chunk_rows:
+                yield pd.DataFrame.from_records(batch, columns=columns, index=index)
+                batch, index = [], []
+        if batch:
+            yield pd.DataFrame.from_records(batch, columns=columns, index=index)
+    finally:
+        workbook.close()
+
+
+def _text(series: pd.Series) -> pd.Series:
+    """Stripped strings (StringDtype); blanks become NA. Whole numbers lose '.0'."""
+    out = series.astype('string').str.strip().str.replace(r'^(\d+)\.0$', r'\1', regex=True)
+    return out.mask(out == '')
+
+
+def _column(df: pd.DataFrame, name: str) -> pd.Series:
+    return df[name] if name in df.columns else pd.Series(None, index=df.index, dtype=object)
+
+
+def _whole_numbers(series: pd.Series) -> tuple[pd.Series, pd.Series]:
+    """(Int64 values, mask of cells that are filled in but not numbers)."""
+    numbers = pd.to_numeric(series, errors='coerce')
+    return numbers.round().astype('Int64'), _text(series).notna() & numbers.isna()
+
+
+def _records(frame: pd.DataFrame) -> list[dict[str, Any]]:
+    """Rows as dicts of plain Python values (NA -> None, Int64 -> int)."""
+    return frame.astype(object).where(frame.notna(), None).to_dict('records')
+
+
+def validate_player_frame(
+    df: pd.DataFrame, event_id: str, categories: list[dict[str, Any]], status: str = 'available'
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """
+    ([{'row', 'player'}], [{'row', 'name', 'error'}]) for one chunk.
+    The first category is the default for rows without category_id.
+    """
+    if df.empty:
+        return [], []
+
+    categories_by_id = {c['id']: c for c in categories}
+    category_ids = _text(_column(df, 'category_id')).fillna(categories[0]['id'])
+    category_base = pd.to_numeric(
+        category_ids.map({cid: c.get('base_price', DEFAULT_BASE_PRICE) for cid, c in categories_by_id.items()}),
+        errors='coerce',
+    )
+    base_prices, bad_price = _whole_numbers(_column(df, 'base_price'))
+    ages, bad_age = _whole_numbers(_column(df, 'age'))
+
+    players = pd.DataFrame({
+        'name': _text(df['name']),
+        'category_id': category_ids,
+        'base_price': base_prices.fillna(category_base.fillna(DEFAULT_BASE_PRICE).round().astype('Int64')),
+        **{field: _text(_column(df, field)) for field in TEXT_FIELDS},
+        'age': ages,
+        # Phone: digits and a leading +; email lowercased
+        'phone': _text(df['phone']).str.replace(r'[\s\-().]', '', regex=True),
+        'email': _text(df['email']).str.lower(),
+    })
+    stats = pd.DataFrame(
+        {s: pd.to_numeric(df[s], errors='coerce').round().astype('Int64') for s in STAT_FIELDS if s in df.columns},
+        index=df.index,
+    )
+
+    # First failing check per row is reported
+    error = pd.Series(None, index=df.index, dtype=object)
+    checks = [
+        (players['name'].isna(), lambda i: "Name is required"),
+        (~category_ids.isin(list(categories_by_id)), lambda i: f"Category {category_ids[i]} not found in this event"),
+        (bad_price, lambda i: f"Invalid base_price: {df['base_price'][i]}"),
+        (bad_age, lambda i: f"Invalid age: {df['age'][i]}"),
+    ]
+    for failed, message in checks:
+        for i in failed[failed & error.isna()].index:
+            error[i] = message(i)
+    valid = error.isna()
+
+    errors = [
+        {'row': int(i) + HEADER_ROWS + 1, 'name': name, 'error': error[i]}
+        for i, name in players.loc[~valid, 'name'].fillna('Unknown').items()
+    ]
+    stat_records = _records(stats[valid]) if len(stats.columns) else [{}] * int(valid.sum())
+    rows = []
+    for i, player, player_stats in zip(players[valid].index, _records(players[valid]), stat_records):
+        player_stats = {k: v for k, v in player_stats.items() if v is not None}
+        rows.append({
+            'row': int(i) + HEADER_ROWS + 1,
+            'player': {
+                'id': str(uuid.uuid4()),
+                'event_id': event_id,
+                **player,
+                'current_price': None,
+                'status': status,
+                'sold_to_team_id': None,
+                'sold_price': None,
+                'stats': player_stats or None,
+            },
+        })
+    return rows, errors
@@ -88,6 +88,7 @@ def _spin_fresh(auction: Optional[dict[str, Any]], window_sec: float = 18.0) ->
                 "id": p.get("id"),
                 "name": p.get("name") or "Player",
                 "photo_url": p.get("photo_url"),
+                "photo_variants": p.get("photo_variants"),
                 "position": p.get("position"),
                 "base_price": p.get("base_price"),
             }
@@ -172,6 +173,7 @@ def public_player_payload(
             "id": player.get("id"),
             "name": player.get("name"),
             "photo_url": player.get("photo_url"),
+            "photo_variants": player.get("photo_variants"),
             "category_id": player.get("category_id"),
             "category_name": (category or {}).get("name"),
             "category_color": (category or {}).get("color"),
@@ -0,0 +1,228 @@
+"""
+Per-process read cache for rows that change a few times per auction
+(events, categories, teams, sponsors).
+
+Entries are tagged with scope versions, e.g. ("teams", event_id). Writers
+call invalidate(scope), which bumps the version in O(1): entries loaded
+under an older version are misses from then on, including a load that was
+already in flight when the write happened. With REDIS_URL set the versions
+live in app.shared_cache, so an invalidation reaches every worker on its next
+read (one MGET per lookup); otherwise TTL bounds staleness across workers.
+Atomic writes (bids, sales) still re-check rows under lock.
+"""
+
+from __future__ import annotations
+
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable, Optional
+
+from app.core.config import get_settings
+from app.shared_cache import SharedCache, SharedCacheError, shared_cache
+
+logger = logging.getLogger(__name__)
+
+Scope = tuple[str, Hashable]
+
+# Shared version keys outlive any entry TTL by far; expiring them only resets
+# counters nobody still holds entries for.
+VERSION_TTL_SECONDS = 86400
+
+
+class ReadCache:
+    """Bounded LRU with TTL and versioned scopes. Thread-safe."""
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        ttl_seconds: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+        versions: Optional[SharedCache] = None,
+        namespace: str = "read",
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.namespace = namespace
+        self._clock = clock
+        self._shared_versions = versions
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, tuple[float, tuple[int, ...], Any]] = OrderedDict()
+        self._versions: dict[Scope, int] = {}
+        self.reset_stats()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    @property
+    def shared(self) -> bool:
+        """Invalidations reach every worker (versions in app.shared_cache)."""
+        return self._shared_versions is not None
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits: dict[str, int] = {}
+            self.misses: dict[str, int] = {}
+            self.invalidations = 0
+            self.evictions = 0
+            self.backend_errors = 0
+
+    def _version_key(self, scope: Scope) -> str:
+        return f"{self.namespace}:v:{scope[0]}:{scope[1]}"
+
+    def _current_versions(self, scopes: tuple[Scope, ...]) -> tuple[int, ...]:
+        if self._shared_versions is None:
+            with self._lock:
+                return tuple(self._versions.get(s, 0) for s in scopes)
+        if not scopes:
+            return ()
+        values = self._shared_versions.get_many([self._version_key(s) for s in scopes])
+        return tuple(v or 0 for v in values)
+
+    def get_or_load(
+        self,
+        kind: str,
+        key: Hashable,
+        scopes: Iterable[Scope],
+        loader: Callable[[], Any],
+        ttl_for: Optional[Callable[[Any], float]] = None,
+    ) -> Any:
+        """Return a copy of the cached value, calling loader() on a miss.
+
+        None results are cached too (missing rows are polled as often as
+        present ones). ttl_for(value) can shorten the TTL of one entry, e.g.
+        to a row's own expiry; values with no time left are not stored.
+        """
+        if not self.enabled:
+            return loader()
+        scopes = tuple(scopes)
+        cache_key = (kind, key)
+        try:
+            versions = self._current_versions(scopes)
+        except SharedCacheError as e:
+            # Cannot tell whether an entry is current: read through
+            logger.warning(f"read cache versions unavailable: {e}")
+            self.backend_errors += 1
+            return loader()
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry and entry[0] > self._clock() and entry[1] == versions:
+                self._entries.move_to_end(cache_key)
+                self.hits[kind] = self.hits.get(kind, 0) + 1
+                return copy.deepcopy(entry[2])
+            self.misses[kind] = self.misses.get(kind, 0) + 1
+
+        value = loader()
+        ttl = self.ttl_seconds if ttl_for is None else min(self.ttl_seconds, ttl_for(value))
+        if ttl <= 0:
+            return copy.deepcopy(value)
+
+        with self._lock:
+            self._entries[cache_key] = (self._clock() + ttl, versions, value)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return copy.deepcopy(value)
+
+    def invalidate(self, *scopes: Optional[Scope]) -> None:
+        """Bump scope versions; None scopes are ignored for caller convenience."""
+        for scope in scopes:
+            if scope is None or scope[1] is None:
+                continue
+            if self._shared_versions is not None:
+                try:
+                    self._shared_versions.incr(self._version_key(scope), ttl=VERSION_TTL_SECONDS)
+                except SharedCacheError as e:
+                    logger.error(f"read cache invalidation of {scope} not shared: {e}")
+                    self.backend_errors += 1
+                    # Other workers fall back to the TTL; drop our own copies
+                    with self._lock:
+                        self._entries.clear()
+            else:
+                with self._lock:
+                    self._versions[scope] = self._versions.get(scope, 0) + 1
+            with self._lock:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            hits = sum(self.hits.values())
+            misses = sum(self.misses.values())
+            return {
+                "enabled": self.enabled,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "size": len(self._entries),
+                "hits": hits,
+                "misses": misses,
+                "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+                "shared_versions": self._shared_versions is not None,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+                "backend_errors": self.backend_errors,
+                "by_kind": {
+                    kind: {"hits": self.hits.get(kind, 0), "misses": self.misses.get(kind, 0)}
+                    for kind in sorted(set(self.hits) | set(self.misses))
+                },
+            }
+
+
+def event_scope(event_id: Optional[str]) -> Scope:
+    return ("event", event_id)
+
+
+def categories_scope(event_id: Optional[str]) -> Scope:
+    return ("categories", event_id)
+
+
+def teams_scope(event_id: Optional[str]) -> Scope:
+    return ("teams", event_id)
+
+
+def team_scope(team_id: Optional[str]) -> Scope:
+    return ("team", team_id)
+
+
+def sponsors_scope(event_id: Optional[str]) -> Scope:
+    return ("sponsors", event_id)
+
+
+def user_scope(uid: Optional[str]) -> Scope:
+    return ("user", uid)
+
+
+def broadcast_token_scope(token: Optional[str]) -> Scope:
+    return ("broadcast_token", token)
+
+
+_versions_backend = shared_cache if shared_cache.shared else None
+
+# Without the shared backend a revoke only clears the worker that handled it,
+# so other workers may serve a revoked token for this long.
+LOCAL_BROADCAST_TOKEN_TTL_SECONDS = 5.0
+
+read_cache = ReadCache(
+    get_settings().read_cache_max_entries,
+    get_settings().read_cache_ttl_seconds,
+    versions=_versions_backend,
+)
+
+# Broadcast token -> event lookups get their own LRU so invalid-token scans
+# (negative entries) cannot evict event/team rows from read_cache.
+broadcast_token_cache = ReadCache(
+    get_settings().broadcast_token_cache_size,
+    get_settings().broadcast_token_cache_ttl_seconds
+    if _versions_backend is not None
+    else min(get_settings().broadcast_token_cache_ttl_seconds, LOCAL_BROADCAST_TOKEN_TTL_SECONDS),
+    versions=_versions_backend,
+    namespace="broadcast",
+)
@@ -0,0 +1,306 @@
+"""
+Key/value cache shared by all workers (uvicorn workers, Railway replicas).
+
+Per-process state such as read-cache scope versions, claim-change stamps and
+password reset tokens is only coherent while one process serves traffic.
+shared_cache is the single place that state lives:
+
+  MemoryCache  in-process dict (default; single worker, tests)
+  RespCache    any Redis-protocol server (Redis, Valkey, KeyDB) selected
+               with REDIS_URL; small RESP2 client over pooled sockets
+
+Values are JSON-encoded in both backends so they behave the same. Backend
+failures raise SharedCacheError; callers decide whether to degrade.
+"""
+
+from __future__ import annotations
+
+import json
+import socket
+import ssl
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Iterable, Optional
+from urllib.parse import unquote, urlparse
+
+from app.core.config import get_settings
+
+
+class SharedCacheError(Exception):
+    pass
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), default=str)
+
+
+def _loads(raw: Optional[str]) -> Any:
+    return None if raw is None else json.loads(raw)
+
+
+class SharedCache(ABC):
+    """Backend interface. ttl is in seconds; None means no expiry."""
+
+    shared = False
+
+    def get(self, key: str) -> Any:
+        return self.get_many([key])[0]
+
+    @abstractmethod
+    def get_many(self, keys: list[str]) -> list[Any]: ...
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None: ...
+
+    @abstractmethod
+    def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        """Set only if absent (idempotency keys, locks). True if set."""
+
+    @abstractmethod
+    def pop(self, key: str) -> Any:
+        """Get and delete atomically (one-time tokens)."""
+
+    @abstractmethod
+    def delete(self, *keys: str) -> int: ...
+
+    @abstractmethod
+    def incr(self, key: str, ttl: Optional[float] = None) -> int:
+        """Atomic counter; ttl (re)sets the key's expiry."""
+
+
+class MemoryCache(SharedCache):
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._data: dict[str, tuple[Optional[float], str]] = {}
+
+    def _live(self, key: str) -> Optional[str]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[0] is not None and entry[0] <= self._clock():
+            del self._data[key]
+            return None
+        return entry[1]
+
+    def _expiry(self, ttl: Optional[float]) -> Optional[float]:
+        return None if ttl is None else self._clock() + ttl
+
+    def get_many(self, keys: list[str]) -> list[Any]:
+        with self._lock:
+            return [_loads(self._live(k)) for k in keys]
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        with self._lock:
+            self._data[key] = (self._expiry(ttl), _dumps(value))
+
+    def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        with self._lock:
+            if self._live(key) is not None:
+                return False
+            self._data[key] = (self._expiry(ttl), _dumps(value))
+            return True
+
+    def pop(self, key: str) -> Any:
+        with self._lock:
+            raw = self._live(key)
+            self._data.pop(key, None)
+            return _loads(raw)
+
+    def delete(self, *keys: str) -> int:
+        removed = 0
+        with self._lock:
+            for key in keys:
+                if self._live(key) is not None:
+                    del self._data[key]
+                    removed += 1
+        return removed
+
+    def incr(self, key: str, ttl: Optional[float] = None) -> int:
+        with self._lock:
+            value = int(self._live(key) or 0) + 1
+            if ttl is not None:
+                expiry = self._expiry(ttl)
+            else:
+                expiry = self._data[key][0] if key in self._data else None
+            self._data[key] = (expiry, str(value))
+            return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+# --- Redis protocol --------------------------------------------------------
+
+
+class _RespError(str):
+    """Error reply; read in place so pipelined replies stay in sync."""
+
+
+class _RespConnection:
+    def __init__(self, sock: socket.socket) -> None:
+        self.sock = sock
+        self.reader = sock.makefile("rb")
+
+    def send(self, *commands: Iterable[Any]) -> None:
+        out = bytearray()
+        for command in commands:
+            args = [a if isinstance(a, bytes) else str(a).encode() for a in command]
+            out += b"*%d\r\n" % len(args)
+            for arg in args:
+                out += b"$%d\r\n%s\r\n" % (len(arg), arg)
+        self.sock.sendall(out)
+
+    def read(self) -> Any:
+        line = self.reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("connection closed")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode()
+        if kind == b"-":
+            return _RespError(body.decode())
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            size = int(body)
+            if size < 0:
+                return None
+            data = self.reader.read(size + 2)
+            return data[:-2].decode()
+        if kind == b"*":
+            size = int(body)
+            return None if size < 0 else [self.read() for _ in range(size)]
+        raise SharedCacheError(f"unexpected RESP reply {line!r}")
+
+    def close(self) -> None:
+        try:
+            self.reader.close()
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class RespCache(SharedCache):
+    """Redis-protocol backend. Thread-safe; sockets are pooled per process."""
+
+    shared = True
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        prefix: str = "powerauction:",
+        timeout: float = 2.0,
+        max_idle: int = 16,
+    ) -> None:
+        parsed = urlparse(url)
+        if parsed.scheme not in ("redis", "rediss"):
+            raise ValueError(f"Unsupported cache URL scheme: {parsed.scheme!r}")
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.tls = parsed.scheme == "rediss"
+        self.username = unquote(parsed.username) if parsed.username else None
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.prefix = prefix
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self._idle: list[_RespConnection] = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> _RespConnection:
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        if self.tls:
+            sock = ssl.create_default_context().wrap_socket(sock, server_hostname=self.host)
+        conn = _RespConnection(sock)
+        setup = []
+        if self.password:
+            setup.append(
+                ("AUTH", self.username, self.password) if self.username else ("AUTH", self.password)
+            )
+        if self.db:
+            setup.append(("SELECT", self.db))
+        if setup:
+            try:
+                conn.send(*setup)
+                errors = [r for r in (conn.read() for _ in setup) if isinstance(r, _RespError)]
+            except BaseException:
+                conn.close()
+                raise
+            if errors:
+                conn.close()
+                raise SharedCacheError(f"Cache backend rejected connection setup: {errors[0]}")
+        return conn
+
+    def _execute(self, *commands: tuple) -> list[Any]:
+        """Send commands in one round trip; replies in order."""
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        try:
+            if conn is None:
+                conn = self._connect()
+            conn.send(*commands)
+            replies = [conn.read() for _ in commands]
+        except (OSError, ConnectionError) as e:
+            if conn is not None:
+                conn.close()
+            raise SharedCacheError(f"Cache backend unavailable: {e}") from e
+        except BaseException:
+            # Unparseable reply (or interrupted read): the stream is out of sync
+            if conn is not None:
+                conn.close()
+            raise
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                conn = None
+        if conn is not None:
+            conn.close()
+        errors = [r for r in replies if isinstance(r, _RespError)]
+        if errors:
+            raise SharedCacheError(errors[0])
+        return replies
+
+    def _k(self, key: str) -> str:
+        return self.prefix + key
+
+    @staticmethod
+    def _px(ttl: Optional[float]) -> tuple:
+        return () if ttl is None else ("PX", max(1, int(ttl * 1000)))
+
+    def get_many(self, keys: list[str]) -> list[Any]:
+        if not keys:
+            return []
+        return [_loads(v) for v in self._execute(("MGET", *map(self._k, keys)))[0]]
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self._execute(("SET", self._k(key), _dumps(value), *self._px(ttl)))
+
+    def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        return self._execute(("SET", self._k(key), _dumps(value), "NX", *self._px(ttl)))[0] == "OK"
+
+    def pop(self, key: str) -> Any:
+        return _loads(self._execute(("GETDEL", self._k(key)))[0])
+
+    def delete(self, *keys: str) -> int:
+        if not keys:
+            return 0
+        return self._execute(("DEL", *map(self._k, keys)))[0]
+
+    def incr(self, key: str, ttl: Optional[float] = None) -> int:
+        if ttl is None:
+            return self._execute(("INCR", self._k(key)))[0]
+        value, _ = self._execute(
+            ("INCR", self._k(key)), ("PEXPIRE", self._k(key), max(1, int(ttl * 1000)))
+        )
+        return value
+
+
+def build_shared_cache(url: Optional[str]) -> SharedCache:
+    return RespCache(url) if url else MemoryCache()
+
+
+shared_cache = build_shared_cache(get_settings().redis_url)
@@ -0,0 +1,94 @@
+"""
+Request collapsing for hot public GETs (auction state, team lists, live boards).
+
+A sale makes every board, dashboard and projector refetch at once. With
+SingleFlight.do(key, fn), concurrent callers with the same key await one
+computation of fn, which runs in the threadpool so the blocking DB/Firestore
+call no longer holds the event loop. An optional window additionally serves
+the finished result to callers arriving within that many seconds, so a burst
+of polls spread over a few ms still costs one read. Errors are shared with
+in-flight waiters but never cached.
+
+Per process; staleness is bounded by the window.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, TypeVar
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import get_settings
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    def __init__(
+        self,
+        window_seconds: float = 0.0,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self._recent: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.calls = 0
+        self.shared = 0
+        self.window_hits = 0
+
+    async def do(
+        self, key: Hashable, fn: Callable[[], T], window: Optional[float] = None
+    ) -> T:
+        """Result of fn() for key, computed at most once per in-flight burst."""
+        window = self.window_seconds if window is None else window
+        recent = self._recent.get(key)
+        if recent is not None:
+            if recent[0] > self._clock():
+                self.window_hits += 1
+                return recent[1]
+            del self._recent[key]
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(self._run(key, fn, window))
+            self._inflight[key] = task
+        else:
+            self.shared += 1
+        # shield: a disconnecting caller must not cancel the shared computation
+        return await asyncio.shield(task)
+
+    async def _run(self, key: Hashable, fn: Callable[[], T], window: float) -> T:
+        try:
+            value = await run_in_threadpool(fn)
+            if window > 0 and self.max_entries > 0:
+                self._recent[key] = (self._clock() + window, value)
+                self._recent.move_to_end(key)
+                while len(self._recent) > self.max_entries:
+                    self._recent.popitem(last=False)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def forget(self, key: Hashable) -> None:
+        self._recent.pop(key, None)
+
+    def snapshot(self) -> dict[str, Any]:
+        served = self.calls + self.shared + self.window_hits
+        return {
+            "window_ms": round(self.window_seconds * 1000),
+            "in_flight": len(self._inflight),
+            "computations": self.calls,
+            "shared": self.shared,
+            "window_hits": self.window_hits,
+            "collapse_ratio": round(1 - self.calls / served, 4) if served else 0.0,
+        }
+
+
+hot_reads = SingleFlight(window_seconds=get_settings().hot_get_window_ms / 1000)
@@ -0,0 +1,159 @@
+"""
+Team counters (players_count, spent, remaining) in Firestore mode.
+
+Postgres derives them from sold players in one grouped query
+(pg_repo._load_teams). In Firestore the team document carries them, so
+GET /api/teams/event/{event_id} is one query over teams with no per-team
+player scans and no writes:
+
+  - every path that sells, releases, unsells or deletes a player moves the
+    counters in the same transaction as the player write, with
+    firestore.Increment (move_team_counters); a resale moves them from the
+    old team to the new one
+  - drift (console edits, documents written before this) is repaired by
+    TeamCounterReconciler, a background sweep that recounts `batch_size`
+    teams per tick with aggregation queries, round-robin over all teams,
+    and rewrites only teams whose counters differ
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+SOLD = "sold"
+
+
+def _sale(player: Optional[dict[str, Any]]) -> Optional[tuple[str, int]]:
+    """(team_id, price) if the player counts towards a team, else None."""
+    if player and player.get('status') == SOLD and player.get('sold_to_team_id'):
+        return player['sold_to_team_id'], int(player.get('sold_price') or 0)
+    return None
+
+
+def counter_deltas(
+    before: Optional[dict[str, Any]], after: Optional[dict[str, Any]]
+) -> dict[str, tuple[int, int]]:
+    """{team_id: (players delta, spent delta)} for a player changing from before to after (None = absent)."""
+    deltas: dict[str, tuple[int, int]] = {}
+    for sign, sale in ((-1, _sale(before)), (1, _sale(after))):
+        if sale:
+            team_id, price = sale
+            players, spent = deltas.get(team_id, (0, 0))
+            deltas[team_id] = (players + sign, spent + sign * price)
+    return {team_id: d for team_id, d in deltas.items() if d != (0, 0)}
+
+
+def move_team_counters(
+    transaction, db, before: Optional[dict[str, Any]], after: Optional[dict[str, Any]]
+) -> list[str]:
+    """
+    Apply counter_deltas inside a Firestore transaction; the team ids touched.
+
+    Reads the team documents, so call it after the caller's own reads and
+    before its writes. Teams that no longer exist are skipped.
+    """
+    from firebase_admin import firestore
+
+    deltas = counter_deltas(before, after)
+    refs = {team_id: db.collection('teams').document(team_id) for team_id in deltas}
+    existing = [team_id for team_id, ref in refs.items() if ref.get(transaction=transaction).exists]
+    for team_id in existing:
+        players, spent = deltas[team_id]
+        transaction.update(refs[team_id], {
+            'players_count': firestore.Increment(players),
+            'spent': firestore.Increment(spent),
+            'remaining': firestore.Increment(-spent),
+        })
+    return existing
+
+
+class TeamCounterReconciler:
+    def __init__(self, db, *, interval_seconds: float = 300.0, batch_size: int = 50, on_repair=None) -> None:
+        self.db = db
+        self.interval_seconds = interval_seconds
+        self.batch_size = max(1, batch_size)
+        # Called with the team id after a repair (cache invalidation)
+        self.on_repair = on_repair
+        self._after: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def recount(self, team_id: str, transaction=None) -> tuple[int, int]:
+        """(players_count, spent) of a team from its sold players (one aggregation query)."""
+        query = (
+            self.db.collection('players')
+            .where('sold_to_team_id', '==', team_id)
+            .where('status', '==', SOLD)
+            .count(alias='count')
+            .sum('sold_price', alias='spent')
+        )
+        values = {r.alias: r.value for r in query.get(transaction=transaction)[0]}
+        return int(values['count']), int(values.get('spent') or 0)
+
+    def repair(self, team_id: str) -> bool:
+        """Recount one team and rewrite its counters if they drifted; True if rewritten."""
+        from firebase_admin import firestore
+
+        ref = self.db.collection('teams').document(team_id)
+
+        @firestore.transactional
+        def run(transaction):
+            # Both reads in the transaction: a sale committing meanwhile retries this
+            snap = ref.get(transaction=transaction)
+            if not snap.exists:
+                return False
+            players, spent = self.recount(team_id, transaction)
+            team = snap.to_dict()
+            fields = {
+                'players_count': players,
+                'spent': spent,
+                'remaining': (team.get('budget') or 0) - spent,
+            }
+            if all(team.get(k) == v for k, v in fields.items()):
+                return False
+            transaction.update(ref, fields)
+            logger.warning(
+                f"Team {team_id} counters drifted "
+                f"({team.get('players_count')}/{team.get('spent')} -> {players}/{spent}), repaired"
+            )
+            return True
+
+        repaired = run(self.db.transaction())
+        if repaired and self.on_repair:
+            self.on_repair(team_id)
+        return repaired
+
+    def sweep(self) -> dict[str, int]:
+        """Check the next `batch_size` teams (wrapping around); {'checked', 'repaired'}."""
+        from firebase_admin import firestore
+
+        query = self.db.collection('teams').order_by(firestore.FieldPath.document_id())
+        if self._after:
+            query = query.start_after({firestore.FieldPath.document_id(): self._after})
+        team_ids = [doc.id for doc in query.limit(self.batch_size).select([]).stream()]
+        self._after = team_ids[-1] if len(team_ids) == self.batch_size else None
+        repaired = sum(1 for team_id in team_ids if self.repair(team_id))
+        return {'checked': len(team_ids), 'repaired': repaired}
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await run_in_threadpool(self.sweep)
+            except Exception as e:
+                logger.warning(f"Team counter sweep failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
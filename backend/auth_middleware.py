@@ -1,13 +1,36 @@
+import time
+from typing import Optional
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from firebase_config import firebase_auth, db
 from models import UserRole
+from app.core.id_tokens import get_id_token_verifier
+from app.read_cache import read_cache, user_scope
+from app.shared_cache import SharedCacheError, shared_cache
 
 security = HTTPBearer()
 
+# Custom claim stamped (ms since epoch) whenever refresh_user_claims pushes
+# role/team_id. Tokens carrying it are trusted without a store read, unless
+# the user changed after that stamp (token not refreshed yet). Change stamps
+# live in shared_cache so every worker sees them; ID tokens last at most an
+# hour, so older stamps no longer matter.
+CLAIMS_STAMP = "claims_at"
+CLAIMS_CHANGE_TTL_SECONDS = 3600
+
 
-def _get_user_role_from_store(uid: str) -> str:
-    """Load role from Postgres or Firestore depending on DATA_BACKEND."""
+def _claims_changed_at(uid: str) -> Optional[int]:
+    """Last change stamp for uid (0 if none); None if it cannot be read."""
+    try:
+        return shared_cache.get(f"claims_at:{uid}") or 0
+    except SharedCacheError as e:
+        print(f"Claims stamp lookup failed: {e}")
+        return None
+
+
+def _load_user_access(uid: str) -> Optional[dict]:
+    """role/team_id from Postgres or Firestore depending on DATA_BACKEND."""
     try:
         from app.core.config import get_settings
 
@@ -16,8 +39,8 @@ def _get_user_role_from_store(uid: str) -> str:
 
             user = pg_repo.get_user(uid)
             if user:
-                return user.get("role") or ""
-            return ""
+                return {"role": user.get("role") or "", "team_id": user.get("team_id")}
+            return None
     except Exception as e:
         print(f"Postgres role lookup failed: {e}")
 
@@ -25,17 +48,90 @@ def _get_user_role_from_store(uid: str) -> str:
     if db:
         user_doc = db.collection("users").document(uid).get()
         if user_doc.exists:
-            return user_doc.to_dict().get("role", "")
-    return ""
+            data = user_doc.to_dict()
+            return {"role": data.get("role", ""), "team_id": data.get("team_id")}
+    return None
+
+
+def resolve_user_access(current_user: dict) -> dict:
+    """
+    role and team_id for a verified token: from synced custom claims when
+    they are current, else from the store through a short TTL cache (tokens
+    issued before claims were synced or before the last change).
+    """
+    uid = current_user["uid"]
+    stamp = current_user.get(CLAIMS_STAMP)
+    if isinstance(stamp, (int, float)):
+        changed_at = _claims_changed_at(uid)
+        if changed_at is not None and stamp >= changed_at:
+            return {"role": current_user.get("role") or "", "team_id": current_user.get("team_id")}
+    access = read_cache.get_or_load(
+        "user_access", uid, [user_scope(uid)], lambda: _load_user_access(uid)
+    )
+    return access or {"role": "", "team_id": None}
+
+
+def claims_are_current(current_user: dict, access: dict) -> bool:
+    return (
+        isinstance(current_user.get(CLAIMS_STAMP), (int, float))
+        and current_user.get("role") == access.get("role")
+        and current_user.get("team_id") == access.get("team_id")
+    )
+
+
+def _mark_claims_changed(uid: str) -> int:
+    """Outdate every token stamped so far; the new stamp."""
+    stamp = int(time.time() * 1000)
+    try:
+        # Strictly after the previous stamp, even within the same millisecond
+        stamp = max(stamp, (shared_cache.get(f"claims_at:{uid}") or 0) + 1)
+        shared_cache.set(f"claims_at:{uid}", stamp, ttl=CLAIMS_CHANGE_TTL_SECONDS)
+    except SharedCacheError as e:
+        print(f"Error recording claims change for {uid}: {e}")
+    read_cache.invalidate(user_scope(uid))
+    return stamp
+
+
+def refresh_user_claims(uid: Optional[str]) -> None:
+    """Push the stored role/team_id into Firebase custom claims after a change.
+
+    Call after the store write. New claims reach clients on their next token
+    refresh; until then workers resolve the user from the store.
+    """
+    if not uid:
+        return
+    stamp = _mark_claims_changed(uid)
+    access = _load_user_access(uid)
+    if access is None:
+        return
+    try:
+        firebase_auth.set_custom_user_claims(
+            uid, {"role": access["role"], "team_id": access["team_id"], CLAIMS_STAMP: stamp}
+        )
+    except Exception as e:
+        print(f"Error setting custom claims for {uid}: {e}")
+
+
+def revoke_user_claims(uid: str) -> None:
+    """Stop trusting a deleted user's tokens.
+
+    Call after the store delete: tokens that are still valid then resolve
+    from the store (no role), and refresh tokens are revoked so no new ID
+    token is minted.
+    """
+    _mark_claims_changed(uid)
+    try:
+        firebase_auth.revoke_refresh_tokens(uid)
+    except Exception as e:
+        print(f"Error revoking refresh tokens for {uid}: {e}")
 
 
 async def verify_token(
     credentials: HTTPAuthorizationCredentials = Depends(security),
 ) -> dict:
-    """Verify Firebase JWT token"""
+    """Verify Firebase JWT token (cached per token until exp, see app/core/id_tokens.py)"""
     try:
-        decoded_token = firebase_auth.verify_id_token(credentials.credentials)
-        return decoded_token
+        return get_id_token_verifier().verify(credentials.credentials)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -51,7 +147,7 @@ async def get_current_user(token_data: dict = Depends(verify_token)) -> dict:
 async def require_super_admin(current_user: dict = Depends(get_current_user)) -> dict:
     """Require super admin role"""
     try:
-        role = _get_user_role_from_store(current_user["uid"])
+        role = resolve_user_access(current_user)["role"]
         if role == UserRole.SUPER_ADMIN.value:
             return current_user
 
@@ -77,7 +173,7 @@ async def require_super_admin(current_user: dict = Depends(get_current_user)) ->
 async def require_team_admin(current_user: dict = Depends(get_current_user)) -> dict:
     """Require team admin or super admin role"""
     try:
-        role = _get_user_role_from_store(current_user["uid"])
+        role = resolve_user_access(current_user)["role"]
         if role in [UserRole.TEAM_ADMIN.value, UserRole.SUPER_ADMIN.value]:
             return current_user
 
@@ -102,7 +198,7 @@ async def require_team_admin(current_user: dict = Depends(get_current_user)) ->
 async def require_event_organizer(current_user: dict = Depends(get_current_user)) -> dict:
     """Require event organizer or super admin role"""
     try:
-        role = _get_user_role_from_store(current_user["uid"])
+        role = resolve_user_access(current_user)["role"]
         if role in [UserRole.EVENT_ORGANIZER.value, UserRole.SUPER_ADMIN.value]:
             return current_user
 
@@ -1,7 +1,7 @@
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from datetime import datetime, timedelta
+from datetime import datetime
 import secrets
 import os
 from typing import Optional
@@ -14,32 +14,26 @@ SMTP_PASSWORD = os.getenv("SMTP_PASSWORD", "msl@OP12")  # Set this in environmen
 FROM_EMAIL = "bid@thepowerauction.com"
 FROM_NAME = "PowerAuction"
 
-# Store reset tokens temporarily (in production, use Redis or database)
-password_reset_tokens = {}
+# Reset tokens live in the shared cache so any worker can verify them
+RESET_TOKEN_TTL_SECONDS = 3600  # Token expires in 1 hour
 
 
 def generate_reset_token(email: str) -> str:
     """Generate a secure password reset token"""
+    from app.shared_cache import shared_cache
+
     token = secrets.token_urlsafe(32)
-    expiry = datetime.now() + timedelta(hours=1)  # Token expires in 1 hour
-    password_reset_tokens[token] = {
-        "email": email,
-        "expiry": expiry
-    }
+    shared_cache.set(f"pwreset:{token}", {"email": email}, ttl=RESET_TOKEN_TTL_SECONDS)
     return token
 
 
 def verify_reset_token(token: str) -> Optional[str]:
-    """Verify reset token and return email if valid"""
-    token_data = password_reset_tokens.get(token)
+    """Verify reset token and return email if valid (expired tokens are gone)"""
+    from app.shared_cache import shared_cache
+
+    token_data = shared_cache.get(f"pwreset:{token}")
     if not token_data:
         return None
-    
-    if datetime.now() > token_data["expiry"]:
-        # Token expired
-        del password_reset_tokens[token]
-        return None
-    
     return token_data["email"]
 
 
@@ -263,6 +263,7 @@ class Player(BaseModel):
     identity_proof_url: Optional[str] = None
     is_priority: bool = False
     extra_fields: Optional[Dict[str, Any]] = None
+    photo_variants: Optional[Dict[str, str]] = None  # thumb/card/broadcast WebP URLs
 
 # Public Player Registration Model
 class PublicPlayerRegistration(BaseModel):
@@ -287,6 +288,18 @@ class ApprovalRequest(BaseModel):
     category_id: str
     base_price: int
 
+class BulkRegistrationItem(BaseModel):
+    registration_id: str
+    category_id: Optional[str] = None
+    base_price: Optional[int] = None
+
+class BulkRegistrationDecision(BaseModel):
+    action: str = "approve"  # approve, reject
+    items: List[BulkRegistrationItem]
+    # Defaults for items without their own category_id/base_price
+    category_id: Optional[str] = None
+    base_price: Optional[int] = None
+
 # Bid Models
 class BidCreate(BaseModel):
     player_id: str
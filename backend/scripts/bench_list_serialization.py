@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Per-row cost of list responses: response_model path vs app.fast_json.
+
+The legacy path is what GET /auctions/{id}/players did for Postgres: build
+Player(**row) per row, then FastAPI re-validates against List[Player],
+jsonable_encoder()s and json.dumps the result. The fast path projects the
+dicts and serializes once with orjson.
+
+Usage:
+  cd backend
+  PYTHONPATH=. python scripts/bench_list_serialization.py
+  PYTHONPATH=. python scripts/bench_list_serialization.py 1000 10000 50000
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.fast_json import json_response, orjson, project_rows
+from models import Player, PlayerStats
+
+REPEAT = 5
+
+
+def make_rows(n: int) -> list[dict]:
+    return [
+        {
+            "id": f"player-{i:06d}",
+            "event_id": "bench-event",
+            "category_id": f"cat-{i % 4}",
+            "name": f"Player {i}",
+            "base_price": 1000 + i,
+            "current_price": None,
+            "photo_url": f"https://res.cloudinary.com/demo/image/upload/p{i}.jpg",
+            "age": 20 + i % 15,
+            "position": "All-rounder",
+            "specialty": "Right-arm fast",
+            "stats": {"matches": i % 50, "runs": i * 3, "wickets": i % 7},
+            "status": "available",
+            "sold_to_team_id": None,
+            "sold_price": None,
+            "previous_team": "Local XI",
+            "cricheroes_link": None,
+            "contact_number": "9999999999",
+            "district": "Ernakulam",
+            "identity_proof_url": None,
+            "is_priority": i % 10 == 0,
+            "extra_fields": {"email": f"p{i}@example.com"},
+        }
+        for i in range(n)
+    ]
+
+
+_field = create_response_field(name="bench", type_=List[Player])
+
+
+def legacy(rows: list[dict]) -> bytes:
+    result = []
+    for player_data in rows:
+        player_data = dict(player_data)
+        if player_data.get("stats"):
+            player_data["stats"] = PlayerStats(**player_data["stats"])
+        result.append(Player(**player_data))
+    content = asyncio.run(serialize_response(field=_field, response_content=result))
+    return JSONResponse(content).body
+
+
+def fast(rows: list[dict]) -> bytes:
+    return json_response(project_rows(rows, Player)).body
+
+
+def best_of(fn, rows) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn(rows)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(sizes: list[int]) -> None:
+    print(f"orjson: {'yes' if orjson else 'no (stdlib json fallback)'}; best of {REPEAT}")
+    print(f"{'rows':>8} {'legacy us/row':>14} {'fast us/row':>12} {'speedup':>8}")
+    for n in sizes:
+        rows = make_rows(n)
+        assert len(fast(rows)) > 0 and len(legacy(rows)) > 0
+        t_legacy = best_of(legacy, rows)
+        t_fast = best_of(fast, rows)
+        print(
+            f"{n:>8} {t_legacy / n * 1e6:>14.2f} {t_fast / n * 1e6:>12.2f} "
+            f"{t_legacy / t_fast:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [1000, 10000])
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Thundering-herd benchmark for GET /api/auction/state/{event_id}.
+
+Fires N concurrent identical requests at the ASGI app (in-process, httpx)
+and counts how many times the backing read ran. The read is
+pg_repo.get_auction_state replaced by a stand-in that sleeps for --db-ms,
+so no database is needed and the numbers isolate the collapsing layer.
+
+Requests arrive spread over --spread-ms (polls after a sale do not all land
+in the same instant). Modes:
+  off         each request reads inline on the event loop (old behaviour)
+  collapse    singleflight only (window 0)
+  window      singleflight + HOT_GET_WINDOW_MS micro-cache
+
+Usage:
+  cd backend
+  PYTHONPATH=. python scripts/bench_stampede.py
+  PYTHONPATH=. python scripts/bench_stampede.py --requests 500 --db-ms 20 --spread-ms 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import threading
+import time
+
+os.environ["DATA_BACKEND"] = "postgres"
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg://bench@localhost/bench")
+
+import httpx  # noqa: E402
+
+import server  # noqa: E402
+from app.singleflight import SingleFlight  # noqa: E402
+
+
+class CountingRead:
+    def __init__(self, db_ms: float) -> None:
+        self.db_ms = db_ms
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, event_id: str) -> dict:
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.db_ms / 1000)
+        return {"id": f"auction_{event_id}", "event_id": event_id, "status": "in_progress"}
+
+
+async def stampede(n: int, spread_ms: float) -> float:
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def one() -> int:
+            if spread_ms:
+                await asyncio.sleep(random.uniform(0, spread_ms) / 1000)
+            r = await client.get("/api/auction/state/bench-event")
+            return r.status_code
+
+        start = time.perf_counter()
+        codes = await asyncio.gather(*(one() for _ in range(n)))
+        elapsed = time.perf_counter() - start
+    assert all(c == 200 for c in codes), set(codes)
+    return elapsed
+
+
+async def run_mode(mode: str, args, read: CountingRead) -> None:
+    read.calls = 0
+    flight = SingleFlight(window_seconds=args.window_ms / 1000 if mode == "window" else 0)
+    if mode == "off":
+
+        async def inline(key, fn, window=None):
+            return fn()
+
+        flight.do = inline
+    server.hot_reads = flight
+    elapsed = await stampede(args.requests, args.spread_ms)
+    print(
+        f"{mode:>9}: {args.requests} requests  db reads={read.calls:4d}  "
+        f"wall={elapsed * 1000:7.1f} ms  ({args.requests / elapsed:8.0f} req/s)"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--db-ms", type=float, default=20.0)
+    parser.add_argument("--window-ms", type=float, default=100.0)
+    parser.add_argument("--spread-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    read = CountingRead(args.db_ms)
+    server._USE_POSTGRES = True
+    server._pg.get_auction_state = read
+    for mode in ("off", "collapse", "window"):
+        await run_mode(mode, args, read)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -229,7 +229,7 @@ def main() -> int:
                 user.team_id = team_id
         session.commit()
 
-        # Players with optional event_id
+        # Players: event_id resolved from category when absent
         player_rows = []
         category_event: dict[str, str] = {
             c.id: c.event_id for c in session.scalars(select(Category)).all()
@@ -249,7 +249,8 @@ def main() -> int:
                     "cannot resolve event_id via category",
                     data if isinstance(data, dict) else {},
                 )
-                # Still load player with null event_id for preservation
+                # players.event_id is NOT NULL
+                continue
             if not session.get(Category, row["category_id"]):
                 quarantine(
                     session,
@@ -1,6 +1,9 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, File, UploadFile, status
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, File, UploadFile, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
 from dotenv import load_dotenv
+import json
 import os
 import logging
 from pathlib import Path
@@ -9,12 +12,44 @@ import uuid
 import time
 from typing import List, Optional
 import requests
-import re
 
 from firebase_config import db, firebase_auth
 from firebase_admin import firestore
 from models import *
 from auth_middleware import verify_token, get_current_user, require_super_admin, require_team_admin, require_event_organizer
+from auth_middleware import claims_are_current, refresh_user_claims, resolve_user_access, revoke_user_claims
+from app.pagination import decode_cursor, encode_cursor, page_size
+from app.fast_json import json_response, project_rows
+from app.image_cache import BlobStore, FirestoreImageIndex, PgImageIndex
+from app.image_derivatives import (
+    IMMUTABLE_CACHE_CONTROL,
+    VARIANTS,
+    DerivativeStore,
+    clean_variants,
+    is_digest,
+)
+from app.image_ingest import ImageIngestPool, is_drive_url
+from app.cashfree import CashfreeClient, CashfreeError
+from app.payment_reconcile import (
+    FirestorePaymentStore,
+    PaymentReconciler,
+    PgPaymentStore,
+    verify_webhook_signature,
+    webhook_update,
+)
+from app.jobs import FirestoreJobStore, JobRunner, PgJobStore
+from app.player_import import SUPPORTED_EXTENSIONS, SheetError, read_player_sheet, validate_player_frame
+from app.singleflight import hot_reads
+from app.team_counters import TeamCounterReconciler, move_team_counters
+from app.read_cache import (
+    broadcast_token_cache,
+    broadcast_token_scope,
+    categories_scope,
+    event_scope,
+    read_cache,
+    sponsors_scope,
+    team_scope,
+)
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -60,13 +95,105 @@ def _store_user(uid: str) -> Optional[dict]:
     return None
 
 
+# Firestore counterparts of the cached pg_repo reads (see app/read_cache.py).
+# Writers below call read_cache.invalidate() with the matching scope.
+def _fs_event(event_id: str) -> Optional[dict]:
+    def load():
+        doc = db.collection('events').document(event_id).get()
+        return doc.to_dict() if doc.exists else None
+    return read_cache.get_or_load('event', event_id, [event_scope(event_id)], load)
+
+
+def _fs_categories(event_id: str) -> list:
+    def load():
+        return [
+            {**doc.to_dict(), 'id': doc.id}
+            for doc in db.collection('categories').where('event_id', '==', event_id).stream()
+        ]
+    return read_cache.get_or_load('categories', event_id, [categories_scope(event_id)], load)
+
+
+def _fs_team_doc(team_id: str) -> Optional[dict]:
+    """Uncached team read for purse checks: the cache may be stale across workers."""
+    doc = db.collection('teams').document(team_id).get()
+    return doc.to_dict() if doc.exists else None
+
+
+def _fs_team(team_id: str) -> Optional[dict]:
+    return read_cache.get_or_load('team', team_id, [team_scope(team_id)], lambda: _fs_team_doc(team_id))
+
+
+def _fs_sponsors(event_id: str) -> list:
+    def load():
+        return [
+            doc.to_dict()
+            for doc in db.collection('sponsors').where('event_id', '==', event_id).stream()
+        ]
+    return read_cache.get_or_load('sponsors', event_id, [sponsors_scope(event_id)], load)
+
+
+FIRESTORE_BATCH_LIMIT = 500  # max writes per WriteBatch commit
+
+
+def _firestore_batch_set(collection: str, docs: list) -> dict:
+    """Write docs (keyed by their 'id') in WriteBatch chunks of 500.
+
+    A batch commits atomically, so a failed commit fails all of its docs.
+    Returns {doc_id: error} for docs that were not written.
+    """
+    failed = {}
+    for start in range(0, len(docs), FIRESTORE_BATCH_LIMIT):
+        chunk = docs[start:start + FIRESTORE_BATCH_LIMIT]
+        batch = db.batch()
+        for doc in chunk:
+            batch.set(db.collection(collection).document(doc['id']), doc)
+        try:
+            batch.commit()
+        except Exception as e:
+            logger.error(f"Firestore batch write to {collection} failed: {e}")
+            failed.update({doc['id']: str(e) for doc in chunk})
+    return failed
+
+
+def _firestore_page(query, limit: int, cursor: Optional[str], keep=None, order: tuple = ()):
+    """
+    Keyset page over a Firestore query ordered by the `order` fields and then
+    by document id (the query's last order_by). The cursor holds the last
+    row's sort values and id, so it stays valid after that document is
+    deleted; the query resumes with start_after(values). keep() filters rows
+    Firestore cannot (extra fetches fill the page).
+    """
+    def key(doc):
+        data = doc.to_dict() or {}
+        return [data.get(field) for field in order] + [doc.id]
+
+    start = None
+    if cursor:
+        start = decode_cursor(cursor)
+        if len(start) != len(order) + 1:
+            raise ValueError("Invalid cursor")
+    out = []
+    while len(out) <= limit:
+        q = query.start_after(start) if start is not None else query
+        docs = list(q.limit(limit + 1).stream())
+        for doc in docs:
+            if keep is None or keep(doc):
+                out.append(doc)
+                if len(out) > limit:
+                    break
+        if len(docs) <= limit:
+            break
+        start = key(docs[-1])
+    next_cursor = encode_cursor(*key(out[limit - 1])) if len(out) > limit else None
+    return out[:limit], next_cursor
+
+
 # Helper function to check event ownership
 async def check_event_ownership(event_id: str, current_user: dict) -> bool:
     """Check if the current user owns the event"""
     try:
         # Super admins can access all events (check store role first)
-        user_data = _store_user(current_user['uid'])
-        user_role = (user_data or {}).get('role') or current_user.get('role', '')
+        user_role = resolve_user_access(current_user)['role'] or current_user.get('role', '')
         if user_role == 'super_admin':
             return True
 
@@ -79,11 +206,10 @@ async def check_event_ownership(event_id: str, current_user: dict) -> bool:
         if not db:
             return False
         
-        event_doc = db.collection('events').document(event_id).get()
-        if not event_doc.exists:
+        event_data = _fs_event(event_id)
+        if not event_data:
             raise HTTPException(status_code=404, detail="Event not found")
         
-        event_data = event_doc.to_dict()
         created_by = event_data.get('created_by', '')
         return created_by == current_user['uid']
     except HTTPException:
@@ -101,88 +227,93 @@ async def require_event_access(event_id: str, current_user: dict = Depends(requi
         )
     return current_user
 
-def upload_google_drive_image_to_cloudinary(google_drive_url: str) -> Optional[str]:
-    """
-    Download image from Google Drive and upload to Cloudinary using unsigned uploads.
-    Returns Cloudinary URL or None if upload fails.
-    """
-    if not google_drive_url or not isinstance(google_drive_url, str):
-        return None
-    
-    try:
-        # Extract file ID from Google Drive URL
-        patterns = [
-            r'drive\.google\.com/file/d/([a-zA-Z0-9_-]+)',
-            r'drive\.google\.com/open\?id=([a-zA-Z0-9_-]+)',
-            r'drive\.google\.com/uc\?id=([a-zA-Z0-9_-]+)',
-            r'lh3\.googleusercontent\.com/d/([a-zA-Z0-9_-]+)',
-            r'id=([a-zA-Z0-9_-]+)'
-        ]
-        
-        file_id = None
-        for pattern in patterns:
-            match = re.search(pattern, google_drive_url)
-            if match:
-                file_id = match.group(1)
-                break
-        
-        if not file_id:
-            logger.warning(f"Could not extract file ID from URL: {google_drive_url}")
-            return None
-        
-        # Try different Google Drive URL formats
-        drive_urls = [
-            f"https://lh3.googleusercontent.com/d/{file_id}",
-            f"https://drive.google.com/uc?export=view&id={file_id}",
-        ]
-        
-        image_data = None
-        for url in drive_urls:
-            try:
-                response = requests.get(url, timeout=10)
-                if response.status_code == 200 and response.headers.get('content-type', '').startswith('image/'):
-                    image_data = response.content
-                    break
-            except Exception as e:
-                logger.debug(f"Failed to fetch from {url}: {str(e)}")
-                continue
-        
-        if not image_data:
-            logger.warning(f"Could not download image from Google Drive: {file_id}")
-            return None
-        
-        # Upload to Cloudinary using unsigned upload
-        upload_url = f"https://api.cloudinary.com/v1_1/{CLOUDINARY_CLOUD_NAME}/image/upload"
-        
-        files = {'file': image_data}
-        data = {
-            'upload_preset': CLOUDINARY_UPLOAD_PRESET,
-            'folder': 'auction_players',
-            'resource_type': 'image'
-        }
-        
-        response = requests.post(upload_url, files=files, data=data, timeout=30)
-        
-        if response.status_code == 200:
-            result = response.json()
-            cloudinary_url = result.get('secure_url')
-            logger.info(f"Successfully uploaded image to Cloudinary: {cloudinary_url}")
-            return cloudinary_url
-        else:
-            logger.error(f"Cloudinary upload failed: {response.status_code} - {response.text}")
-            return None
-        
-    except Exception as e:
-        logger.error(f"Error uploading to Cloudinary: {str(e)}")
-        return None
-        
-        cloudinary_url = upload_result.get('secure_url')
-        logger.info(f"Successfully uploaded image to Cloudinary: {cloudinary_url}")
-        return cloudinary_url
-        
-    except Exception as e:
-        logger.error(f"Error uploading to Cloudinary: {str(e)}")
-        return None
+def _image_index():
+    if _USE_POSTGRES and _pg:
+        return PgImageIndex(_pg)
+    if db:
+        return FirestoreImageIndex(db)
+    return None
+
+def _image_ingest_pool() -> ImageIngestPool:
+    """Drive -> Cloudinary uploader for bulk uploads (see app/image_ingest.py)."""
+    from app.core.config import get_settings
+
+    settings = get_settings()
+    return ImageIngestPool(
+        CLOUDINARY_CLOUD_NAME,
+        CLOUDINARY_UPLOAD_PRESET,
+        concurrency=settings.image_ingest_concurrency,
+        per_host=settings.image_ingest_per_host,
+        retries=settings.image_ingest_retries,
+        index=_image_index(),
+        blobs=BlobStore(settings.image_cache_dir),
+        derivatives=DerivativeStore(settings.image_cache_dir),
+    )
+
+def _job_store():
+    if _USE_POSTGRES and _pg:
+        return PgJobStore(_pg)
+    if db:
+        return FirestoreJobStore(db)
+    return None
+
+# Background jobs (app/jobs.py); handlers are registered next to their routes
+job_runner = JobRunner(_job_store())
+
+def _cashfree_client() -> CashfreeClient:
+    from app.core.config import get_settings
+
+    settings = get_settings()
+    return CashfreeClient(
+        base_url=settings.cashfree_base_url,
+        concurrency=settings.cashfree_concurrency,
+        timeout=settings.cashfree_timeout_seconds,
+        connect_timeout=settings.cashfree_connect_timeout_seconds,
+        retries=settings.cashfree_retries,
+    )
+
+# Payment gateway calls share one connection pool (app/cashfree.py)
+cashfree = _cashfree_client()
+
+def _payment_store():
+    if _USE_POSTGRES and _pg:
+        return PgPaymentStore(_pg)
+    if db:
+        return FirestorePaymentStore(db)
+    return None
+
+def _payment_reconciler() -> PaymentReconciler:
+    from app.core.config import get_settings
+
+    settings = get_settings()
+    return PaymentReconciler(
+        _payment_store(),
+        cashfree,
+        lambda: _load_cashfree_settings(),
+        interval_seconds=settings.payment_reconcile_interval_seconds,
+        min_age_seconds=settings.payment_reconcile_min_age_minutes * 60,
+        max_age_seconds=settings.payment_reconcile_max_age_hours * 3600,
+        batch_size=settings.payment_reconcile_batch,
+    )
+
+# Webhooks and a batch sweep settle orders without the browser (app/payment_reconcile.py)
+payment_reconciler = _payment_reconciler()
+
+def _team_counter_reconciler() -> Optional[TeamCounterReconciler]:
+    from app.core.config import get_settings
+
+    if _USE_POSTGRES or not db:
+        return None  # Postgres derives team counters from players on read
+    settings = get_settings()
+    return TeamCounterReconciler(
+        db,
+        interval_seconds=settings.team_counter_reconcile_interval_seconds,
+        batch_size=settings.team_counter_reconcile_batch,
+        on_repair=lambda team_id: read_cache.invalidate(team_scope(team_id)),
+    )
+
+# Firestore team counters move with each sale; drift is repaired in the background (app/team_counters.py)
+team_counter_reconciler = _team_counter_reconciler()
 
 # ============= AUTHENTICATION ROUTES =============
 
@@ -197,9 +328,6 @@ async def register(user_data: UserCreate):
             display_name=user_data.display_name
         )
         
-        # Set custom claims for the user role
-        firebase_auth.set_custom_user_claims(user.uid, {'role': user_data.role.value})
-        
         # Store additional user data in Firestore
         user_doc = {
             'uid': user.uid,
@@ -216,6 +344,9 @@ async def register(user_data: UserCreate):
         elif db:
             db.collection('users').document(user.uid).set(user_doc)
         
+        # Mirror role/team_id into custom claims for the auth hot path
+        refresh_user_claims(user.uid)
+        
         # Send admin notification email to powerauction@inraylabs.com asynchronously
         try:
             from email_service import send_new_user_registration_notification
@@ -344,9 +475,6 @@ async def check_email_config(current_user: dict = Depends(require_super_admin)):
 async def set_user_role(uid: str, role: UserRole, current_user: dict = Depends(require_super_admin)):
     """Set user role (Super Admin only)"""
     try:
-        # Update custom claims
-        firebase_auth.set_custom_user_claims(uid, {'role': role.value})
-        
         if _USE_POSTGRES and _pg:
             if not _pg.get_user(uid):
                 raise HTTPException(status_code=404, detail="User not found")
@@ -354,6 +482,9 @@ async def set_user_role(uid: str, role: UserRole, current_user: dict = Depends(r
         elif db:
             db.collection('users').document(uid).update({'role': role.value})
         
+        # Update custom claims
+        refresh_user_claims(uid)
+        
         return {"message": "Role updated successfully"}
     except HTTPException:
         raise
@@ -367,13 +498,8 @@ async def get_me(current_user: dict = Depends(get_current_user)):
         if _USE_POSTGRES and _pg:
             user_data = _pg.get_user(current_user['uid'])
             if user_data:
-                try:
-                    firebase_auth.set_custom_user_claims(
-                        current_user['uid'],
-                        {'role': user_data.get('role', 'event_organizer')},
-                    )
-                except Exception as claim_error:
-                    print(f"Error setting custom claims: {claim_error}")
+                if not claims_are_current(current_user, user_data):
+                    refresh_user_claims(current_user['uid'])
                 return UserResponse(
                     uid=user_data.get('uid', current_user['uid']),
                     email=user_data.get('email', current_user.get('email', '')),
@@ -395,6 +521,7 @@ async def get_me(current_user: dict = Depends(get_current_user)):
                 'team_id': None,
             }
             _pg.upsert_user(user_data)
+            refresh_user_claims(current_user['uid'])
             return UserResponse(
                 uid=user_data['uid'],
                 email=user_data['email'],
@@ -411,10 +538,8 @@ async def get_me(current_user: dict = Depends(get_current_user)):
                 print(f"User data from Firestore: {user_data}")  # Debug log
                 
                 # Ensure custom claims are set in Firebase Auth
-                try:
-                    firebase_auth.set_custom_user_claims(current_user['uid'], {'role': user_data.get('role', 'event_organizer')})
-                except Exception as claim_error:
-                    print(f"Error setting custom claims: {claim_error}")
+                if not claims_are_current(current_user, user_data):
+                    refresh_user_claims(current_user['uid'])
                 
                 return UserResponse(**user_data)
         
@@ -428,16 +553,13 @@ async def get_me(current_user: dict = Depends(get_current_user)):
             'team_id': None
         }
         
-        # Set custom claims in Firebase Auth
-        try:
-            firebase_auth.set_custom_user_claims(current_user['uid'], {'role': 'event_organizer'})
-        except Exception as claim_error:
-            print(f"Error setting custom claims: {claim_error}")
-        
         # Save to Firestore
         if db:
             db.collection('users').document(current_user['uid']).set(user_data)
         
+        # Set custom claims in Firebase Auth
+        refresh_user_claims(current_user['uid'])
+        
         return UserResponse(**user_data)
     except Exception as e:
         print(f"Error in get_me: {str(e)}")  # Debug log
@@ -457,10 +579,7 @@ async def promote_to_admin(current_user: dict = Depends(get_current_user)):
                 })
             else:
                 _pg.update_user(current_user['uid'], {'role': 'super_admin'})
-            try:
-                firebase_auth.set_custom_user_claims(current_user['uid'], {'role': 'super_admin'})
-            except Exception as claim_error:
-                logger.warning(f"Could not set Firebase claims: {claim_error}")
+            refresh_user_claims(current_user['uid'])
             return {"message": "User promoted to super admin successfully"}
 
         if not db:
@@ -469,6 +588,7 @@ async def promote_to_admin(current_user: dict = Depends(get_current_user)):
         # Update user role to super_admin
         user_ref = db.collection('users').document(current_user['uid'])
         user_ref.update({'role': 'super_admin'})
+        refresh_user_claims(current_user['uid'])
         
         print(f"Promoted user {current_user['uid']} to super_admin")
         
@@ -480,9 +600,38 @@ async def promote_to_admin(current_user: dict = Depends(get_current_user)):
         raise HTTPException(status_code=400, detail=str(e))
 
 @api_router.get("/auth/users")
-async def get_all_users(current_user: dict = Depends(require_super_admin)):
-    """Get all registered users (Super Admin only)"""
+async def get_all_users(
+    response: Response,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(require_super_admin),
+):
+    """Get all registered users (Super Admin only).
+
+    Pass limit and/or cursor for keyset pages; the next cursor is returned in
+    the X-Next-Cursor header (absent on the last page).
+    """
     try:
+        if limit is not None or cursor:
+            size = page_size(limit)
+            if _USE_POSTGRES and _pg:
+                users, next_cursor = _pg.list_users_page(size, cursor)
+            else:
+                if not db:
+                    raise HTTPException(status_code=503, detail="Database not available")
+                docs, next_cursor = _firestore_page(
+                    db.collection('users')
+                    .order_by('created_at', direction=firestore.Query.DESCENDING)
+                    .order_by(firestore.FieldPath.document_id(), direction=firestore.Query.DESCENDING),
+                    size, cursor, order=('created_at',),
+                )
+                users = [{**d.to_dict(), 'id': d.id} for d in docs]
+            for u in users:
+                u['id'] = u.get('uid') or u.get('id')
+            if next_cursor:
+                response.headers['X-Next-Cursor'] = next_cursor
+            return users
+
         if _USE_POSTGRES and _pg:
             users = _pg.list_users(order_desc=True)
             for u in users:
@@ -504,6 +653,8 @@ async def get_all_users(current_user: dict = Depends(require_super_admin)):
         
         logger.info(f"Retrieved {len(users)} users")
         return users
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching users: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -520,10 +671,6 @@ async def update_user(user_id: str, user_data: dict, current_user: dict = Depend
             update_data['mobile_number'] = user_data['mobile_number']
         if 'role' in user_data:
             update_data['role'] = user_data['role']
-            try:
-                firebase_auth.set_custom_user_claims(user_id, {'role': user_data['role']})
-            except Exception as claim_error:
-                logger.error(f"Error setting custom claims: {claim_error}")
 
         if _USE_POSTGRES and _pg:
             if not _pg.get_user(user_id):
@@ -531,6 +678,8 @@ async def update_user(user_id: str, user_data: dict, current_user: dict = Depend
             if update_data:
                 _pg.update_user(user_id, update_data)
                 logger.info(f"Updated user {user_id} (postgres)")
+            if 'role' in update_data:
+                refresh_user_claims(user_id)
             return {"message": "User updated successfully", "updated_fields": list(update_data.keys())}
 
         if not db:
@@ -545,6 +694,8 @@ async def update_user(user_id: str, user_data: dict, current_user: dict = Depend
         if update_data:
             user_ref.update(update_data)
             logger.info(f"Updated user {user_id}")
+        if 'role' in update_data:
+            refresh_user_claims(user_id)
         
         return {"message": "User updated successfully", "updated_fields": list(update_data.keys())}
     except HTTPException:
@@ -566,6 +717,7 @@ async def delete_user(user_id: str, current_user: dict = Depends(require_super_a
                 _pg.delete_user(user_id)
             except ValueError:
                 raise HTTPException(status_code=404, detail="User not found")
+            revoke_user_claims(user_id)
             try:
                 firebase_auth.delete_user(user_id)
                 logger.info(f"Deleted user {user_id} from Firebase Auth")
@@ -584,6 +736,7 @@ async def delete_user(user_id: str, current_user: dict = Depends(require_super_a
             raise HTTPException(status_code=404, detail="User not found")
         
         user_ref.delete()
+        revoke_user_claims(user_id)
         
         # Try to delete from Firebase Auth (optional, may fail if user has special protections)
         try:
@@ -620,12 +773,6 @@ async def create_user_by_admin(user_data: UserCreate, current_user: dict = Depen
                 raise HTTPException(status_code=400, detail="Email already exists")
             raise HTTPException(status_code=400, detail=f"Failed to create user: {error_msg}")
         
-        # Set custom claims
-        try:
-            firebase_auth.set_custom_user_claims(firebase_user.uid, {'role': user_data.role.value})
-        except Exception as claim_error:
-            logger.error(f"Error setting custom claims: {claim_error}")
-        
         # Create user document in active backend
         user_doc = {
             'uid': firebase_user.uid,
@@ -642,6 +789,9 @@ async def create_user_by_admin(user_data: UserCreate, current_user: dict = Depen
         else:
             db.collection('users').document(firebase_user.uid).set(user_doc)
         
+        # Set custom claims
+        refresh_user_claims(firebase_user.uid)
+        
         logger.info(f"Created new user: {firebase_user.uid} with role: {user_data.role.value}")
         return {"message": "User created successfully", "uid": firebase_user.uid}
     except HTTPException:
@@ -698,6 +848,7 @@ async def create_auction(event_data: EventCreate, current_user: dict = Depends(r
 
         if db:
             db.collection('events').document(event_id).set(event_doc)
+            read_cache.invalidate(event_scope(event_id))
 
         return Event(**event_doc)
     except Exception as e:
@@ -708,8 +859,7 @@ async def get_auctions(current_user: dict = Depends(get_current_user)):
     """Get auctions - all auctions for super admin, only owned auctions for auction organizers"""
     try:
         if _USE_POSTGRES and _pg:
-            user = _pg.get_user(current_user['uid'])
-            user_role = (user or {}).get('role', 'viewer')
+            user_role = resolve_user_access(current_user)['role'] or 'viewer'
             events = _pg.list_events_for_user(current_user['uid'], user_role)
             result = []
             for event_data in events:
@@ -720,12 +870,8 @@ async def get_auctions(current_user: dict = Depends(get_current_user)):
         if not db:
             return []
         
-        # Get user role from Firestore
-        user_doc = db.collection('users').document(current_user['uid']).get()
-        user_role = 'viewer'  # default
-        if user_doc.exists:
-            user_data = user_doc.to_dict()
-            user_role = user_data.get('role', 'viewer')
+        # Get user role (custom claims, else Firestore)
+        user_role = resolve_user_access(current_user)['role'] or 'viewer'
         
         # Super admins see all events
         if user_role == 'super_admin':
@@ -800,6 +946,7 @@ async def update_auction(event_id: str, event_data: EventCreate, current_user: d
             raise HTTPException(status_code=503, detail="Database not available")
 
         db.collection('events').document(event_id).update(fields)
+        read_cache.invalidate(event_scope(event_id))
         return {"message": "Auction updated successfully"}
 
     except HTTPException:
@@ -831,6 +978,7 @@ async def create_category(category_data: CategoryCreate, current_user: dict = De
 
         if db:
             db.collection('categories').document(category_id).set(category_doc)
+            read_cache.invalidate(categories_scope(category_doc['event_id']))
         
         return Category(**category_doc)
     except Exception as e:
@@ -940,6 +1088,7 @@ async def update_category(category_id: str, category_data: CategoryCreate, curre
         }
         
         db.collection('categories').document(category_id).update(updated_data)
+        read_cache.invalidate(categories_scope(category_data.event_id))
         
         # If base_price changed, update all players in this category
         new_base_price = updated_data.get('base_price')
@@ -1022,6 +1171,7 @@ async def delete_category(category_id: str, current_user: dict = Depends(require
         
         # Delete the category
         db.collection('categories').document(category_id).delete()
+        read_cache.invalidate(categories_scope(category_data['event_id']))
         
         return {"message": "Category and associated players deleted successfully"}
     except Exception as e:
@@ -1062,7 +1212,9 @@ async def create_team(team_data: TeamCreate, current_user: dict = Depends(requir
                 'admin_email': team_data.admin_email,
                 'players_count': 0
             }
-            return Team(**_pg.create_team(team_doc))
+            team = _pg.create_team(team_doc)
+            refresh_user_claims(admin_uid)
+            return Team(**team)
 
         # If admin_email is provided, find the user and get their UID
         if team_data.admin_email and db:
@@ -1092,6 +1244,8 @@ async def create_team(team_data: TeamCreate, current_user: dict = Depends(requir
         
         if db:
             db.collection('teams').document(team_id).set(team_doc)
+            read_cache.invalidate(team_scope(team_id))
+            refresh_user_claims(admin_uid)
         
         return Team(**team_doc)
     except HTTPException:
@@ -1137,7 +1291,11 @@ async def update_team(team_id: str, team_data: TeamCreate, current_user: dict =
                 'admin_uid': admin_uid,
                 'admin_email': team_data.admin_email
             }
-            return Team(**_pg.update_team(team_id, update_data))
+            team = _pg.update_team(team_id, update_data)
+            if admin_uid != old_team_data.get('admin_uid'):
+                refresh_user_claims(admin_uid)
+                refresh_user_claims(old_team_data.get('admin_uid'))
+            return Team(**team)
 
         if not db:
             raise HTTPException(status_code=503, detail="Database not available")
@@ -1195,6 +1353,10 @@ async def update_team(team_id: str, team_data: TeamCreate, current_user: dict =
         }
         
         db.collection('teams').document(team_id).update(update_data)
+        read_cache.invalidate(team_scope(team_id))
+        if admin_uid != old_team_data.get('admin_uid'):
+            refresh_user_claims(admin_uid)
+            refresh_user_claims(old_team_data.get('admin_uid'))
         
         # Return updated team
         updated_team_doc = db.collection('teams').document(team_id).get()
@@ -1207,52 +1369,33 @@ async def update_team(team_id: str, team_data: TeamCreate, current_user: dict =
 @api_router.get("/teams/event/{event_id}", response_model=List[Team])
 async def get_event_teams(event_id: str):
     """Get teams for an event with accurate player statistics"""
+    return await hot_reads.do(('event_teams', event_id), lambda: _event_teams(event_id))
+
+
+def _event_teams(event_id: str):
     try:
         if _USE_POSTGRES and _pg:
-            return [Team(**t) for t in _pg.list_teams(event_id)]
+            return json_response(project_rows(_pg.list_teams(event_id), Team))
 
         if not db:
             return []
         
+        # Counters are kept by the sale paths (app/team_counters.py): one query, no writes
         teams = db.collection('teams').where('event_id', '==', event_id).stream()
-        result_teams = []
-        
-        for team_doc in teams:
-            team_data = team_doc.to_dict()
-            team_id = team_data['id']
-            
-            # Calculate actual players count and spent amount from sold players
-            sold_players = db.collection('players').where('sold_to_team_id', '==', team_id).stream()
-            
-            actual_players_count = 0
-            actual_spent = 0
-            
-            for player_doc in sold_players:
-                player_data = player_doc.to_dict()
-                if player_data.get('status') == 'sold' and player_data.get('sold_price'):
-                    actual_players_count += 1
-                    actual_spent += player_data['sold_price']
-            
-            # Update the team data with accurate values
-            team_data['players_count'] = actual_players_count
-            team_data['spent'] = actual_spent
-            team_data['remaining'] = team_data['budget'] - actual_spent
-            
-            # Update the database with correct values if they differ
-            if (team_doc.to_dict().get('players_count', 0) != actual_players_count or 
-                team_doc.to_dict().get('spent', 0) != actual_spent):
-                db.collection('teams').document(team_id).update({
-                    'players_count': actual_players_count,
-                    'spent': actual_spent,
-                    'remaining': team_data['remaining']
-                })
-            
-            result_teams.append(Team(**team_data))
-        
-        return result_teams
+        return [_team_from_counters(team_doc.to_dict()) for team_doc in teams]
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+
+def _team_from_counters(team_data: dict) -> Team:
+    spent = team_data.get('spent') or 0
+    return Team(**{
+        **team_data,
+        'spent': spent,
+        'players_count': team_data.get('players_count') or 0,
+        'remaining': team_data['budget'] - spent,
+    })
+
 @api_router.get("/users/available-admins", response_model=List[UserResponse])
 async def get_available_team_admins(current_user: dict = Depends(require_super_admin)):
     """Get users who can be assigned as team admins"""
@@ -1293,26 +1436,7 @@ async def get_team(team_id: str):
         if not team_doc.exists:
             raise HTTPException(status_code=404, detail="Team not found")
         
-        team_data = team_doc.to_dict()
-        
-        # Calculate actual players count and spent amount from sold players
-        sold_players = db.collection('players').where('sold_to_team_id', '==', team_id).stream()
-        
-        actual_players_count = 0
-        actual_spent = 0
-        
-        for player_doc in sold_players:
-            player_data = player_doc.to_dict()
-            if player_data.get('status') == 'sold' and player_data.get('sold_price'):
-                actual_players_count += 1
-                actual_spent += player_data['sold_price']
-        
-        # Update the team data with accurate values
-        team_data['players_count'] = actual_players_count
-        team_data['spent'] = actual_spent
-        team_data['remaining'] = team_data['budget'] - actual_spent
-        
-        return Team(**team_data)
+        return _team_from_counters(team_doc.to_dict())
     except HTTPException:
         raise
     except Exception as e:
@@ -1715,19 +1839,14 @@ async def get_public_auction_state(team_id: str, token: str):
 
 # ============= PUBLIC LIVE BROADCAST (OBS / vMix) =============
 
-def _resolve_broadcast_event_id(token: str) -> str:
-    """Strict event broadcast token → event_id. No demo heuristics."""
-    if not token or len(token) < 16:
-        raise HTTPException(status_code=403, detail="Invalid or expired broadcast token")
-
+def _load_broadcast_token(token: str) -> Optional[dict]:
+    """{'event_id', 'expires_at' (epoch seconds or None)} for a live token, else None."""
     if _USE_POSTGRES and _pg:
-        event_id = _pg.resolve_event_broadcast_token(token)
-        if not event_id:
-            raise HTTPException(status_code=403, detail="Invalid or expired broadcast token")
-        return event_id
-
-    if not db:
-        raise HTTPException(status_code=503, detail="Database not available")
+        row = _pg.get_event_broadcast_token(token)
+        if not row:
+            return None
+        exp = row['expires_at']
+        return {'event_id': row['event_id'], 'expires_at': exp.timestamp() if exp else None}
 
     docs = list(
         db.collection('public_event_broadcast_tokens')
@@ -1740,24 +1859,58 @@ def _resolve_broadcast_event_id(token: str) -> str:
     for doc in docs:
         data = doc.to_dict() or {}
         exp = data.get('expires_at')
+        if exp is not None and not isinstance(exp, datetime):
+            # Firestore may store as string
+            try:
+                from dateutil import parser as _dp
+                exp = _dp.isoparse(str(exp))
+            except Exception:
+                exp = None
         if exp is not None:
-            if hasattr(exp, 'tzinfo') and exp.tzinfo is None:
+            if exp.tzinfo is None:
                 exp = exp.replace(tzinfo=timezone.utc)
-            try:
-                if exp < now:
-                    continue
-            except TypeError:
-                # Firestore may store as string
-                try:
-                    from dateutil import parser as _dp
-                    if _dp.isoparse(str(exp)) < now:
-                        continue
-                except Exception:
-                    pass
+            if exp < now:
+                continue
         eid = data.get('event_id')
         if eid:
-            return eid
-    raise HTTPException(status_code=403, detail="Invalid or expired broadcast token")
+            return {'event_id': eid, 'expires_at': exp.timestamp() if exp else None}
+    return None
+
+
+def _broadcast_token_ttl(entry: Optional[dict]) -> float:
+    """Never serve a cached token past its own expires_at; misses only when shared."""
+    if entry is None:
+        return float('inf') if broadcast_token_cache.shared else 0
+    if entry.get('expires_at') is not None:
+        return entry['expires_at'] - time.time()
+    return float('inf')
+
+
+def _resolve_broadcast_event_id(token: str) -> str:
+    """Strict event broadcast token → event_id. No demo heuristics.
+
+    Results are cached per worker (see broadcast_token_cache) so overlay
+    polls skip the token query. Revocation is only immediate everywhere with
+    the shared backend (REDIS_URL), which also caches unknown tokens; without
+    it entries live a few seconds and misses are not cached, so other
+    workers stop serving a revoked link within that window.
+    """
+    if not token or len(token) < 16:
+        raise HTTPException(status_code=403, detail="Invalid or expired broadcast token")
+
+    if not (_USE_POSTGRES and _pg) and not db:
+        raise HTTPException(status_code=503, detail="Database not available")
+
+    entry = broadcast_token_cache.get_or_load(
+        'broadcast_token',
+        token,
+        [broadcast_token_scope(token)],
+        lambda: _load_broadcast_token(token),
+        ttl_for=_broadcast_token_ttl,
+    )
+    if not entry or (entry['expires_at'] is not None and entry['expires_at'] < time.time()):
+        raise HTTPException(status_code=403, detail="Invalid or expired broadcast token")
+    return entry['event_id']
 
 
 def _public_sponsors_for_event(event_id: str) -> list:
@@ -1765,7 +1918,7 @@ def _public_sponsors_for_event(event_id: str) -> list:
         return _pg.list_sponsors(event_id)
     if not db:
         return []
-    return [s.to_dict() for s in db.collection('sponsors').where('event_id', '==', event_id).stream()]
+    return _fs_sponsors(event_id)
 
 
 @api_router.post("/events/{event_id}/generate-broadcast-link")
@@ -1812,6 +1965,8 @@ async def generate_event_broadcast_link(
                 'label': 'live-broadcast',
                 'revoked': False,
             })
+        # Drop a cached miss, e.g. an overlay that polled the link early
+        broadcast_token_cache.invalidate(broadcast_token_scope(token))
 
         return {
             'success': True,
@@ -1827,46 +1982,73 @@ async def generate_event_broadcast_link(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@api_router.post("/events/{event_id}/revoke-broadcast-links")
+async def revoke_event_broadcast_links(
+    event_id: str,
+    current_user: dict = Depends(require_event_organizer),
+):
+    """Revoke all public OBS/vMix links of an event (organizer only)."""
+    try:
+        if not await check_event_ownership(event_id, current_user):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You can only revoke broadcast links for events you created",
+            )
+
+        if _USE_POSTGRES and _pg:
+            tokens = _pg.revoke_event_broadcast_tokens(event_id)
+        else:
+            if not db:
+                raise HTTPException(status_code=503, detail="Database not available")
+            docs = list(
+                db.collection('public_event_broadcast_tokens')
+                .where('event_id', '==', event_id)
+                .where('revoked', '==', False)
+                .stream()
+            )
+            tokens = []
+            batch = db.batch()
+            for doc in docs:
+                batch.update(doc.reference, {'revoked': True})
+                tokens.append((doc.to_dict() or {}).get('token'))
+            if docs:
+                batch.commit()
+
+        broadcast_token_cache.invalidate(*(broadcast_token_scope(t) for t in tokens))
+        return {'success': True, 'revoked': len(tokens)}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"revoke_event_broadcast_links: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @api_router.get("/public/live/{token}/player")
 async def public_live_player_board(token: str):
     """Public read-only player card payload for broadcast (no auth)."""
+    return await hot_reads.do(('live_player', token), lambda: _live_player_board(token))
+
+
+def _live_player_board(token: str) -> dict:
     try:
         from app.public_live import public_player_payload
 
         event_id = _resolve_broadcast_event_id(token)
 
         if _USE_POSTGRES and _pg:
-            event = _pg.get_event(event_id)
-            if not event:
+            # Single joined query: event, state, player, category, sold team, bids, sponsors
+            board = _pg.get_public_player_board(event_id)
+            if not board:
                 raise HTTPException(status_code=404, detail="Event not found")
-            auction = _pg.get_auction_state(event_id)
-            player = None
-            category = None
-            sold_team = None
-            if auction and auction.get('current_player_id'):
-                player = _pg.get_player(auction['current_player_id'])
-            # Also surface just-sold player briefly if state cleared but last sold useful — stick to current only
-            if player and player.get('category_id'):
-                category = _pg.get_category(player['category_id'])
-            if player and player.get('sold_to_team_id'):
-                sold_team = _pg.get_team(player['sold_to_team_id'])
-            sponsors = _public_sponsors_for_event(event_id)
-            return public_player_payload(
-                event=event,
-                auction=auction,
-                player=player,
-                category=category,
-                sold_team=sold_team,
-                sponsors=sponsors,
-            )
+            return public_player_payload(**board)
 
         if not db:
             raise HTTPException(status_code=503, detail="Database not available")
 
-        event_doc = db.collection('events').document(event_id).get()
-        if not event_doc.exists:
+        event_data = _fs_event(event_id)
+        if not event_data:
             raise HTTPException(status_code=404, detail="Event not found")
-        event = {**event_doc.to_dict(), 'id': event_id}
+        event = {**event_data, 'id': event_id}
 
         state_id = f"auction_{event_id}"
         state_doc = db.collection('auction_state').document(state_id).get()
@@ -1909,6 +2091,10 @@ async def public_live_player_board(token: str):
 @api_router.get("/public/live/{token}/teams")
 async def public_live_teams_board(token: str):
     """Public read-only multi-team scoreboard for broadcast (no auth)."""
+    return await hot_reads.do(('live_teams', token), lambda: _live_teams_board(token))
+
+
+def _live_teams_board(token: str) -> dict:
     try:
         from app.public_live import public_teams_payload
 
@@ -1921,8 +2107,8 @@ async def public_live_teams_board(token: str):
             auction = _pg.get_auction_state(event_id)
             teams = _pg.list_teams(event_id)
             categories = _pg.list_categories(event_id)
-            # All sold players for category progress
-            sold_players = _pg.list_players_for_event(event_id, status='sold')
+            # All sold players for category progress (projection, no JSONB columns)
+            sold_players = _pg.list_player_summaries(event_id, status='sold')
             sponsors = _public_sponsors_for_event(event_id)
             return public_teams_payload(
                 event=event,
@@ -1936,10 +2122,10 @@ async def public_live_teams_board(token: str):
         if not db:
             raise HTTPException(status_code=503, detail="Database not available")
 
-        event_doc = db.collection('events').document(event_id).get()
-        if not event_doc.exists:
+        event_data = _fs_event(event_id)
+        if not event_data:
             raise HTTPException(status_code=404, detail="Event not found")
-        event = {**event_doc.to_dict(), 'id': event_id}
+        event = {**event_data, 'id': event_id}
 
         state_id = f"auction_{event_id}"
         state_doc = db.collection('auction_state').document(state_id).get()
@@ -1951,11 +2137,7 @@ async def public_live_teams_board(token: str):
             td['id'] = tdoc.id
             teams.append(td)
 
-        categories = []
-        for cdoc in db.collection('categories').where('event_id', '==', event_id).stream():
-            cd = cdoc.to_dict()
-            cd['id'] = cdoc.id
-            categories.append(cd)
+        categories = _fs_categories(event_id)
 
         sold_players = []
         cat_ids = [c['id'] for c in categories]
@@ -2180,8 +2362,17 @@ async def register_player_public(event_id: str, player_data: PublicPlayerRegistr
         raise HTTPException(status_code=400, detail=str(e))
 
 @api_router.get("/auctions/{event_id}/registrations")
-async def get_auction_registrations(event_id: str, current_user: dict = Depends(require_event_organizer)):
-    """Get all player registrations for an auction - only auction owner can view"""
+async def get_auction_registrations(
+    event_id: str,
+    response: Response,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(require_event_organizer),
+):
+    """Get player registrations for an auction - only auction owner can view.
+
+    Pass limit and/or cursor for keyset pages (next cursor in X-Next-Cursor).
+    """
     try:
         if not await check_event_ownership(event_id, current_user):
             raise HTTPException(
@@ -2189,8 +2380,33 @@ async def get_auction_registrations(event_id: str, current_user: dict = Depends(
                 detail="You can only view registrations for events you created"
             )
 
+        if limit is not None or cursor:
+            size = page_size(limit)
+            if _USE_POSTGRES and _pg:
+                regs, next_cursor = _pg.list_registrations_page(event_id, size, cursor)
+            else:
+                if not db:
+                    return []
+                # Newest first, as in Postgres. Composite index:
+                # player_registrations (event_id ASC, registered_at DESC)
+                docs, next_cursor = _firestore_page(
+                    db.collection('player_registrations')
+                    .where('event_id', '==', event_id)
+                    .order_by('registered_at', direction=firestore.Query.DESCENDING)
+                    .order_by(firestore.FieldPath.document_id(), direction=firestore.Query.DESCENDING),
+                    size, cursor, order=('registered_at',),
+                )
+                regs = [d.to_dict() for d in docs]
+            if _USE_POSTGRES and _pg:
+                return json_response(
+                    regs, headers={'X-Next-Cursor': next_cursor} if next_cursor else None
+                )
+            if next_cursor:
+                response.headers['X-Next-Cursor'] = next_cursor
+            return regs
+
         if _USE_POSTGRES and _pg:
-            return _pg.list_registrations(event_id)
+            return json_response(_pg.list_registrations(event_id))
 
         if not db:
             return []
@@ -2335,6 +2551,144 @@ async def reject_player_registration(registration_id: str, current_user: dict =
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+MAX_BULK_REGISTRATIONS = 1000
+
+def _firestore_decide_registrations(event_id: str, action: str, items: list) -> list:
+    """Firestore side of bulk approve/reject: one get_all, WriteBatch commits."""
+    refs = [db.collection('player_registrations').document(i['registration_id']) for i in items]
+    regs = {snap.id: snap.to_dict() for snap in db.get_all(refs) if snap.exists}
+    categories = {
+        c.id: c.to_dict()
+        for c in db.collection('categories').where('event_id', '==', event_id).stream()
+    }
+    now = datetime.now(timezone.utc).isoformat()
+    outcomes, writes, seen = [], [], set()  # writes: (outcome, [(ref, op, data)])
+    for item in items:
+        rid = item['registration_id']
+        reg = regs.get(rid)
+        error = None
+        if not reg or reg.get('event_id') != event_id:
+            error = "Registration not found"
+        elif rid in seen:
+            error = "Duplicate registration id in request"
+        elif reg.get('status') == 'approved':
+            error = "Registration is already approved"
+        elif action == 'approve' and item.get('category_id') not in categories:
+            error = "Category not found in this event" if item.get('category_id') else "category_id is required"
+        if error:
+            outcomes.append({'registration_id': rid, 'status': 'error', 'error': error})
+            continue
+        seen.add(rid)
+        reg_ref = db.collection('player_registrations').document(rid)
+        if action == 'reject':
+            outcome = {'registration_id': rid, 'status': 'rejected'}
+            ops = [(reg_ref, 'update', {'status': 'rejected', 'rejected_at': now})]
+        else:
+            base_price = item.get('base_price')
+            if base_price is None:
+                base_price = categories[item['category_id']].get('base_price') or 0
+            player_id = str(uuid.uuid4())
+            extra = dict(reg.get('extra_fields') or {})
+            if reg.get('email') and 'email' not in extra:
+                extra['email'] = reg.get('email')
+            player_doc = {
+                'id': player_id,
+                'event_id': event_id,
+                'name': reg.get('name') or 'Unknown',
+                'category_id': item['category_id'],
+                'base_price': base_price,
+                **{k: reg.get(k) for k in (
+                    'age', 'position', 'specialty', 'previous_team', 'cricheroes_link',
+                    'contact_number', 'district', 'identity_proof_url', 'stats', 'photo_url',
+                )},
+                'status': PlayerStatus.AVAILABLE.value,
+                'current_price': None,
+                'sold_to_team_id': None,
+                'sold_price': None,
+                'extra_fields': extra or None,
+            }
+            outcome = {'registration_id': rid, 'status': 'approved', 'player_id': player_id}
+            ops = [
+                (db.collection('players').document(player_id), 'set', player_doc),
+                (reg_ref, 'update', {'status': 'approved', 'approved_at': now, 'player_id': player_id}),
+            ]
+        outcomes.append(outcome)
+        writes.append((outcome, ops))
+
+    # Player + registration writes of one item always land in the same batch
+    per_batch = FIRESTORE_BATCH_LIMIT // 2
+    for start in range(0, len(writes), per_batch):
+        chunk = writes[start:start + per_batch]
+        batch = db.batch()
+        for _, ops in chunk:
+            for ref, op, data in ops:
+                getattr(batch, op)(ref, data)
+        try:
+            batch.commit()
+        except Exception as e:
+            logger.error(f"Bulk registration decision batch failed: {e}")
+            for outcome, _ in chunk:
+                outcome.pop('player_id', None)
+                outcome.update(status='error', error=str(e))
+    return outcomes
+
+@api_router.post("/auctions/{event_id}/registrations/bulk")
+async def bulk_decide_registrations(
+    event_id: str,
+    decision: BulkRegistrationDecision,
+    current_user: dict = Depends(require_event_organizer)
+):
+    """
+    Approve or reject many registrations at once - only event owner.
+
+    Each item may override the request's category_id/base_price; base_price
+    defaults to the category's. Returns per-registration outcomes
+    ({registration_id, status: approved|rejected|error, player_id | error}),
+    so one bad id never blocks the rest.
+    """
+    try:
+        if decision.action not in ('approve', 'reject'):
+            raise HTTPException(status_code=400, detail="action must be 'approve' or 'reject'")
+        if not decision.items:
+            raise HTTPException(status_code=400, detail="No registrations given")
+        if len(decision.items) > MAX_BULK_REGISTRATIONS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"At most {MAX_BULK_REGISTRATIONS} registrations per request"
+            )
+        if not await check_event_ownership(event_id, current_user):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You can only approve registrations for events you created"
+            )
+        
+        items = [
+            {
+                'registration_id': item.registration_id,
+                'category_id': item.category_id or decision.category_id,
+                'base_price': item.base_price if item.base_price is not None else decision.base_price,
+            }
+            for item in decision.items
+        ]
+        if _USE_POSTGRES and _pg:
+            outcomes = await run_in_threadpool(_pg.decide_registrations_bulk, event_id, decision.action, items)
+        elif db:
+            outcomes = await run_in_threadpool(_firestore_decide_registrations, event_id, decision.action, items)
+        else:
+            raise HTTPException(status_code=500, detail="Database not available")
+        
+        done = sum(1 for o in outcomes if o['status'] != 'error')
+        return {
+            "message": f"{done} registrations {decision.action.rstrip('e')}ed, {len(outcomes) - done} failed",
+            "processed": done,
+            "failed": len(outcomes) - done,
+            "results": outcomes,
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @api_router.post("/players", response_model=Player)
 async def create_player(player_data: PlayerCreate, current_user: dict = Depends(require_event_organizer)):
     """Create a new player - only event owner can create"""
@@ -2420,10 +2774,14 @@ async def create_player(player_data: PlayerCreate, current_user: dict = Depends(
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@api_router.post("/auctions/{event_id}/bulk-upload-players")
+BULK_UPLOAD_JOB = 'bulk_upload_players'
+BULK_UPLOAD_STEP = 50  # rows per checkpoint (images + one insert)
+
+@api_router.post("/auctions/{event_id}/bulk-upload-players", status_code=status.HTTP_202_ACCEPTED)
 async def bulk_upload_players(
     event_id: str,
     file: UploadFile = File(...),
+    force: bool = False,
     current_user: dict = Depends(require_event_organizer)
 ):
     """
@@ -2441,11 +2799,13 @@ async def bulk_upload_players(
     - age (optional)
     - previous_team (optional)
     - stats.matches, stats.runs, stats.wickets, stats.goals, stats.assists (optional)
+
+    CSV files with the same columns are accepted too. Rows are validated
+    here; photos and inserts run in a background job.
+    Returns {job_id, ...} at once - poll GET /api/jobs/{job_id}. Uploading
+    the same file to the same event again returns the existing job instead
+    of creating the players twice (force=true to upload anyway).
     """
-    import pandas as pd
-    import re
-    import io
-    
     try:
         # Check event ownership
         if not await check_event_ownership(event_id, current_user):
@@ -2455,24 +2815,22 @@ async def bulk_upload_players(
             )
         
         # Validate file type
-        if not file.filename.endswith(('.xlsx', '.xls')):
+        if not file.filename.lower().endswith(SUPPORTED_EXTENSIONS):
             raise HTTPException(
                 status_code=400,
-                detail="File must be an Excel file (.xlsx or .xls)"
+                detail="File must be an Excel or CSV file (.xlsx, .xls or .csv)"
             )
         
-        # Read Excel file
-        contents = await file.read()
-        df = pd.read_excel(io.BytesIO(contents))
+        if job_runner.store is None:
+            raise HTTPException(status_code=503, detail="Database not available")
         
-        # Validate required columns
-        required_columns = ['name', 'phone', 'email', 'position', 'specialty']
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        if missing_columns:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Missing required columns: {', '.join(missing_columns)}"
-            )
+        # Read uploaded file
+        contents = await file.read()
+        dedupe_key = hashlib.sha256(event_id.encode() + b'\0' + contents).hexdigest()
+        if not force:
+            existing = await run_in_threadpool(job_runner.store.find_active, BULK_UPLOAD_JOB, dedupe_key)
+            if existing:
+                return {**_job_view(existing), 'job_id': existing['id'], 'duplicate': True}
         
         # Get event categories
         categories = []
@@ -2488,126 +2846,196 @@ async def bulk_upload_players(
                 detail="No categories found for this event. Please create categories first."
             )
         
-        # Use first category as default
-        default_category = categories[0]
+        # Stream the sheet in chunks and validate each column-wise (first
+        # category is the default). The job only gets rows that can be
+        # written; player ids are assigned here so a replayed step never
+        # duplicates.
+        def parse():
+            player_rows, errors = [], []
+            for chunk in read_player_sheet(contents, file.filename):
+                rows, chunk_errors = validate_player_frame(
+                    chunk, event_id, categories, status=PlayerStatus.AVAILABLE.value
+                )
+                player_rows.extend(rows)
+                errors.extend(chunk_errors)
+            return player_rows, errors
         
-        # Process each row
-        created_players = []
-        errors = []
+        try:
+            player_rows, errors = await run_in_threadpool(parse)
+        except SheetError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
-        for index, row in df.iterrows():
-            try:
-                # Get category_id and base_price
-                category_id = row.get('category_id', default_category['id'])
-                if pd.isna(category_id):
-                    category_id = default_category['id']
-                
-                # Find the category to get base price
-                selected_category = next((c for c in categories if c['id'] == category_id), default_category)
-                base_price = row.get('base_price', selected_category.get('base_price', 1000))
-                if pd.isna(base_price):
-                    base_price = selected_category.get('base_price', 1000)
-                
-                # Handle photo URL - upload to Cloudinary if it's a Google Drive link
-                photo_url = None
-                if pd.notna(row.get('photo_url')):
-                    original_url = str(row['photo_url']).strip()
-                    if 'drive.google.com' in original_url or 'googleusercontent.com' in original_url:
-                        # Upload Google Drive image to Cloudinary
-                        logger.info(f"Uploading image to Cloudinary for player: {row['name']}")
-                        photo_url = upload_google_drive_image_to_cloudinary(original_url)
-                        if not photo_url:
-                            logger.warning(f"Failed to upload image for {row['name']}, will use original URL")
-                            # Fall back to original Google Drive URL
-                            photo_url = original_url
-                    else:
-                        # Direct URL, use as is
-                        photo_url = original_url
-                
-                # Create player document
-                player_id = str(uuid.uuid4())
-                player_doc = {
-                    'id': player_id,
-                    'event_id': event_id,
-                    'name': str(row['name']).strip(),
-                    'category_id': str(category_id).strip(),
-                    'base_price': int(base_price),
-                    'current_price': None,
-                    'photo_url': photo_url,
-                    'position': str(row['position']).strip() if pd.notna(row.get('position')) else None,
-                    'specialty': str(row['specialty']).strip() if pd.notna(row.get('specialty')) else None,
-                    'age': int(row['age']) if pd.notna(row.get('age')) else None,
-                    'previous_team': str(row['previous_team']).strip() if pd.notna(row.get('previous_team')) else None,
-                    'status': PlayerStatus.AVAILABLE.value,
-                    'sold_to_team_id': None,
-                    'sold_price': None,
-                    'phone': str(row['phone']).strip() if pd.notna(row.get('phone')) else None,
-                    'email': str(row['email']).strip().lower() if pd.notna(row.get('email')) else None,
-                }
-                
-                # Handle stats if present
-                stats = {}
-                stat_fields = ['matches', 'runs', 'wickets', 'goals', 'assists']
-                for stat in stat_fields:
-                    if stat in df.columns and pd.notna(row.get(stat)):
-                        try:
-                            stats[stat] = int(float(row[stat]))
-                        except (ValueError, TypeError):
-                            pass
-                
-                if stats:
-                    player_doc['stats'] = stats
+        job = await run_in_threadpool(job_runner.store.create, {
+            'id': str(uuid.uuid4()),
+            'kind': BULK_UPLOAD_JOB,
+            'event_id': event_id,
+            'created_by': current_user['uid'],
+            'dedupe_key': dedupe_key,
+            'total': len(player_rows),
+            'errors': errors,
+            'payload': player_rows,
+        })
+        job_runner.submit(job['id'])
+        return {**_job_view(job), 'job_id': job['id'], 'duplicate': False}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Bulk upload error: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Bulk upload failed: {str(e)}")
+
+@job_runner.handler(BULK_UPLOAD_JOB)
+async def _run_bulk_upload(job: dict, payload: list, ctx) -> None:
+    """Process validated rows in steps: Drive photos -> Cloudinary, insert, checkpoint."""
+    event_id = job['event_id']
+    pool = _image_ingest_pool()
+    for start in range(ctx.processed, len(payload), BULK_UPLOAD_STEP):
+        step = payload[start:start + BULK_UPLOAD_STEP]
+        player_docs = [item['player'] for item in step]
+        
+        # Upload Google Drive images to Cloudinary concurrently; on failure
+        # the original Drive URL is kept
+        drive_photos = [d for d in player_docs if d.get('photo_url') and is_drive_url(d['photo_url'])]
+        if drive_photos:
+            uploaded = await pool.ingest_many(d['photo_url'] for d in drive_photos)
+            for player_doc in drive_photos:
+                if uploaded.get(player_doc['photo_url']):
+                    player_doc['photo_variants'] = pool.variants.get(player_doc['photo_url'])
+                    player_doc['photo_url'] = uploaded[player_doc['photo_url']]
                 else:
-                    player_doc['stats'] = None
-                
-                # Save to active backend
-                if _USE_POSTGRES and _pg:
-                    _pg.create_player(player_doc)
-                elif db:
-                    db.collection('players').document(player_id).set(player_doc)
-                
+                    logger.warning(f"Failed to upload image for {player_doc['name']}, will use original URL")
+        
+        # Ids are fixed in the payload, so a replayed step is a no-op for rows
+        # already written (ON CONFLICT DO NOTHING / WriteBatch set)
+        if _USE_POSTGRES and _pg:
+            failed = await run_in_threadpool(_pg.bulk_create_players, event_id, player_docs, skip_existing=True)
+        else:
+            failed = await run_in_threadpool(_firestore_batch_set, 'players', player_docs)
+        
+        errors, created_players = [], []
+        for item in step:
+            player_doc = item['player']
+            if player_doc['id'] in failed:
+                errors.append({'row': item['row'], 'name': player_doc['name'], 'error': failed[player_doc['id']]})
+            else:
                 created_players.append({
-                    'id': player_id,
+                    'id': player_doc['id'],
                     'name': player_doc['name'],
                     'category_id': player_doc['category_id']
                 })
-                
-            except Exception as e:
-                errors.append({
-                    'row': index + 2,  # +2 because Excel rows start at 1 and have header
-                    'name': row.get('name', 'Unknown'),
-                    'error': str(e)
-                })
-        
-        return {
-            'success': True,
-            'created_count': len(created_players),
-            'error_count': len(errors),
-            'created_players': created_players,
-            'errors': errors,
-            'message': f"Successfully created {len(created_players)} players. {len(errors)} errors encountered."
-        }
-        
+        await ctx.checkpoint(start + len(step), errors, created_players)
+    
+    ctx.message = f"Successfully created {ctx.created_count} players. {ctx.error_count} errors encountered."
+
+def _job_view(job: dict) -> dict:
+    """Job as returned by the API; bulk uploads keep the old response keys."""
+    total = job.get('total') or 0
+    return {
+        'id': job['id'],
+        'kind': job['kind'],
+        'event_id': job.get('event_id'),
+        'status': job['status'],
+        'success': job['status'] == 'completed',
+        'total': total,
+        'processed': job.get('processed') or 0,
+        'progress': round((job.get('processed') or 0) / total, 4) if total else 1.0,
+        'created_count': job.get('created_count') or 0,
+        'error_count': job.get('error_count') or 0,
+        'created_players': job.get('result') or [],
+        'errors': sorted(job.get('errors') or [], key=lambda e: e.get('row') or 0),
+        'message': job.get('message'),
+        'created_at': job.get('created_at'),
+        'started_at': job.get('started_at'),
+        'finished_at': job.get('finished_at'),
+        'updated_at': job.get('updated_at'),
+    }
+
+async def _get_job_for_user(job_id: str, current_user: dict) -> dict:
+    if job_runner.store is None:
+        raise HTTPException(status_code=503, detail="Database not available")
+    job = await run_in_threadpool(job_runner.store.get, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.get('created_by') != current_user['uid'] and not (
+        job.get('event_id') and await check_event_ownership(job['event_id'], current_user)
+    ):
+        raise HTTPException(status_code=403, detail="You can only view jobs for events you created")
+    return job
+
+@api_router.get("/jobs/{job_id}")
+async def get_job(job_id: str, current_user: dict = Depends(require_event_organizer)):
+    """Progress of a background job: processed/total, per-row errors, final result."""
+    try:
+        return _job_view(await _get_job_for_user(job_id, current_user))
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Bulk upload error: {str(e)}")
-        raise HTTPException(status_code=400, detail=f"Bulk upload failed: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+
+@api_router.post("/jobs/{job_id}/retry", status_code=status.HTTP_202_ACCEPTED)
+async def retry_job(job_id: str, current_user: dict = Depends(require_event_organizer)):
+    """Re-queue a failed job; it resumes from its last checkpoint."""
+    try:
+        job = await _get_job_for_user(job_id, current_user)
+        if job['status'] != 'failed':
+            raise HTTPException(status_code=400, detail=f"Job is {job['status']}, only failed jobs can be retried")
+        await run_in_threadpool(job_runner.store.requeue, job_id)
+        job_runner.submit(job_id)
+        return _job_view(await run_in_threadpool(job_runner.store.get, job_id))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _rebuild_derivatives(digest: str) -> bool:
+    """Derivatives for a photo ingested on another host (or before they existed)."""
+    from app.core.config import get_settings
+
+    settings = get_settings()
+    data = BlobStore(settings.image_cache_dir).get(digest)
+    if data is None:
+        index = _image_index()
+        source_url = index.url_for_hash(digest) if index else None
+        if not source_url:
+            return False
+        response = requests.get(source_url, timeout=15)
+        if response.status_code != 200:
+            return False
+        data = response.content
+    return DerivativeStore(settings.image_cache_dir).generate(data, digest) is not None
+
+@api_router.get("/media/{digest}/{variant}.webp")
+async def get_photo_derivative(digest: str, variant: str):
+    """Sized WebP of an ingested player photo; content-addressed, cached for a year."""
+    from app.core.config import get_settings
+
+    if not is_digest(digest) or variant not in VARIANTS:
+        raise HTTPException(status_code=404, detail="Image not found")
+    path = DerivativeStore(get_settings().image_cache_dir).path(digest, variant)
+    if not path.exists():
+        try:
+            built = await run_in_threadpool(_rebuild_derivatives, digest)
+        except Exception as e:
+            logger.warning(f"Could not rebuild derivatives for {digest}: {e}")
+            built = False
+        if not built:
+            raise HTTPException(status_code=404, detail="Image not found")
+    return FileResponse(path, media_type="image/webp", headers={"Cache-Control": IMMUTABLE_CACHE_CONTROL})
+
+def _player_rows(players):
+    """pg player dicts shaped like List[Player] output (status lowercased), for json_response."""
+    rows = project_rows(players, Player)
+    for row in rows:
+        if row.get('status'):
+            row['status'] = row['status'].lower()
+    return rows
 
 @api_router.get("/players/category/{category_id}", response_model=List[Player])
 async def get_category_players(category_id: str):
     """Get players by category"""
     try:
         if _USE_POSTGRES and _pg:
-            result = []
-            for player_data in _pg.list_players_for_category(category_id):
-                player_data = dict(player_data)
-                if player_data.get('stats'):
-                    player_data['stats'] = PlayerStats(**player_data['stats'])
-                if player_data.get('status'):
-                    player_data['status'] = player_data['status'].lower()
-                result.append(Player(**player_data))
-            return result
+            return json_response(_player_rows(_pg.list_players_for_category(category_id)))
 
         if not db:
             return []
@@ -2666,31 +3094,36 @@ async def get_player(player_id: str):
 @api_router.get("/auctions/{event_id}/players", response_model=List[Player])
 async def get_auction_players(
     event_id: str, 
+    response: Response,
     limit: Optional[int] = None, 
     offset: Optional[int] = 0,
-    status: Optional[str] = None
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
 ):
     """Get all players for an auction with optional pagination and filtering.
 
     status may be a single value or comma-separated list (e.g. available,on_hold).
+    Pass limit (1-500) and/or cursor for keyset pages ordered by player id; the
+    next cursor is returned in the X-Next-Cursor header. offset is kept for old clients.
     """
     try:
+        size = page_size(limit)
         if _USE_POSTGRES and _pg:
-            players = _pg.list_players_for_event(event_id, status=status)
-            # apply offset/limit
-            if offset:
-                players = players[offset:]
-            if limit is not None:
-                players = players[:limit]
-            result = []
-            for player_data in players:
-                player_data = dict(player_data)
-                if player_data.get('stats'):
-                    player_data['stats'] = PlayerStats(**player_data['stats'])
-                if player_data.get('status'):
-                    player_data['status'] = player_data['status'].lower()
-                result.append(Player(**player_data))
-            return result
+            if limit is not None or cursor:
+                players, next_cursor = _pg.list_players_page(
+                    event_id,
+                    limit=size,
+                    cursor=cursor,
+                    status=status,
+                    offset=0 if cursor else (offset or 0),
+                )
+                headers = {'X-Next-Cursor': next_cursor} if next_cursor and not offset else None
+            else:
+                players = _pg.list_players_for_event(event_id, status=status)
+                if offset:
+                    players = players[offset:]
+                headers = None
+            return json_response(_player_rows(players), headers=headers)
         if not db:
             return []
         
@@ -2704,6 +3137,28 @@ async def get_auction_players(
         status_set = None
         if status:
             status_set = {s.strip().lower() for s in str(status).split(",") if s.strip()}
+
+        # Keyset page: one 'in' query over the event's categories, ordered by doc id
+        if (cursor or (limit is not None and not offset)) and len(category_ids) <= 30:
+            query = db.collection('players').where('category_id', 'in', category_ids)
+            if status_set and len(status_set) == 1:
+                query = query.where('status', '==', next(iter(status_set)))
+            query = query.order_by(firestore.FieldPath.document_id())
+            docs, next_cursor = _firestore_page(
+                query, size, cursor,
+                keep=lambda d: not status_set or (d.get('status') or '').lower() in status_set,
+            )
+            result = []
+            for doc in docs:
+                player_data = doc.to_dict()
+                if player_data.get('status'):
+                    player_data['status'] = player_data['status'].lower()
+                if player_data.get('stats'):
+                    player_data['stats'] = PlayerStats(**player_data['stats'])
+                result.append(Player(**player_data))
+            if next_cursor:
+                response.headers['X-Next-Cursor'] = next_cursor
+            return result
         
         # Get all players for these categories with pagination
         result = []
@@ -2830,6 +3285,9 @@ async def update_player(player_id: str, player_data: PlayerCreate, current_user:
             'is_priority': player_data.is_priority,
             'extra_fields': player_data.extra_fields,
         }
+        if player_data.photo_url != player_existing.get('photo_url'):
+            # Derivatives belong to the old photo; clients fall back to photo_url
+            updated_data['photo_variants'] = None
         
         db.collection('players').document(player_id).update(updated_data)
         
@@ -2892,8 +3350,20 @@ async def delete_player(player_id: str, current_user: dict = Depends(require_eve
                 detail="You can only delete players for events you created"
             )
         
-        # Delete the player
-        db.collection('players').document(player_id).delete()
+        # Delete the player; a sold player leaves its team's counters
+        player_ref = db.collection('players').document(player_id)
+        
+        @firestore.transactional
+        def delete(transaction):
+            current = player_ref.get(transaction=transaction)
+            if not current.exists:
+                return []
+            teams = move_team_counters(transaction, db, current.to_dict(), None)
+            transaction.delete(player_ref)
+            return teams
+        
+        for team_id in delete(db.transaction()):
+            read_cache.invalidate(team_scope(team_id))
         
         return {"message": "Player deleted successfully"}
     except Exception as e:
@@ -2931,6 +3401,7 @@ async def start_auction(event_id: str, current_user: dict = Depends(require_even
         db.collection('events').document(event_id).update({
             'status': AuctionStatus.IN_PROGRESS.value
         })
+        read_cache.invalidate(event_scope(event_id))
         
         # Create or update auction state
         auction_state_id = f"auction_{event_id}"
@@ -2976,6 +3447,7 @@ async def pause_auction(event_id: str, current_user: dict = Depends(require_even
         db.collection('events').document(event_id).update({
             'status': AuctionStatus.PAUSED.value
         })
+        read_cache.invalidate(event_scope(event_id))
         
         auction_state_id = f"auction_{event_id}"
         db.collection('auction_state').document(auction_state_id).update({
@@ -3028,6 +3500,7 @@ async def start_player_spin(
                     "id": pid,
                     "name": p.get("name") or "Player",
                     "photo_url": p.get("photo_url"),
+                    "photo_variants": clean_variants(p.get("photo_variants")),
                     "position": p.get("position"),
                     "base_price": p.get("base_price"),
                 }
@@ -3221,6 +3694,10 @@ async def fix_current_players(event_id: str, current_user: dict = Depends(requir
 @api_router.get("/auction/state/{event_id}", response_model=AuctionState)
 async def get_auction_state(event_id: str):
     """Get current auction state"""
+    return await hot_reads.do(('auction_state', event_id), lambda: _auction_state(event_id))
+
+
+def _auction_state(event_id: str) -> AuctionState:
     try:
 
         if _USE_POSTGRES and _pg:
@@ -3302,15 +3779,12 @@ async def get_team_budget_analysis(team_id: str, event_id: str):
             raise HTTPException(status_code=503, detail="Database not available")
         
         # Get team details
-        team_doc = db.collection('teams').document(team_id).get()
-        if not team_doc.exists:
+        team_data = _fs_team_doc(team_id)
+        if not team_data:
             raise HTTPException(status_code=404, detail="Team not found")
         
-        team_data = team_doc.to_dict()
-        
         # Get categories
-        categories_docs = db.collection('categories').where('event_id', '==', event_id).stream()
-        categories = [Category(**doc.to_dict()) for doc in categories_docs]
+        categories = [Category(**c) for c in _fs_categories(event_id)]
         
         # Get team players
         team_players_docs = db.collection('players').where('sold_to_team_id', '==', team_id).where('status', '==', 'sold').stream()
@@ -3374,17 +3848,13 @@ async def get_max_safe_bid_amount(team_id: str, event_id: str, player_category:
             raise HTTPException(status_code=503, detail="Database not available")
         else:
             # Get team details
-            team_doc = db.collection('teams').document(team_id).get()
-            if not team_doc.exists:
+            team_data = _fs_team(team_id)
+            if not team_data:
                 raise HTTPException(status_code=404, detail="Team not found")
             
-            team_data = team_doc.to_dict()
-            
             # Get categories
-            categories_docs = db.collection('categories').where('event_id', '==', event_id).stream()
             categories = []
-            for cat in categories_docs:
-                cat_data = cat.to_dict()
+            for cat_data in _fs_categories(event_id):
                 # Handle transition from old model to new model
                 if 'base_price' not in cat_data:
                     cat_data['base_price'] = cat_data.get('base_price_min', 50000)
@@ -3716,10 +4186,9 @@ async def place_bid(bid_data: BidCreate, current_user: dict = Depends(require_te
     """Place a bid on a player"""
     try:
         if _USE_POSTGRES and _pg:
-            user = _pg.get_user(current_user['uid'])
-            if not user or not user.get('team_id'):
+            team_id = resolve_user_access(current_user)['team_id']
+            if not team_id:
                 raise HTTPException(status_code=400, detail="User not associated with a team")
-            team_id = user['team_id']
             team_data = _pg.get_team(team_id)
             if not team_data:
                 raise HTTPException(status_code=404, detail="Team not found")
@@ -3763,22 +4232,17 @@ async def place_bid(bid_data: BidCreate, current_user: dict = Depends(require_te
             raise HTTPException(status_code=503, detail="Database not available")
         
         # Get current user's team
-        user_doc = db.collection('users').document(current_user['uid']).get()
-        if not user_doc.exists or not user_doc.to_dict().get('team_id'):
+        team_id = resolve_user_access(current_user)['team_id']
+        if not team_id:
             raise HTTPException(status_code=400, detail="User not associated with a team")
         
-        team_id = user_doc.to_dict()['team_id']
-        
         # Get team details
-        team_doc = db.collection('teams').document(team_id).get()
-        if not team_doc.exists:
+        team_data = _fs_team_doc(team_id)
+        if not team_data:
             raise HTTPException(status_code=404, detail="Team not found")
         
-        team_data = team_doc.to_dict()
-        
         # Get categories and current team players for base price validation
-        categories_docs = db.collection('categories').where('event_id', '==', bid_data.event_id).stream()
-        categories = [Category(**doc.to_dict()) for doc in categories_docs]
+        categories = [Category(**c) for c in _fs_categories(bid_data.event_id)]
         
         team_players_docs = db.collection('players').where('sold_to_team_id', '==', team_id).where('status', '==', 'sold').stream()
         team_players = [doc.to_dict() for doc in team_players_docs]
@@ -3892,35 +4356,35 @@ async def finalize_bid(player_id: str, event_id: str, current_user: dict = Depen
             })
             return {"message": "Player marked as unsold"}
         
-        # Update player
-        db.collection('players').document(player_id).update({
-            'status': PlayerStatus.SOLD.value,
-            'sold_to_team_id': state_data['current_team_id'],
-            'sold_price': state_data['current_bid']
-        })
+        player_ref = db.collection('players').document(player_id)
         
-        # Update team
-        team_doc = db.collection('teams').document(state_data['current_team_id']).get()
-        if team_doc.exists:
-            team_data = team_doc.to_dict()
-            new_spent = team_data['spent'] + state_data['current_bid']
-            new_remaining = team_data['budget'] - new_spent
-            new_players_count = team_data['players_count'] + 1
+        @firestore.transactional
+        def sell(transaction):
+            player_doc = player_ref.get(transaction=transaction)
+            if not player_doc.exists:
+                raise HTTPException(status_code=404, detail="Player not found")
+            before = player_doc.to_dict()
+            sale = {
+                'status': PlayerStatus.SOLD.value,
+                'sold_to_team_id': state_data['current_team_id'],
+                'sold_price': state_data['current_bid']
+            }
+            # Player and team counters change together
+            teams = move_team_counters(transaction, db, before, {**before, **sale})
+            transaction.update(player_ref, sale)
             
-            db.collection('teams').document(state_data['current_team_id']).update({
-                'spent': new_spent,
-                'remaining': new_remaining,
-                'players_count': new_players_count
+            # Clear current player from auction state
+            transaction.update(db.collection('auction_state').document(auction_state_id), {
+                'current_player_id': None,
+                'current_bid': None,
+                'current_team_id': None,
+                'current_team_name': None,
+                'bid_history': []
             })
+            return teams
         
-        # Clear current player from auction state
-        db.collection('auction_state').document(auction_state_id).update({
-            'current_player_id': None,
-            'current_bid': None,
-            'current_team_id': None,
-            'current_team_name': None,
-            'bid_history': []
-        })
+        for team_id in sell(db.transaction()):
+            read_cache.invalidate(team_scope(team_id))
         
         return {"message": "Bid finalized successfully"}
     except HTTPException:
@@ -3995,23 +4459,15 @@ async def complete_bid_transaction(
             if team_data.get('remaining', 0) < amount:
                 raise HTTPException(status_code=400, detail="Team has insufficient budget")
             
-            # Update player status
-            transaction.update(player_ref, {
+            # Update player status and team counters (a resale moves them between teams)
+            before = player_doc.to_dict()
+            sale = {
                 'status': PlayerStatus.SOLD.value,
                 'sold_to_team_id': team_id,
                 'sold_price': amount
-            })
-            
-            # Update team budget
-            new_spent = team_data.get('spent', 0) + amount
-            new_remaining = team_data['budget'] - new_spent
-            new_players_count = team_data.get('players_count', 0) + 1
-            
-            transaction.update(team_ref, {
-                'spent': new_spent,
-                'remaining': new_remaining,
-                'players_count': new_players_count
-            })
+            }
+            touched_teams = move_team_counters(transaction, db, before, {**before, **sale})
+            transaction.update(player_ref, sale)
             
             # Clear auction state
             auction_state_id = f"auction_{event_id}"
@@ -4025,10 +4481,12 @@ async def complete_bid_transaction(
                 'bid_history': []
             })
             
-            return team_data
+            return team_data, touched_teams
         
         # Execute transaction
-        team_data = update_transaction(transaction)
+        team_data, touched_teams = update_transaction(transaction)
+        for touched_team_id in touched_teams:
+            read_cache.invalidate(team_scope(touched_team_id))
         
         return {
             "success": True,
@@ -4090,52 +4548,56 @@ async def sell_player_directly(
         if not db:
             raise HTTPException(status_code=503, detail="Database not available")
         
-        # Validate player exists and is available for sale
-        player_doc = db.collection('players').document(player_id).get()
-        if not player_doc.exists:
-            raise HTTPException(status_code=404, detail="Player not found")
-        
-        player_data = player_doc.to_dict()
-        if player_data.get('status') not in [PlayerStatus.AVAILABLE.value, PlayerStatus.CURRENT.value]:
-            raise HTTPException(status_code=400, detail="Player not available for sale")
-        
-        # Validate team exists
-        team_doc = db.collection('teams').document(team_id).get()
-        if not team_doc.exists:
-            raise HTTPException(status_code=404, detail="Team not found")
-        
-        team_data = team_doc.to_dict()
-        
-        # Check if team has enough budget
-        if team_data.get('remaining', 0) < price:
-            raise HTTPException(status_code=400, detail="Team has insufficient budget")
+        player_ref = db.collection('players').document(player_id)
+        team_ref = db.collection('teams').document(team_id)
+        state_ref = db.collection('auction_state').document(f"auction_{event_id}")
         
-        # Update player status
-        db.collection('players').document(player_id).update({
-            'status': PlayerStatus.SOLD.value,
-            'sold_to_team_id': team_id,
-            'sold_price': price
-        })
-        
-        # Update team budget
-        new_remaining = team_data['remaining'] - price
-        db.collection('teams').document(team_id).update({
-            'remaining': new_remaining
-        })
-        
-        # Clear auction state if this was the current player
-        auction_state_id = f"auction_{event_id}"
-        state_doc = db.collection('auction_state').document(auction_state_id).get()
-        if state_doc.exists:
-            state_data = state_doc.to_dict()
-            if state_data.get('current_player_id') == player_id:
-                db.collection('auction_state').document(auction_state_id).update({
+        @firestore.transactional
+        def sell(transaction):
+            # Validate player exists and is available for sale
+            player_doc = player_ref.get(transaction=transaction)
+            if not player_doc.exists:
+                raise HTTPException(status_code=404, detail="Player not found")
+            
+            player_data = player_doc.to_dict()
+            if player_data.get('status') not in [PlayerStatus.AVAILABLE.value, PlayerStatus.CURRENT.value]:
+                raise HTTPException(status_code=400, detail="Player not available for sale")
+            
+            # Validate team exists
+            team_doc = team_ref.get(transaction=transaction)
+            if not team_doc.exists:
+                raise HTTPException(status_code=404, detail="Team not found")
+            
+            team_data = team_doc.to_dict()
+            
+            # Check if team has enough budget
+            if team_data.get('remaining', 0) < price:
+                raise HTTPException(status_code=400, detail="Team has insufficient budget")
+            
+            state_doc = state_ref.get(transaction=transaction)
+            
+            # Update player status and team counters together
+            sale = {
+                'status': PlayerStatus.SOLD.value,
+                'sold_to_team_id': team_id,
+                'sold_price': price
+            }
+            move_team_counters(transaction, db, player_data, {**player_data, **sale})
+            transaction.update(player_ref, sale)
+            
+            # Clear auction state if this was the current player
+            if state_doc.exists and state_doc.to_dict().get('current_player_id') == player_id:
+                transaction.update(state_ref, {
                     'current_player_id': None,
                     'current_bid': 0,
                     'current_team_id': None,
                     'current_team_name': None,
                     'bid_history': []
                 })
+            return team_data
+        
+        team_data = sell(db.transaction())
+        read_cache.invalidate(team_scope(team_id))
         
         return {
             "message": f"Player sold successfully to {team_data['name']} for ₹{price:,}",
@@ -4171,31 +4633,38 @@ async def mark_player_unsold(
         if not db:
             raise HTTPException(status_code=503, detail="Database not available")
         
-        # Validate player exists
-        player_doc = db.collection('players').document(player_id).get()
-        if not player_doc.exists:
-            raise HTTPException(status_code=404, detail="Player not found")
-        
-        player_data = player_doc.to_dict()
-        
-        # Update player status to unsold
-        db.collection('players').document(player_id).update({
-            'status': PlayerStatus.UNSOLD.value
-        })
+        player_ref = db.collection('players').document(player_id)
+        state_ref = db.collection('auction_state').document(f"auction_{event_id}")
         
-        # Clear auction state if this was the current player
-        auction_state_id = f"auction_{event_id}"
-        state_doc = db.collection('auction_state').document(auction_state_id).get()
-        if state_doc.exists:
-            state_data = state_doc.to_dict()
-            if state_data.get('current_player_id') == player_id:
-                db.collection('auction_state').document(auction_state_id).update({
+        @firestore.transactional
+        def mark_unsold(transaction):
+            # Validate player exists
+            player_doc = player_ref.get(transaction=transaction)
+            if not player_doc.exists:
+                raise HTTPException(status_code=404, detail="Player not found")
+            
+            player_data = player_doc.to_dict()
+            state_doc = state_ref.get(transaction=transaction)
+            
+            # Update player status to unsold (a sold player no longer counts for its team)
+            unsold = {'status': PlayerStatus.UNSOLD.value}
+            teams = move_team_counters(transaction, db, player_data, {**player_data, **unsold})
+            transaction.update(player_ref, unsold)
+            
+            # Clear auction state if this was the current player
+            if state_doc.exists and state_doc.to_dict().get('current_player_id') == player_id:
+                transaction.update(state_ref, {
                     'current_player_id': None,
                     'current_bid': 0,
                     'current_team_id': None,
                     'current_team_name': None,
                     'bid_history': []
                 })
+            return player_data, teams
+        
+        player_data, teams = mark_unsold(db.transaction())
+        for team_id in teams:
+            read_cache.invalidate(team_scope(team_id))
         
         return {
             "message": f"Player {player_data['name']} marked as unsold",
@@ -4447,23 +4916,28 @@ async def release_player_from_team(player_id: str, current_user: dict = Depends(
         team_data = team_doc.to_dict()
         team_name = team_data.get('name', 'Unknown Team')
         
-        # Update player status to available and clear team association
-        db.collection('players').document(player_id).update({
-            'status': PlayerStatus.AVAILABLE.value,
-            'sold_to_team_id': None,
-            'sold_price': None
-        })
+        player_ref = db.collection('players').document(player_id)
         
-        # Update team budget - refund the amount and decrease player count
-        new_spent = max(0, team_data.get('spent', 0) - sold_price)
-        new_remaining = team_data.get('budget', 0) - new_spent
-        new_players_count = max(0, team_data.get('players_count', 0) - 1)
+        @firestore.transactional
+        def release(transaction):
+            current = player_ref.get(transaction=transaction)
+            if not current.exists or current.to_dict().get('status') != PlayerStatus.SOLD.value:
+                raise HTTPException(status_code=400, detail="Player is not sold to any team")
+            before = current.to_dict()
+            
+            # Player back to available; the team gets the amount refunded and one player fewer
+            released = {
+                'status': PlayerStatus.AVAILABLE.value,
+                'sold_to_team_id': None,
+                'sold_price': None
+            }
+            move_team_counters(transaction, db, before, {**before, **released})
+            transaction.update(player_ref, released)
+            return before
         
-        db.collection('teams').document(team_id).update({
-            'spent': new_spent,
-            'remaining': new_remaining,
-            'players_count': new_players_count
-        })
+        player_data = release(db.transaction())
+        sold_price = player_data.get('sold_price', 0)
+        read_cache.invalidate(team_scope(player_data['sold_to_team_id']))
         
         return {
             "message": f"Player {player_data['name']} released from {team_name} successfully",
@@ -4510,6 +4984,7 @@ async def create_sponsor(sponsor_data: SponsorCreate, current_user: dict = Depen
         
         if db:
             db.collection('sponsors').document(sponsor_id).set(sponsor_doc)
+            read_cache.invalidate(sponsors_scope(sponsor_doc['event_id']))
         
         return Sponsor(**sponsor_doc)
     except HTTPException:
@@ -4527,8 +5002,7 @@ async def get_event_sponsors(event_id: str):
         if not db:
             return []
         
-        sponsors = db.collection('sponsors').where('event_id', '==', event_id).stream()
-        return [Sponsor(**sponsor.to_dict()) for sponsor in sponsors]
+        return [Sponsor(**sponsor) for sponsor in _fs_sponsors(event_id)]
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -4599,6 +5073,10 @@ async def update_sponsor(sponsor_id: str, sponsor_data: SponsorCreate, current_u
             raise HTTPException(status_code=404, detail="Sponsor not found")
         
         db.collection('sponsors').document(sponsor_id).update(updated_data)
+        read_cache.invalidate(
+            sponsors_scope(sponsor_doc.to_dict().get('event_id')),
+            sponsors_scope(sponsor_data.event_id),
+        )
         
         # Get updated sponsor
         updated_doc = db.collection('sponsors').document(sponsor_id).get()
@@ -4643,6 +5121,7 @@ async def delete_sponsor(sponsor_id: str, current_user: dict = Depends(require_e
         
         # Delete the sponsor
         db.collection('sponsors').document(sponsor_id).delete()
+        read_cache.invalidate(sponsors_scope(existing.get('event_id')))
         
         return {"message": "Sponsor deleted successfully"}
     except HTTPException:
@@ -4656,11 +5135,13 @@ async def get_event_analytics(event_id: str):
     try:
         if _USE_POSTGRES and _pg:
             teams = _pg.list_teams(event_id)
+            all_players = _pg.list_player_summaries(event_id)
             team_analytics = []
             for team_data in teams:
-                players = _pg.list_players_for_team(team_data['id'])
                 category_dist = {}
-                for player_data in players:
+                for player_data in all_players:
+                    if player_data['status'] != 'sold' or player_data['sold_to_team_id'] != team_data['id']:
+                        continue
                     cat_id = player_data['category_id']
                     category_dist[cat_id] = category_dist.get(cat_id, 0) + 1
                 team_analytics.append(TeamAnalytics(
@@ -4671,7 +5152,6 @@ async def get_event_analytics(event_id: str):
                     remaining_budget=team_data['remaining'],
                     category_distribution=category_dist
                 ))
-            all_players = _pg.list_players_for_event(event_id)
             total_players = len(all_players)
             sold_players = 0
             unsold_players = 0
@@ -4782,6 +5262,28 @@ async def health():
             payload["status"] = "degraded"
     return payload
 
+@api_router.get("/internal/db-pool")
+async def db_pool_stats(current_user: dict = Depends(require_super_admin)):
+    """Connection pool counters and checkout wait histogram (super admin only)."""
+    if not (_USE_POSTGRES and _pg):
+        raise HTTPException(status_code=404, detail="Postgres backend not enabled")
+    from app.db.session import get_pool_stats
+
+    settings = _get_settings()
+    return {
+        "profile": settings.db_pool_profile,
+        **get_pool_stats(),
+    }
+
+@api_router.get("/internal/read-cache")
+async def read_cache_stats(current_user: dict = Depends(require_super_admin)):
+    """Hit/miss counters of the per-process read caches and hot-GET collapsing (super admin only)."""
+    return {
+        **read_cache.snapshot(),
+        'broadcast_tokens': broadcast_token_cache.snapshot(),
+        'hot_reads': hot_reads.snapshot(),
+    }
+
 # ============= BANK DETAILS ROUTES =============
 
 @api_router.post("/settings/bank-details", response_model=BankDetails)
@@ -5032,7 +5534,6 @@ async def create_payment_order(order_data: PaymentOrderCreate):
         settings_data = _load_cashfree_settings()
         cashfree_app_id = settings_data.get('cashfree_app_id')
         cashfree_secret_key = settings_data.get('cashfree_secret_key')
-        cashfree_mode = settings_data.get('cashfree_mode', 'sandbox')
         
         if not cashfree_app_id or not cashfree_secret_key:
             raise HTTPException(status_code=400, detail="Payment gateway credentials not configured")
@@ -5040,9 +5541,6 @@ async def create_payment_order(order_data: PaymentOrderCreate):
         # Create unique order ID
         order_id = f"order_{order_data.event_id[:8]}_{str(uuid.uuid4())[:8]}"
         
-        # Cashfree API endpoint based on mode
-        cashfree_url = f"https://{'sandbox' if cashfree_mode == 'sandbox' else 'api'}.cashfree.com/pg/orders"
-        
         phone = _normalize_in_phone(order_data.customer_phone)
         
         # Prepare order data for Cashfree
@@ -5062,22 +5560,14 @@ async def create_payment_order(order_data: PaymentOrderCreate):
             }
         }
         
-        # Make API call to Cashfree
-        headers = {
-            "accept": "application/json",
-            "x-api-version": "2023-08-01",
-            "content-type": "application/json",
-            "x-client-id": cashfree_app_id,
-            "x-client-secret": cashfree_secret_key
-        }
-        
-        response = requests.post(cashfree_url, json=cashfree_order_data, headers=headers)
-        
-        if response.status_code != 200:
-            logger.error(f"Cashfree API error: {response.text}")
-            raise HTTPException(status_code=400, detail=f"Failed to create payment order: {response.text}")
-        
-        cashfree_response = response.json()
+        # Make API call to Cashfree (pooled, with timeouts; see app/cashfree.py)
+        try:
+            cashfree_response = await cashfree.create_order(settings_data, cashfree_order_data)
+        except CashfreeError as e:
+            logger.error(f"Cashfree API error: {e} {e.body}")
+            if e.status_code is None:
+                raise HTTPException(status_code=503, detail=str(e))
+            raise HTTPException(status_code=400, detail=f"Failed to create payment order: {e.body}")
         
         # Store payment order in active backend
         payment_doc = {
@@ -5125,47 +5615,39 @@ async def verify_payment(verification_data: PaymentVerificationRequest):
                 raise HTTPException(status_code=404, detail="Payment order not found")
             payment_data = payment_doc.to_dict()
         
+        # Settled by the webhook or the reconciler already: no gateway call
+        if payment_data.get('status') in ['PAID', 'SUCCESS']:
+            return PaymentVerificationResponse(
+                payment_status=payment_data['status'],
+                order_id=verification_data.order_id,
+                order_amount=payment_data.get('amount'),
+                transaction_id=payment_data.get('transaction_id')
+            )
+        
         settings_data = _load_cashfree_settings()
         cashfree_app_id = settings_data.get('cashfree_app_id')
         cashfree_secret_key = settings_data.get('cashfree_secret_key')
-        cashfree_mode = settings_data.get('cashfree_mode', 'sandbox')
         
         if not cashfree_app_id or not cashfree_secret_key:
             raise HTTPException(status_code=400, detail="Payment gateway credentials not configured")
         
-        # Verify with Cashfree API based on mode
-        cashfree_url = f"https://{'sandbox' if cashfree_mode == 'sandbox' else 'api'}.cashfree.com/pg/orders/{verification_data.order_id}"
-        
-        headers = {
-            "accept": "application/json",
-            "x-api-version": "2023-08-01",
-            "x-client-id": cashfree_app_id,
-            "x-client-secret": cashfree_secret_key
-        }
-        
-        response = requests.get(cashfree_url, headers=headers)
-        
-        if response.status_code != 200:
-            logger.error(f"Cashfree verification error: {response.text}")
+        # Verify with Cashfree API (retried on network errors / 5xx)
+        try:
+            cashfree_response = await cashfree.get_order(settings_data, verification_data.order_id)
+        except CashfreeError as e:
+            logger.error(f"Cashfree verification error: {e} {e.body}")
+            if e.status_code is None:
+                raise HTTPException(status_code=503, detail=str(e))
             raise HTTPException(status_code=400, detail="Failed to verify payment")
-        
-        cashfree_response = response.json()
         order_status = cashfree_response.get('order_status')
         transaction_id = cashfree_response.get('cf_order_id')
-        verified_at = datetime.now(timezone.utc)
 
-        if _USE_POSTGRES and _pg:
-            _pg.update_payment(verification_data.order_id, {
-                'status': order_status,
-                'verified_at': verified_at,
-                'transaction_id': transaction_id,
-            })
-        else:
-            db.collection('payment_orders').document(verification_data.order_id).update({
-                'status': order_status,
-                'verified_at': verified_at.isoformat(),
-                'transaction_id': transaction_id,
-            })
+        # Same idempotent write as the webhook (a final status never changes)
+        await run_in_threadpool(_payment_store().apply, [{
+            'order_id': verification_data.order_id,
+            'status': order_status,
+            'transaction_id': transaction_id,
+        }])
         
         return PaymentVerificationResponse(
             payment_status=order_status,
@@ -5179,51 +5661,119 @@ async def verify_payment(verification_data: PaymentVerificationRequest):
         logger.error(f"Error verifying payment: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
 
+@api_router.post("/payments/webhook")
+async def payment_webhook(request: Request):
+    """
+    Cashfree payment webhook (notify_url of every order).
+
+    The signature is checked against the raw body; the order is then updated
+    like a verify call. Replays and late deliveries are harmless (final
+    statuses never change), and events we do not track are acknowledged.
+    """
+    raw_body = await request.body()
+    settings_data = await run_in_threadpool(_load_cashfree_settings)
+    if not verify_webhook_signature(
+        raw_body,
+        request.headers.get('x-webhook-timestamp', ''),
+        request.headers.get('x-webhook-signature', ''),
+        settings_data.get('cashfree_secret_key') or '',
+    ):
+        raise HTTPException(status_code=401, detail="Invalid webhook signature")
+    try:
+        update = webhook_update(json.loads(raw_body))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid webhook body")
+    if update is None:
+        return {"status": "ignored"}
+    
+    store = _payment_store()
+    if store is None:
+        raise HTTPException(status_code=503, detail="Database not available")
+    payment_data = await run_in_threadpool(store.get, update['order_id'])
+    if not payment_data:
+        logger.warning(f"Payment webhook for unknown order {update['order_id']}")
+        return {"status": "ignored"}
+    if update['status'] == 'PAID' and update['amount'] is not None and float(update['amount']) != float(payment_data.get('amount') or 0):
+        logger.error(
+            f"Payment webhook amount {update['amount']} does not match order "
+            f"{update['order_id']} ({payment_data.get('amount')})"
+        )
+        return {"status": "ignored"}
+    changed = await run_in_threadpool(store.apply, [update])
+    return {"status": "ok", "changed": bool(changed)}
+
+PAID_PAYMENT_STATUSES = ('PAID', 'SUCCESS')
+
+
+def _payment_statistics(totals: dict, event_data: dict) -> dict:
+    """Statistics block from {status: {count, amount}} (amounts of paid orders only)."""
+    paid = [totals[s] for s in PAID_PAYMENT_STATUSES if s in totals]
+    total_payments = sum(t['count'] for t in totals.values())
+    successful_payments = sum(t['count'] for t in paid)
+    pending_payments = totals.get('PENDING', {}).get('count', 0)
+    return {
+        'total_amount': sum(t['amount'] for t in paid),
+        'total_payments': total_payments,
+        'successful_payments': successful_payments,
+        'pending_payments': pending_payments,
+        'failed_payments': total_payments - successful_payments - pending_payments,
+        'registration_fee': (event_data.get('payment_settings') or {}).get('registration_fee', 0),
+    }
+
+
+def _firestore_payment_totals(event_id: str) -> dict:
+    """
+    {status: {count, amount}} from Firestore aggregation queries; only the
+    buckets the statistics need (paid, PENDING, everything else).
+    """
+    def aggregate(query, with_amount: bool = False) -> dict:
+        agg = query.count(alias='count')
+        if with_amount:
+            agg = agg.sum('amount', alias='amount')
+        values = {r.alias: r.value for r in agg.get()[0]}
+        return {'count': int(values['count']), 'amount': int(values.get('amount') or 0)}
+
+    payments = db.collection('payment_orders').where('event_id', '==', event_id)
+    totals = {
+        'PAID': aggregate(payments.where('status', 'in', list(PAID_PAYMENT_STATUSES)), with_amount=True),
+        'PENDING': aggregate(payments.where('status', '==', 'PENDING')),
+    }
+    other = aggregate(payments)['count'] - totals['PAID']['count'] - totals['PENDING']['count']
+    totals['OTHER'] = {'count': other, 'amount': 0}
+    return totals
+
+
 @api_router.get("/auctions/{event_id}/payments")
-async def get_event_payments(event_id: str, current_user: dict = Depends(get_current_user)):
-    """Get all payments for a specific event"""
+async def get_event_payments(
+    event_id: str,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user),
+):
+    """Get payments for a specific event.
+
+    The list is a keyset page, newest first (limit defaults to 100), and the
+    response carries next_cursor. Statistics come from grouped counts/sums,
+    not from the rows, and are only returned with the first page.
+    """
     try:
         if _USE_POSTGRES and _pg:
             event_data = _pg.get_event(event_id)
             if not event_data:
                 raise HTTPException(status_code=404, detail="Event not found")
-            user = _pg.get_user(current_user['uid'])
-            role = (user or {}).get('role') or current_user.get('role')
+            role = resolve_user_access(current_user)['role'] or current_user.get('role')
             if role != 'super_admin' and event_data.get('created_by') != current_user.get('uid'):
                 raise HTTPException(status_code=403, detail="Not authorized to view payments for this event")
-            payments_raw = _pg.list_payments(event_id)
-            payments = []
-            total_amount = 0
-            successful_payments = 0
-            pending_payments = 0
-            failed_payments = 0
-            for payment_data in payments_raw:
-                payment_data = dict(payment_data)
-                payment_data['id'] = payment_data.get('order_id')
-                payments.append(payment_data)
-                status = payment_data.get('status', 'PENDING')
-                amount = payment_data.get('amount') or 0
-                if status in ['PAID', 'SUCCESS']:
-                    successful_payments += 1
-                    total_amount += amount
-                elif status == 'PENDING':
-                    pending_payments += 1
-                else:
-                    failed_payments += 1
-            payments.sort(key=lambda x: x.get('created_at') or '', reverse=True)
-            return {
+            page, next_cursor = _pg.list_payments_page(event_id, page_size(limit), cursor)
+            result = {
                 'event_id': event_id,
                 'event_name': event_data.get('name'),
-                'payments': payments,
-                'statistics': {
-                    'total_amount': total_amount,
-                    'total_payments': len(payments),
-                    'successful_payments': successful_payments,
-                    'pending_payments': pending_payments,
-                    'failed_payments': failed_payments,
-                    'registration_fee': (event_data.get('payment_settings') or {}).get('registration_fee', 0)
-                }
+                'payments': [{**p, 'id': p.get('order_id')} for p in page],
+                'next_cursor': next_cursor,
             }
+            if cursor:
+                return result
+            return {**result, 'statistics': _payment_statistics(_pg.payment_totals(event_id), event_data)}
 
         if not db:
             raise HTTPException(status_code=503, detail="Database not available")
@@ -5236,51 +5786,27 @@ async def get_event_payments(event_id: str, current_user: dict = Depends(get_cur
         event_data = event_doc.to_dict()
         
         # Super admin can see all, organizers can see only their events
-        if current_user.get('role') != 'super_admin' and event_data.get('created_by') != current_user.get('uid'):
+        role = resolve_user_access(current_user)['role'] or current_user.get('role')
+        if role != 'super_admin' and event_data.get('created_by') != current_user.get('uid'):
             raise HTTPException(status_code=403, detail="Not authorized to view payments for this event")
         
-        # Get all payments for this event
-        payments_query = db.collection('payment_orders').where('event_id', '==', event_id).stream()
-        
-        payments = []
-        total_amount = 0
-        successful_payments = 0
-        pending_payments = 0
-        failed_payments = 0
-        
-        for payment_doc in payments_query:
-            payment_data = payment_doc.to_dict()
-            payment_data['id'] = payment_doc.id
-            payments.append(payment_data)
-            
-            # Calculate statistics
-            status = payment_data.get('status', 'PENDING')
-            amount = payment_data.get('amount', 0)
-            
-            if status in ['PAID', 'SUCCESS']:
-                successful_payments += 1
-                total_amount += amount
-            elif status == 'PENDING':
-                pending_payments += 1
-            else:
-                failed_payments += 1
-        
-        # Sort by created_at descending (newest first)
-        payments.sort(key=lambda x: x.get('created_at', ''), reverse=True)
-        
-        return {
+        # Composite index: payment_orders (event_id ASC, created_at DESC)
+        docs, next_cursor = _firestore_page(
+            db.collection('payment_orders')
+            .where('event_id', '==', event_id)
+            .order_by('created_at', direction=firestore.Query.DESCENDING)
+            .order_by(firestore.FieldPath.document_id(), direction=firestore.Query.DESCENDING),
+            page_size(limit), cursor, order=('created_at',),
+        )
+        result = {
             'event_id': event_id,
             'event_name': event_data.get('name'),
-            'payments': payments,
-            'statistics': {
-                'total_amount': total_amount,
-                'total_payments': len(payments),
-                'successful_payments': successful_payments,
-                'pending_payments': pending_payments,
-                'failed_payments': failed_payments,
-                'registration_fee': event_data.get('payment_settings', {}).get('registration_fee', 0)
-            }
+            'payments': [{**d.to_dict(), 'id': d.id} for d in docs],
+            'next_cursor': next_cursor,
         }
+        if cursor:
+            return result
+        return {**result, 'statistics': _payment_statistics(_firestore_payment_totals(event_id), event_data)}
     except HTTPException:
         raise
     except Exception as e:
@@ -5290,6 +5816,36 @@ async def get_event_payments(event_id: str, current_user: dict = Depends(get_cur
 # Include router in main app
 app.include_router(api_router)
 
+@app.on_event("startup")
+async def start_job_runner():
+    # Resumes jobs left queued/running by a previous process
+    if job_runner.store is not None:
+        job_runner.start()
+
+@app.on_event("shutdown")
+async def stop_job_runner():
+    await job_runner.stop()
+
+@app.on_event("startup")
+async def start_payment_reconciler():
+    if payment_reconciler.store is not None and payment_reconciler.interval_seconds > 0:
+        payment_reconciler.start()
+
+@app.on_event("startup")
+async def start_team_counter_reconciler():
+    if team_counter_reconciler is not None and team_counter_reconciler.interval_seconds > 0:
+        team_counter_reconciler.start()
+
+@app.on_event("shutdown")
+async def stop_team_counter_reconciler():
+    if team_counter_reconciler is not None:
+        await team_counter_reconciler.stop()
+
+@app.on_event("shutdown")
+async def close_cashfree_client():
+    await payment_reconciler.stop()
+    await cashfree.aclose()
+
 # Add root-level health check for Railway deployment
 @app.get("/health")
 async def root_health():
@@ -5312,4 +5868,5 @@ app.add_middleware(
     allow_credentials=False,  # Set to False when using wildcard origins
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "HEAD", "PATCH"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
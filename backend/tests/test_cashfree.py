@@ -0,0 +1,166 @@
+"""
+Async Cashfree client against the local gateway stub (app/cashfree_stub.py)
+served on a free port: retries, timeouts, bounded concurrency and duplicate
+order creation (no network or credentials required).
+
+Run:
+  cd backend
+  PYTHONPATH=. pytest tests/test_cashfree.py -v
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+import uvicorn
+
+from app.cashfree import CashfreeClient, CashfreeError
+from app.cashfree_stub import create_stub_app
+
+CREDENTIALS = {"cashfree_app_id": "app", "cashfree_secret_key": "secret", "cashfree_mode": "sandbox"}
+
+
+def _order(order_id: str) -> dict:
+    return {
+        "order_id": order_id,
+        "order_amount": 500,
+        "order_currency": "INR",
+        "customer_details": {"customer_id": order_id, "customer_phone": "9876543210"},
+    }
+
+
+@pytest.fixture()
+def stub():
+    app = create_stub_app()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    app.state.base_url = f"http://127.0.0.1:{port}"
+    yield app.state
+    server.should_exit = True
+    thread.join(5)
+
+
+def _client(stub, **kwargs) -> CashfreeClient:
+    kwargs.setdefault("backoff_seconds", 0.01)
+    return CashfreeClient(base_url=stub.base_url, **kwargs)
+
+
+def test_create_then_verify_after_payment(stub):
+    client = _client(stub)
+
+    async def scenario():
+        created = await client.create_order(CREDENTIALS, _order("order_a"))
+        assert created["order_status"] == "ACTIVE" and created["payment_session_id"]
+        stub.orders["order_a"]["order_status"] = "PAID"
+        fetched = await client.get_order(CREDENTIALS, "order_a")
+        await client.aclose()
+        return created, fetched
+
+    created, fetched = asyncio.run(scenario())
+    assert (fetched["order_status"], fetched["cf_order_id"]) == ("PAID", created["cf_order_id"])
+
+
+def test_gets_are_retried_on_5xx_but_order_creation_is_not(stub):
+    client = _client(stub, retries=2)
+    stub.orders["order_b"] = {"order_id": "order_b", "order_status": "PAID"}
+
+    async def scenario():
+        stub.fail_next = 2
+        fetched = await client.get_order(CREDENTIALS, "order_b")
+        stub.fail_next = 1
+        with pytest.raises(CashfreeError) as failed:
+            await client.create_order(CREDENTIALS, _order("order_c"))
+        await client.aclose()
+        return fetched, failed.value
+
+    fetched, error = asyncio.run(scenario())
+    assert fetched["order_status"] == "PAID"
+    assert client.stats == {"requests": 4, "retries": 2}
+    assert error.status_code == 503 and "order_c" not in stub.orders
+
+
+def test_duplicate_order_id_returns_the_existing_order(stub):
+    client = _client(stub)
+
+    async def scenario():
+        first = await client.create_order(CREDENTIALS, _order("order_d"))
+        # e.g. the response to the first attempt was lost and the call is repeated
+        again = await client.create_order(CREDENTIALS, _order("order_d"))
+        await client.aclose()
+        return first, again
+
+    first, again = asyncio.run(scenario())
+    assert again["payment_session_id"] == first["payment_session_id"]
+
+
+def test_duplicate_order_id_for_another_payment_is_an_error(stub):
+    client = _client(stub)
+    other = {**_order("order_e"), "customer_details": {"customer_id": "someone_else"}}
+
+    async def scenario():
+        await client.create_order(CREDENTIALS, _order("order_e"))
+        with pytest.raises(CashfreeError) as clash:
+            await client.create_order(CREDENTIALS, other)
+        with pytest.raises(CashfreeError):
+            await client.create_order(CREDENTIALS, {**_order("order_e"), "order_amount": 900})
+        await client.aclose()
+        return clash.value
+
+    assert asyncio.run(scenario()).status_code == 409
+
+
+def test_slow_gateway_times_out_instead_of_hanging(stub):
+    stub.latency_ms = 1000
+    client = _client(stub, timeout=0.2, retries=0)
+
+    async def scenario():
+        started = time.perf_counter()
+        with pytest.raises(CashfreeError) as failed:
+            await client.get_order(CREDENTIALS, "order_e")
+        await client.aclose()
+        return time.perf_counter() - started, failed.value
+
+    elapsed, error = asyncio.run(scenario())
+    assert error.status_code is None
+    assert elapsed < 0.8
+
+
+def test_calls_in_flight_are_bounded(stub):
+    stub.latency_ms = 100
+    client = _client(stub, concurrency=2)
+    for i in range(6):
+        stub.orders[f"order_{i}"] = {"order_id": f"order_{i}", "order_status": "ACTIVE"}
+
+    async def scenario():
+        results = await asyncio.gather(*(client.get_order(CREDENTIALS, f"order_{i}") for i in range(6)))
+        await client.aclose()
+        return results
+
+    assert len(asyncio.run(scenario())) == 6
+    assert stub.stats["max_active"] == 2
+
+
+def test_busy_gateway_fails_fast_when_no_slot_frees_up(stub):
+    stub.latency_ms = 500
+    client = _client(stub, concurrency=1, acquire_timeout=0.05, retries=0)
+    stub.orders["order_f"] = {"order_id": "order_f", "order_status": "ACTIVE"}
+
+    async def scenario():
+        results = await asyncio.gather(
+            client.get_order(CREDENTIALS, "order_f"),
+            client.get_order(CREDENTIALS, "order_f"),
+            return_exceptions=True,
+        )
+        await client.aclose()
+        return results
+
+    first, second = asyncio.run(scenario())
+    assert first["order_id"] == "order_f"
+    assert isinstance(second, CashfreeError) and "busy" in str(second)
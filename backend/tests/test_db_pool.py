@@ -0,0 +1,68 @@
+"""
+Pool configuration and checkout instrumentation (no Postgres required).
+
+Run:
+  cd backend
+  PYTHONPATH=. pytest tests/test_db_pool.py -v
+"""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+from sqlalchemy import exc
+
+from app.core.config import Settings
+from app.db.pool import InstrumentedQueuePool, pool_stats
+from app.db.session import engine_options
+
+
+def test_engine_options_from_env(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "postgresql+psycopg://u:p@localhost:5432/db")
+    monkeypatch.setenv("DB_POOL_SIZE", "12")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "3")
+    monkeypatch.setenv("DB_POOL_TIMEOUT", "2.5")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+    monkeypatch.delenv("DB_POOL_PROFILE", raising=False)
+
+    opts = engine_options(Settings())
+    assert opts["poolclass"] is InstrumentedQueuePool
+    assert opts["pool_size"] == 12
+    assert opts["max_overflow"] == 3
+    assert opts["pool_timeout"] == 2.5
+    assert opts["pool_pre_ping"] is False
+    assert "connect_args" not in opts
+
+
+def test_pgbouncer_profile_disables_prepared_statements(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "postgresql+psycopg://u:p@localhost:6432/db")
+    monkeypatch.setenv("DB_POOL_PROFILE", "pgbouncer")
+    monkeypatch.setenv("DB_POOL_SIZE", "10")
+
+    opts = engine_options(Settings())
+    assert opts["connect_args"] == {"prepare_threshold": None}
+    assert opts["pool_size"] == 2
+    assert opts["pool_recycle"] == -1
+
+
+def test_pool_stats_track_checkouts_and_timeouts():
+    pool_stats.reset()
+    pool = InstrumentedQueuePool(
+        lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=0, timeout=0.05
+    )
+    held = pool.connect()
+    with pytest.raises(exc.TimeoutError):
+        pool.connect()
+
+    snap = pool_stats.snapshot(pool)
+    assert snap["checkouts"] == 1
+    assert snap["timeouts"] == 1
+    assert snap["checked_out"] == 1
+    assert snap["wait_ms_max"] >= 50
+    assert sum(snap["wait_histogram"].values()) == 1
+
+    held.close()
+    pool.connect().close()
+    assert pool_stats.snapshot(pool)["checked_out"] == 0
+    assert pool_stats.snapshot()["checkouts"] == 2
@@ -0,0 +1,78 @@
+"""
+Trusted-row JSON fast path matches response_model output (no Postgres required).
+
+Run:
+  cd backend
+  PYTHONPATH=. pytest tests/test_fast_json.py -v
+"""
+
+from __future__ import annotations
+
+import json
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.fast_json import json_response, project_rows
+from models import Player, Team
+
+
+def _player_row(i: int, **overrides):
+    row = {
+        "id": f"p{i}",
+        "event_id": "e1",  # not part of Player; must be dropped
+        "category_id": "c1",
+        "name": f"Player {i}",
+        "base_price": 1000,
+        "current_price": None,
+        "photo_url": None,
+        "age": 24,
+        "position": "Batsman",
+        "specialty": None,
+        "stats": {"matches": 10, "runs": 250},
+        "status": "available",
+        "sold_to_team_id": None,
+        "sold_price": None,
+        "previous_team": None,
+        "cricheroes_link": None,
+        "contact_number": None,
+        "district": None,
+        "identity_proof_url": None,
+        "is_priority": False,
+        "extra_fields": {"email": "p@example.com"},
+    }
+    row.update(overrides)
+    return row
+
+
+def _via_pydantic(rows, model):
+    adapter = TypeAdapter(List[model])
+    return jsonable_encoder(adapter.validate_python(rows))
+
+
+def test_player_rows_match_response_model_output():
+    rows = [
+        _player_row(1),
+        _player_row(2, stats=None, status="sold", sold_price=5000),
+        _player_row(3, stats={}, extra_fields=None),
+    ]
+    assert project_rows(rows, Player) == _via_pydantic(rows, Player)
+
+
+def test_missing_keys_take_model_defaults():
+    row = {"id": "t1", "name": "Tigers", "event_id": "e1", "budget": 100, "remaining": 100,
+           "max_squad_size": 15}
+    assert project_rows([row], Team) == _via_pydantic([row], Team)
+
+    player = {"id": "p1", "name": "X", "category_id": "c1", "base_price": 10}
+    (out,) = project_rows([player], Player)
+    assert out["status"] == "available"
+    assert out["is_priority"] is False
+    assert out["stats"] is None
+
+
+def test_json_response_sets_headers():
+    resp = json_response([{"id": "p1"}], headers={"X-Next-Cursor": "abc"})
+    assert resp.headers["x-next-cursor"] == "abc"
+    assert json.loads(resp.body) == [{"id": "p1"}]
@@ -0,0 +1,156 @@
+"""
+Local Firebase ID-token verification and the verified-token cache.
+
+Tokens are signed with a throwaway RSA key whose self-signed certificate
+stands in for Google's securetoken cert set (no network required).
+
+Run:
+  cd backend
+  PYTHONPATH=. pytest tests/test_id_tokens.py -v
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+
+import jwt
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+
+from app.core.id_tokens import IdTokenVerifier, InvalidIdToken
+
+PROJECT = "powerauction-test"
+NOW = 1_800_000_000
+
+
+def _key_and_cert():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "securetoken.test")])
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(dt.datetime(2020, 1, 1))
+        .not_valid_after(dt.datetime(2040, 1, 1))
+        .sign(key, hashes.SHA256())
+    )
+    pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    return pem, cert.public_bytes(serialization.Encoding.PEM).decode()
+
+
+SIGNING_KEY, CERT = _key_and_cert()
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = float(NOW)
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _token(kid="k1", key=SIGNING_KEY, **overrides):
+    claims = {
+        "iss": f"https://securetoken.google.com/{PROJECT}",
+        "aud": PROJECT,
+        "sub": "user-1",
+        "iat": NOW - 10,
+        "auth_time": NOW - 10,
+        "exp": NOW + 3600,
+        "role": "team_admin",
+    }
+    claims.update(overrides)
+    return jwt.encode(claims, key, algorithm="RS256", headers={"kid": kid})
+
+
+@pytest.fixture()
+def verifier():
+    fetches = []
+
+    def fetch():
+        fetches.append(1)
+        return {"k1": CERT}, 3600
+
+    clock = Clock()
+    v = IdTokenVerifier(PROJECT, fetch_certs=fetch, background_refresh=False, clock=clock)
+    v.refresh_keys()
+    v.fetches = fetches
+    v.clock = clock
+    return v
+
+
+def test_valid_token_is_verified_once_then_cached(verifier, monkeypatch):
+    token = _token()
+    claims = verifier.verify(token)
+    assert claims["uid"] == "user-1"
+    assert claims["role"] == "team_admin"
+
+    def no_decode(*args, **kwargs):
+        raise AssertionError("cached token must not be re-verified")
+
+    monkeypatch.setattr(jwt, "decode", no_decode)
+    assert verifier.verify(token)["uid"] == "user-1"
+    assert (verifier.hits, verifier.misses) == (1, 1)
+
+
+def test_cache_entry_ends_at_token_exp(verifier):
+    token = _token(exp=NOW + 60)
+    verifier.verify(token)
+    verifier.clock.now = NOW + 61
+    with pytest.raises(InvalidIdToken, match="expired"):
+        verifier.verify(token)
+
+
+@pytest.mark.parametrize(
+    "overrides, message",
+    [
+        ({"aud": "other-project"}, "Invalid ID token"),
+        ({"iss": "https://securetoken.google.com/other"}, "Invalid ID token"),
+        ({"exp": NOW - 1}, "expired"),
+        ({"iat": NOW + 600}, "issued-at"),
+        ({"sub": ""}, "subject"),
+    ],
+)
+def test_rejects_bad_claims(verifier, overrides, message):
+    with pytest.raises(InvalidIdToken, match=message):
+        verifier.verify(_token(**overrides))
+
+
+def test_rejects_foreign_signature(verifier):
+    other_key, _ = _key_and_cert()
+    with pytest.raises(InvalidIdToken):
+        verifier.verify(_token(key=other_key))
+
+
+def test_unknown_kid_refetches_certs_at_most_once_a_minute(verifier):
+    assert len(verifier.fetches) == 1
+    with pytest.raises(InvalidIdToken, match="unknown key id"):
+        verifier.verify(_token(kid="rotated"))
+    assert len(verifier.fetches) == 1  # just fetched
+
+    verifier.clock.now = NOW + 120
+    with pytest.raises(InvalidIdToken, match="unknown key id"):
+        verifier.verify(_token(kid="rotated"))
+    assert len(verifier.fetches) == 2
+
+
+def test_without_project_id_uses_fallback_and_caches():
+    calls = []
+
+    def fallback(token):
+        calls.append(token)
+        return {"uid": "user-2", "exp": NOW + 3600}
+
+    v = IdTokenVerifier(None, fallback=fallback, clock=Clock())
+    assert v.verify("opaque")["uid"] == "user-2"
+    assert v.verify("opaque")["uid"] == "user-2"
+    assert calls == ["opaque"]
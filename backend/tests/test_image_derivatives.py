@@ -0,0 +1,60 @@
+"""
+Sized WebP derivatives of player photos (Pillow; no network required).
+
+Run:
+  cd backend
+  PYTHONPATH=. pytest tests/test_image_derivatives.py -v
+"""
+
+from __future__ import annotations
+
+import io
+
+from PIL import Image
+
+from app.image_derivatives import DerivativeStore, VARIANTS, clean_variants, derivative_urls, is_digest
+
+DIGEST = "ab" * 32
+
+
+def _image(size, mode="RGB") -> bytes:
+    buf = io.BytesIO()
+    Image.new(mode, size, (0, 128, 128, 120) if mode == "RGBA" else "teal").save(buf, "JPEG" if mode == "RGB" else "PNG")
+    return buf.getvalue()
+
+
+def test_generate_writes_each_variant_without_upscaling(tmp_path):
+    store = DerivativeStore(tmp_path)
+    urls = store.generate(_image((3000, 2000)), DIGEST)
+
+    assert urls == derivative_urls(DIGEST)
+    assert urls["thumb"] == f"/api/media/{DIGEST}/thumb.webp"
+    for variant, edge in VARIANTS.items():
+        with Image.open(store.path(DIGEST, variant)) as im:
+            assert im.format == "WEBP"
+            assert max(im.size) == edge
+
+    small = "cd" * 32
+    store.generate(_image((200, 100)), small)
+    with Image.open(store.path(small, "broadcast")) as im:
+        assert im.size == (200, 100)
+
+
+def test_transparency_is_kept_and_existing_files_are_reused(tmp_path):
+    store = DerivativeStore(tmp_path)
+    assert store.generate(_image((400, 400), mode="RGBA"), DIGEST)
+    with Image.open(store.path(DIGEST, "card")) as im:
+        assert im.mode == "RGBA"
+
+    before = store.path(DIGEST, "thumb").stat().st_mtime_ns
+    assert store.generate(b"ignored: all variants exist", DIGEST) == derivative_urls(DIGEST)
+    assert store.path(DIGEST, "thumb").stat().st_mtime_ns == before
+
+
+def test_non_images_and_foreign_urls_are_rejected(tmp_path):
+    assert DerivativeStore(tmp_path).generate(b"<html>sign in</html>", DIGEST) is None
+    assert is_digest(DIGEST) and not is_digest("../etc/passwd")
+    assert clean_variants({"thumb": f"/api/media/{DIGEST}/thumb.webp", "card": "https://evil.test/x"}) == {
+        "thumb": f"/api/media/{DIGEST}/thumb.webp"
+    }
+    assert clean_variants("nope") is None
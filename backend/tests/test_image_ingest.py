@@ -0,0 +1,251 @@
+"""
+Drive -> Cloudinary ingestion pool against a local HTTP stub that stands in
+for both Google Drive and Cloudinary (no network required).
+
+Run:
+  cd backend
+  PYTHONPATH=. pytest tests/test_image_ingest.py -v
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from app.image_cache import BlobStore, MemoryImageIndex
+from app.image_derivatives import DerivativeStore
+from app.image_ingest import ImageIngestPool, extract_drive_file_id, is_drive_url
+
+JPEG = b"\xff\xd8\xff\xe0fake-jpeg"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, body=b"", content_type="text/plain"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _enter(self):
+        stub = self.server
+        with stub.lock:
+            stub.active += 1
+            stub.max_active = max(stub.max_active, stub.active)
+        time.sleep(stub.delay)
+
+    def _leave(self):
+        with self.server.lock:
+            self.server.active -= 1
+
+    def do_GET(self):
+        stub = self.server
+        self._enter()
+        try:
+            parsed = urlparse(self.path)
+            if parsed.path.startswith("/lh3/d/"):
+                file_id = parsed.path.rsplit("/", 1)[1]
+                with stub.lock:
+                    stub.hits[file_id] = stub.hits.get(file_id, 0) + 1
+                    hits = stub.hits[file_id]
+                if file_id.startswith("flaky") and hits == 1:
+                    return self._reply(503)
+                if file_id.startswith(("fallback", "missing")):
+                    return self._reply(200, b"<html>sign in</html>", "text/html")
+                return self._reply(200, stub.image, "image/jpeg")
+            if parsed.path == "/drive/uc":
+                file_id = parse_qs(parsed.query)["id"][0]
+                if file_id.startswith("fallback"):
+                    return self._reply(200, stub.image, "image/png")
+                return self._reply(404)
+            self._reply(404)
+        finally:
+            self._leave()
+
+    def do_POST(self):
+        stub = self.server
+        self._enter()
+        try:
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            assert b"upload_preset" in body and stub.image in body
+            if stub.fail_uploads:
+                return self._reply(400, b"bad preset")
+            with stub.lock:
+                stub.upload_attempts += 1
+                status = stub.upload_errors.pop(0) if stub.upload_errors else None
+            if status:
+                return self._reply(status)
+            with stub.lock:
+                stub.uploads += 1
+                n = stub.uploads
+            self._reply(200, json.dumps({"secure_url": f"https://cdn.test/{n}.jpg"}).encode(), "application/json")
+        finally:
+            self._leave()
+
+
+@pytest.fixture
+def stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.active = server.max_active = server.uploads = 0
+    server.hits = {}
+    server.delay = 0.0
+    server.fail_uploads = False
+    server.upload_errors = []
+    server.upload_attempts = 0
+    server.image = JPEG
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _pool(stub, **kwargs):
+    base = f"http://127.0.0.1:{stub.server_address[1]}"
+    return ImageIngestPool(
+        "demo",
+        "preset",
+        drive_urls=(base + "/lh3/d/{file_id}", base + "/drive/uc?export=view&id={file_id}"),
+        cloudinary_api=base,
+        backoff_seconds=0.01,
+        **kwargs,
+    )
+
+
+def test_drive_url_helpers():
+    assert is_drive_url("https://drive.google.com/file/d/abc_123/view")
+    assert not is_drive_url("https://example.com/p.jpg")
+    assert extract_drive_file_id("https://drive.google.com/file/d/abc_123/view") == "abc_123"
+    assert extract_drive_file_id("https://drive.google.com/open?id=XYZ") == "XYZ"
+    assert extract_drive_file_id("https://drive.google.com/drive/folders") is None
+
+
+def test_ingest_many_retries_falls_back_and_dedupes(stub):
+    urls = [
+        "https://drive.google.com/file/d/ok1/view",
+        "https://drive.google.com/file/d/ok1/view",  # duplicate row
+        "https://drive.google.com/open?id=flaky1",
+        "https://drive.google.com/file/d/fallback1/view",
+        "https://drive.google.com/file/d/missing1/view",
+        "https://drive.google.com/drive/folders",
+    ]
+    result = asyncio.run(_pool(stub).ingest_many(urls))
+
+    assert len(result) == 5
+    assert result[urls[0]].startswith("https://cdn.test/")
+    assert result[urls[2]].startswith("https://cdn.test/")  # 503 then retried
+    assert result[urls[3]].startswith("https://cdn.test/")  # second Drive URL form
+    assert result[urls[4]] is None
+    assert result[urls[5]] is None
+    assert stub.hits["ok1"] == 1
+    assert stub.hits["flaky1"] == 2
+    assert stub.uploads == 3
+
+
+def test_transfers_run_concurrently_within_the_per_host_limit(stub):
+    stub.delay = 0.05
+    urls = [f"https://drive.google.com/file/d/img{i}/view" for i in range(12)]
+
+    start = time.perf_counter()
+    result = asyncio.run(_pool(stub, concurrency=8, per_host=3).ingest_many(urls))
+    elapsed = time.perf_counter() - start
+
+    assert all(result.values())
+    # Stub is one host: never more than per_host requests at once
+    assert stub.max_active == 3
+    # 24 requests of 50 ms, 3 at a time: ~0.4 s instead of 1.2 s serially
+    assert elapsed < 1.0
+
+
+def test_unreachable_hosts_give_none_after_retries():
+    pool = ImageIngestPool(
+        "demo",
+        "preset",
+        drive_urls=("http://127.0.0.1:1/d/{file_id}",),
+        cloudinary_api="http://127.0.0.1:1",
+        retries=1,
+        backoff_seconds=0.01,
+    )
+    url = "https://drive.google.com/file/d/abc/view"
+    assert asyncio.run(pool.ingest_many([url])) == {url: None}
+
+
+def test_repeat_imports_are_served_from_the_cache(stub, tmp_path):
+    index, blobs = MemoryImageIndex(), BlobStore(tmp_path)
+    urls = [
+        "https://drive.google.com/file/d/ok1/view",
+        "https://drive.google.com/open?id=ok1",  # same file, other link form
+        "https://drive.google.com/file/d/ok2/view",
+    ]
+
+    first = asyncio.run(_pool(stub, index=index, blobs=blobs).ingest_many(urls))
+    assert first[urls[0]] == first[urls[1]]
+    assert stub.hits == {"ok1": 1, "ok2": 1}
+    # ok1 and ok2 have identical bytes: one Cloudinary upload
+    assert stub.uploads == 1 and first[urls[2]] == first[urls[0]]
+    assert len(list(tmp_path.rglob("*"))) == 2  # one shard dir, one blob
+
+    pool = _pool(stub, index=index, blobs=blobs)
+    assert asyncio.run(pool.ingest_many(urls)) == first
+    assert stub.hits == {"ok1": 1, "ok2": 1} and stub.uploads == 1
+    assert pool.stats == {"cached": 2, "downloads": 0, "uploads": 0}
+
+
+def test_failed_upload_is_retried_from_disk_without_downloading(stub, tmp_path):
+    index, blobs = MemoryImageIndex(), BlobStore(tmp_path)
+    url = "https://drive.google.com/file/d/ok1/view"
+
+    stub.fail_uploads = True
+    assert asyncio.run(_pool(stub, index=index, blobs=blobs).ingest_many([url])) == {url: None}
+    assert index.lookup("drive:ok1")["secure_url"] is None
+
+    stub.fail_uploads = False
+    pool = _pool(stub, index=index, blobs=blobs)
+    assert asyncio.run(pool.ingest_many([url]))[url].startswith("https://cdn.test/")
+    assert stub.hits["ok1"] == 1
+    assert pool.stats == {"cached": 0, "downloads": 0, "uploads": 1}
+
+
+def test_uploads_are_retried_only_when_they_cannot_duplicate(stub):
+    url = "https://drive.google.com/file/d/ok1/view"
+
+    # A 5xx may come after Cloudinary stored the asset: no second POST
+    stub.upload_errors = [503]
+    assert asyncio.run(_pool(stub).ingest_many([url])) == {url: None}
+    assert stub.upload_attempts == 1
+
+    stub.upload_errors = [429]
+    assert asyncio.run(_pool(stub).ingest_many([url]))[url].startswith("https://cdn.test/")
+    assert stub.upload_attempts == 3
+
+
+def test_ingest_writes_webp_derivatives(stub, tmp_path):
+    from PIL import Image
+
+    buf = io.BytesIO()
+    Image.new("RGB", (1200, 1600), "navy").save(buf, "JPEG")
+    stub.image = buf.getvalue()
+    url = "https://drive.google.com/file/d/real1/view"
+    store = DerivativeStore(tmp_path)
+
+    pool = _pool(stub, index=MemoryImageIndex(), blobs=BlobStore(tmp_path), derivatives=store)
+    asyncio.run(pool.ingest_many([url, "https://drive.google.com/file/d/missing1/view"]))
+
+    variants = pool.variants[url]
+    assert set(variants) == {"thumb", "card", "broadcast"}
+    digest = variants["thumb"].split("/")[3]
+    with Image.open(store.path(digest, "card")) as card:
+        assert (card.format, card.size) == ("WEBP", (240, 320))
+    assert list(pool.variants) == [url]
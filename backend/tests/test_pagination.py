@@ -0,0 +1,30 @@
+"""
+Keyset cursors and page sizes shared by the paged list endpoints.
+
+Run:
+  cd backend
+  PYTHONPATH=. pytest tests/test_pagination.py -v
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from app.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, encode_cursor, page_size
+
+
+def test_cursor_round_trip_and_malformed_cursors():
+    assert decode_cursor(encode_cursor("2026-10-19T10:00:00+00:00", "reg-1")) == [
+        "2026-10-19T10:00:00+00:00", "reg-1",
+    ]
+    for bad in ("not base64!", encode_cursor()):
+        with pytest.raises(ValueError):
+            decode_cursor(bad)
+
+
+def test_page_size_rejects_limits_it_would_have_to_change():
+    assert page_size(None) == DEFAULT_PAGE_SIZE
+    assert page_size(1) == 1 and page_size(MAX_PAGE_SIZE) == MAX_PAGE_SIZE
+    for bad in (0, -5, MAX_PAGE_SIZE + 1):
+        with pytest.raises(ValueError, match="limit must be between"):
+            page_size(bad)
@@ -142,6 +142,8 @@ def auction_fixture():
             Event,
             Player,
             PlayerRegistration,
+            PublicEventBroadcastToken,
+            Sponsor,
             Team,
             User,
         )
@@ -156,6 +158,14 @@ def auction_fixture():
                 select(PlayerRegistration).where(PlayerRegistration.event_id == event_id)
             ).all():
                 s.delete(reg)
+            for sp in s.scalars(select(Sponsor).where(Sponsor.event_id == event_id)).all():
+                s.delete(sp)
+            for tok in s.scalars(
+                select(PublicEventBroadcastToken).where(
+                    PublicEventBroadcastToken.event_id == event_id
+                )
+            ).all():
+                s.delete(tok)
             for pid in (p1, p2):
                 pl = s.get(Player, pid)
                 if pl:
@@ -190,6 +200,8 @@ def test_bid_finalize_and_purse(auction_fixture):
 
     pg_repo.update_event(eid, {"status": "in_progress"})
     pg_repo.upsert_auction_state(eid, {"status": "in_progress", "timer_duration": 60})
+    assert pg_repo.get_team(tid)["spent"] == 0
+    assert pg_repo.list_teams(eid)[0]["spent"] == 0
     nxt = pg_repo.set_next_player(eid, p1)
     assert nxt["player_id"] == p1
     assert nxt["base_price"] == 10000
@@ -217,8 +229,18 @@ def test_bid_finalize_and_purse(auction_fixture):
     assert fin["sold"] is True
     assert fin["price"] == 15000
 
+    state = pg_repo.get_auction_state(eid)
+    assert state["last_result"]["type"] == "sold"
+    assert state["last_result"]["price"] == 15000
+    assert state["current_player_id"] is None
+
+    sold = pg_repo.list_player_summaries(eid, status="sold")
+    assert [(p["id"], p["sold_to_team_id"], p["sold_price"]) for p in sold] == [(p1, tid, 15000)]
+
+    # The purse was cached by the bid pre-check; the sale must invalidate it
     team = pg_repo.get_team(tid)
     assert team["spent"] == 15000
+    assert pg_repo.list_teams(eid)[0]["spent"] == 15000
     assert team["remaining"] == 485_000
     assert team["players_count"] == 1
 
@@ -248,6 +270,110 @@ def test_sell_and_release(auction_fixture):
     assert player["sold_to_team_id"] is None
 
 
+def test_team_read_does_not_write_or_pin_reads(auction_fixture):
+    import contextvars
+
+    from app.data import pg_repo
+    from app.db.session import reads_pinned_to_primary
+
+    tid = auction_fixture["team_id"]
+    pg_repo.sell_player_atomic(
+        player_id=auction_fixture["p2"], team_id=tid, price=20000, event_id=auction_fixture["event_id"]
+    )
+
+    team = pg_repo._load_team(tid)
+    assert (team["spent"], team["remaining"], team["players_count"]) == (20000, 480_000, 1)
+    assert pg_repo._load_team("no-such-team") is None
+
+    def read():
+        pg_repo._load_team(tid)
+        return reads_pinned_to_primary()
+
+    # Fresh context (no earlier commit in the request): the read must not pin
+    assert contextvars.Context().run(read) is False
+
+
+def test_next_player_holds_previous_current(auction_fixture):
+    from app.data import pg_repo
+
+    eid = auction_fixture["event_id"]
+    p1 = auction_fixture["p1"]
+    p2 = auction_fixture["p2"]
+
+    pg_repo.set_next_player(eid, p1)
+    nxt = pg_repo.set_next_player(eid, p2)
+    assert nxt["held_players"] == [{"player_id": p1, "player_name": "Player One"}]
+    assert pg_repo.get_player(p1)["status"] == "on_hold"
+    assert pg_repo.get_player(p2)["status"] == "current"
+
+    assert pg_repo.clear_current_players(eid, except_player_id=p2) == 0
+    assert pg_repo.clear_current_players(eid) == 1
+    assert pg_repo.get_player(p2)["status"] == "available"
+
+    pg_repo.update_player(p1, {"status": "unsold"})
+    assert pg_repo.make_unsold_available(eid) == 1
+    assert {p["id"] for p in pg_repo.list_players_for_event(eid, status="available")} == {p1, p2}
+
+
+def test_public_player_board_matches_individual_reads(auction_fixture):
+    from app.data import pg_repo
+
+    eid = auction_fixture["event_id"]
+    tid = auction_fixture["team_id"]
+    p1 = auction_fixture["p1"]
+
+    pg_repo.create_sponsor(
+        {"id": f"sp-{uuid.uuid4().hex[:8]}", "event_id": eid, "name": "Acme", "tier": "gold"}
+    )
+    board = pg_repo.get_public_player_board(eid)
+    assert board["event"]["id"] == eid
+    assert board["auction"] is None
+    assert board["player"] is None
+    assert [s["name"] for s in board["sponsors"]] == ["Acme"]
+
+    pg_repo.upsert_auction_state(eid, {"status": "in_progress", "timer_duration": 60})
+    pg_repo.set_next_player(eid, p1)
+    for amount in (12000, 14000):
+        pg_repo.place_bid_atomic(
+            player_id=p1, event_id=eid, team_id=tid, team_name="Tigers", amount=amount
+        )
+
+    board = pg_repo.get_public_player_board(eid)
+    state = pg_repo.get_auction_state(eid)
+    assert board["auction"] == state
+    assert board["player"] == pg_repo.get_player(p1)
+    assert board["category"]["base_price"] == 10000
+    assert board["sold_team"] is None
+    assert [b["amount"] for b in board["auction"]["bid_history"]] == [12000, 14000]
+
+    assert pg_repo.get_public_player_board(f"missing-{uuid.uuid4().hex[:8]}") is None
+
+
+def test_keyset_pages_cover_list_once(auction_fixture):
+    from app.data import pg_repo
+
+    eid = auction_fixture["event_id"]
+    seen, cursor = [], None
+    while True:
+        page, cursor = pg_repo.list_players_page(eid, limit=1, cursor=cursor)
+        seen.extend(p["id"] for p in page)
+        if not cursor:
+            break
+    assert seen == sorted([auction_fixture["p1"], auction_fixture["p2"]])
+
+    page, cursor = pg_repo.list_players_page(eid, limit=5, status="sold")
+    assert page == [] and cursor is None
+
+    for i in range(3):
+        pg_repo.create_registration(
+            {"id": f"reg-{uuid.uuid4().hex[:8]}", "event_id": eid, "name": f"R{i}"}
+        )
+    first, cursor = pg_repo.list_registrations_page(eid, 2)
+    rest, last = pg_repo.list_registrations_page(eid, 2, cursor)
+    assert last is None
+    assert [r["name"] for r in first + rest] == ["R2", "R1", "R0"]
+
+
 def test_registration_flow(auction_fixture):
     from app.data import pg_repo
 
@@ -271,3 +397,152 @@ def test_registration_flow(auction_fixture):
     player = pg_repo.get_player(result["player_id"])
     assert player["name"] == "Applicant"
     assert player["base_price"] == 12000
+
+
+
+def test_bulk_registration_decisions_report_per_id_outcomes(auction_fixture):
+    from app.data import pg_repo
+
+    eid = auction_fixture["event_id"]
+    cat = pg_repo.list_categories(eid)[0]["id"]
+    regs = [f"reg-{uuid.uuid4().hex[:8]}" for _ in range(4)]
+    for i, reg_id in enumerate(regs):
+        pg_repo.create_registration(
+            {"id": reg_id, "event_id": eid, "name": f"Applicant {i}", "status": "pending_approval"}
+        )
+
+    outcomes = pg_repo.decide_registrations_bulk(
+        eid,
+        "approve",
+        [
+            {"registration_id": regs[0], "category_id": cat, "base_price": 12000},
+            {"registration_id": regs[1], "category_id": cat},  # category base price
+            {"registration_id": regs[0], "category_id": cat},
+            {"registration_id": regs[2], "category_id": "no-such-cat"},
+            {"registration_id": "missing", "category_id": cat},
+        ],
+    )
+    assert [o["status"] for o in outcomes] == ["approved", "approved", "error", "error", "error"]
+    assert [o.get("error") for o in outcomes[2:]] == [
+        "Duplicate registration id in request",
+        "Category not found in this event",
+        "Registration not found",
+    ]
+    first, second = (pg_repo.get_player(o["player_id"]) for o in outcomes[:2])
+    assert (first["name"], first["base_price"]) == ("Applicant 0", 12000)
+    assert (second["name"], second["base_price"]) == ("Applicant 1", 10000)
+    reg = pg_repo.get_registration(regs[0])
+    assert (reg["status"], reg["player_id"]) == ("approved", outcomes[0]["player_id"])
+
+    # Approved registrations are never approved (or rejected) twice
+    outcomes = pg_repo.decide_registrations_bulk(
+        eid, "reject", [{"registration_id": r} for r in (regs[0], regs[2], regs[3])]
+    )
+    assert [o["status"] for o in outcomes] == ["error", "rejected", "rejected"]
+    assert pg_repo.get_registration(regs[3])["status"] == "rejected"
+    assert pg_repo.get_registration(regs[0])["status"] == "approved"
+
+def test_broadcast_token_lookup_and_revoke(auction_fixture):
+    from datetime import datetime, timedelta, timezone
+
+    from app.data import pg_repo
+
+    eid = auction_fixture["event_id"]
+    live = f"live-{uuid.uuid4().hex}"
+    expired = f"expired-{uuid.uuid4().hex}"
+    expires_at = datetime.now(timezone.utc) + timedelta(days=1)
+    pg_repo.create_event_broadcast_token({"token": live, "event_id": eid, "expires_at": expires_at})
+    pg_repo.create_event_broadcast_token(
+        {"token": expired, "event_id": eid, "expires_at": datetime.now(timezone.utc) - timedelta(seconds=1)}
+    )
+
+    row = pg_repo.get_event_broadcast_token(live)
+    assert row["event_id"] == eid
+    assert abs((row["expires_at"] - expires_at).total_seconds()) < 1
+    assert pg_repo.get_event_broadcast_token(expired) is None
+    assert pg_repo.resolve_event_broadcast_token(live) == eid
+
+    assert sorted(pg_repo.revoke_event_broadcast_tokens(eid)) == sorted([live, expired])
+    assert pg_repo.get_event_broadcast_token(live) is None
+    assert pg_repo.revoke_event_broadcast_tokens(eid) == []
+
+
+def test_bulk_create_players_isolates_bad_rows(auction_fixture):
+    from app.data import pg_repo
+
+    eid = auction_fixture["event_id"]
+    cat = pg_repo.list_categories(eid)[0]["id"]
+    rows = [
+        {"id": f"bulk-{uuid.uuid4().hex[:8]}", "category_id": cat, "name": f"Bulk {i}", "base_price": 5000}
+        for i in range(5)
+    ]
+    # Duplicate of an existing player and an unknown category
+    rows.append({"id": auction_fixture["p1"], "category_id": cat, "name": "Dup"})
+    rows.append({"id": f"bulk-{uuid.uuid4().hex[:8]}", "category_id": "no-such-cat", "name": "Orphan"})
+
+    failed = pg_repo.bulk_create_players(eid, rows, chunk_size=4)
+
+    assert set(failed) == {auction_fixture["p1"], rows[-1]["id"]}
+    names = {p["name"] for p in pg_repo.list_players_for_event(eid)}
+    assert {f"Bulk {i}" for i in range(5)} <= names
+    assert "Orphan" not in names
+    assert pg_repo.get_player(rows[0]["id"])["base_price"] == 5000
+
+
+def test_bulk_create_players_skip_existing_makes_replays_idempotent(auction_fixture):
+    from app.data import pg_repo
+
+    eid = auction_fixture["event_id"]
+    cat = pg_repo.list_categories(eid)[0]["id"]
+    rows = [
+        {"id": f"replay-{uuid.uuid4().hex[:8]}", "category_id": cat, "name": f"Replay {i}"}
+        for i in range(3)
+    ]
+
+    assert pg_repo.bulk_create_players(eid, rows[:2], skip_existing=True) == {}
+    # A resumed job writes the whole step again
+    assert pg_repo.bulk_create_players(eid, rows, skip_existing=True) == {}
+    names = [p["name"] for p in pg_repo.list_players_for_event(eid)]
+    assert sorted(n for n in names if n.startswith("Replay")) == ["Replay 0", "Replay 1", "Replay 2"]
+
+
+def test_changing_photo_url_drops_stale_photo_variants(auction_fixture):
+    from app.data import pg_repo
+    from app.image_derivatives import derivative_urls
+
+    p1 = auction_fixture["p1"]
+    variants = derivative_urls("a" * 64)
+    pg_repo.update_player(p1, {"photo_url": "https://example.com/old.jpg", "photo_variants": variants})
+
+    # Other edits (and re-saving the same photo) keep the derivatives
+    assert pg_repo.update_player(p1, {"name": "Renamed", "photo_url": "https://example.com/old.jpg"})[
+        "photo_variants"
+    ] == variants
+    updated = pg_repo.update_player(p1, {"photo_url": "https://example.com/new.jpg"})
+    assert updated["photo_variants"] is None
+    assert updated["photo_url"] == "https://example.com/new.jpg"
+
+
+def test_image_cache_maps_sources_and_content_hashes():
+    from sqlalchemy import delete
+
+    from app.data import pg_repo
+    from app.db.session import get_session_factory
+    from app.models import ImageCacheEntry
+
+    suffix = uuid.uuid4().hex[:8]
+    digest = uuid.uuid4().hex * 2
+    a, b = f"drive:test-a-{suffix}", f"drive:test-b-{suffix}"
+    try:
+        assert pg_repo.get_image_source(a) is None
+        pg_repo.upsert_image_source(a, digest, None, "image/jpeg")
+        assert pg_repo.find_image_url_by_hash(digest) is None
+
+        pg_repo.upsert_image_source(a, digest, "https://cdn.test/a.jpg", "image/jpeg")
+        pg_repo.upsert_image_source(b, digest, "https://cdn.test/a.jpg", "image/jpeg")
+        assert pg_repo.get_image_source(a)["secure_url"] == "https://cdn.test/a.jpg"
+        assert pg_repo.find_image_url_by_hash(digest) == "https://cdn.test/a.jpg"
+    finally:
+        with get_session_factory()() as s:
+            s.execute(delete(ImageCacheEntry).where(ImageCacheEntry.source_key.in_([a, b])))
+            s.commit()
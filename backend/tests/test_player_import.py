@@ -0,0 +1,113 @@
+"""
+Streaming sheet reader and vectorized row validation for bulk player
+uploads (no database required).
+
+Run:
+  cd backend
+  PYTHONPATH=. pytest tests/test_player_import.py -v
+"""
+
+from __future__ import annotations
+
+import io
+
+import pandas as pd
+import pytest
+
+from app.player_import import SheetError, read_player_sheet, validate_player_frame
+
+CATEGORIES = [{"id": "cat-a", "base_price": 5000}, {"id": "cat-b", "base_price": None}]
+
+ROWS = [
+    # Excel number phone, padded/upper-case email, default category and base price
+    {"name": " Ann ", "phone": 9876543210, "email": " Ann@X.COM ", "position": "Bat",
+     "specialty": "Opener", "category_id": None, "base_price": None, "age": 25.0, "runs": 310},
+    {"name": "Bob", "phone": "+91 98765-43210", "email": "b@x.com", "position": "Bowl",
+     "specialty": "Pace", "category_id": "cat-b", "base_price": "lots", "age": None, "runs": None},
+    {"name": None, "phone": "1", "email": "n@x.com", "position": "Bat",
+     "specialty": "Spin", "category_id": "cat-a", "base_price": 7000, "age": None, "runs": None},
+    {"name": "Cy", "phone": "2", "email": "c@x.com", "position": "Bat",
+     "specialty": "Spin", "category_id": "cat-z", "base_price": None, "age": None, "runs": None},
+    {"name": "Di", "phone": "3", "email": "d@x.com", "position": None,
+     "specialty": "Keeper", "category_id": "cat-b", "base_price": 2500, "age": "30", "runs": "n/a"},
+]
+
+
+def _sheet(ext: str, rows=ROWS) -> bytes:
+    buf = io.BytesIO()
+    df = pd.DataFrame(rows)
+    if ext == "csv":
+        df.to_csv(buf, index=False)
+    else:
+        df.to_excel(buf, index=False)
+    return buf.getvalue()
+
+
+@pytest.mark.parametrize("ext", ["xlsx", "csv"])
+def test_rows_are_normalized_and_errors_keep_excel_row_numbers(ext):
+    players, errors = [], []
+    chunks = list(read_player_sheet(_sheet(ext), f"players.{ext}", chunk_rows=2))
+    assert [len(c) for c in chunks] == [2, 2, 1]
+    for chunk in chunks:
+        rows, chunk_errors = validate_player_frame(chunk, "ev1", CATEGORIES)
+        players.extend(rows)
+        errors.extend(chunk_errors)
+
+    assert [(e["row"], e["name"], e["error"]) for e in errors] == [
+        (3, "Bob", "Invalid base_price: lots"),
+        (4, "Unknown", "Name is required"),
+        (5, "Cy", "Category cat-z not found in this event"),
+    ]
+    assert [p["row"] for p in players] == [2, 6]
+
+    ann, di = (p["player"] for p in players)
+    assert (ann["name"], ann["phone"], ann["email"]) == ("Ann", "9876543210", "ann@x.com")
+    assert (ann["category_id"], ann["base_price"], ann["age"]) == ("cat-a", 5000, 25)
+    assert ann["stats"] == {"runs": 310}
+    assert (di["category_id"], di["base_price"], di["age"], di["position"]) == ("cat-b", 2500, 30, None)
+    assert di["stats"] is None
+    assert ann["event_id"] == "ev1" and ann["status"] == "available" and ann["id"] != di["id"]
+    # Plain Python values, ready for JSON / the jobs payload
+    assert type(ann["base_price"]) is int and type(ann["age"]) is int
+
+
+@pytest.mark.parametrize("ext", ["xlsx", "csv"])
+def test_blank_rows_keep_their_place_in_row_numbers(ext):
+    blank = {k: None for k in ROWS[0]}
+    sheet = _sheet(ext, [ROWS[0], blank, blank, ROWS[3]])
+    if ext == "csv":
+        sheet = sheet.replace(b"\n,,,,,,,,\n", b"\n\n", 1)  # a truly empty line too
+    chunks = list(read_player_sheet(sheet, f"players.{ext}", chunk_rows=2))
+    assert sum(len(c) for c in chunks) == 2
+
+    results = [validate_player_frame(chunk, "ev1", CATEGORIES) for chunk in chunks]
+    assert [p["row"] for rows, _ in results for p in rows] == [2]
+    assert [(e["row"], e["name"]) for _, errors in results for e in errors] == [(5, "Cy")]
+
+
+def test_base_price_falls_back_to_default_when_category_has_none():
+    df = pd.DataFrame([{"name": "E", "phone": "+44 (20) 7946.0000", "email": "e@x.com",
+                        "position": "Bat", "specialty": "S", "category_id": "cat-b"}])
+    (row,), errors = validate_player_frame(df, "ev1", CATEGORIES)
+    assert errors == []
+    assert row["player"]["base_price"] == 1000
+    assert row["player"]["phone"] == "+442079460000"
+
+
+def test_missing_columns_and_unknown_formats_are_rejected():
+    sheet = _sheet("xlsx", [{"name": "A", "phone": "1"}])
+    with pytest.raises(SheetError, match="email, position, specialty"):
+        list(read_player_sheet(sheet, "players.xlsx"))
+    with pytest.raises(SheetError):
+        list(read_player_sheet(b"{}", "players.json"))
+
+
+def test_xlsx_is_read_in_bounded_chunks():
+    rows = [{"name": f"P{i}", "phone": i, "email": f"p{i}@x.com", "position": "Bat", "specialty": "S"}
+            for i in range(2500)]
+    chunks = read_player_sheet(_sheet("xlsx", rows), "big.xlsx", chunk_rows=1000)
+    sizes = []
+    for chunk in chunks:
+        sizes.append(len(chunk))
+        assert len(chunk) <= 1000
+    assert sizes == [1000, 1000, 500]
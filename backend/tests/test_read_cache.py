@@ -0,0 +1,120 @@
+"""
+Versioned per-process read cache (no Postgres required).
+
+Run:
+  cd backend
+  PYTHONPATH=. pytest tests/test_read_cache.py -v
+"""
+
+from __future__ import annotations
+
+from app.read_cache import ReadCache, event_scope, team_scope, teams_scope
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _counting_loader(values):
+    calls = []
+
+    def load():
+        calls.append(1)
+        return values[len(calls) - 1]
+
+    return load, calls
+
+
+def test_hits_misses_and_ttl():
+    clock = FakeClock()
+    cache = ReadCache(max_entries=10, ttl_seconds=5, clock=clock)
+    load, calls = _counting_loader([{"name": "v1"}, {"name": "v2"}])
+
+    assert cache.get_or_load("event", "e1", [event_scope("e1")], load) == {"name": "v1"}
+    assert cache.get_or_load("event", "e1", [event_scope("e1")], load) == {"name": "v1"}
+    assert len(calls) == 1
+
+    clock.now = 6
+    assert cache.get_or_load("event", "e1", [event_scope("e1")], load) == {"name": "v2"}
+    snap = cache.snapshot()
+    assert (snap["hits"], snap["misses"]) == (1, 2)
+    assert snap["by_kind"]["event"] == {"hits": 1, "misses": 2}
+
+
+def test_invalidate_bumps_only_matching_scope():
+    cache = ReadCache(max_entries=10, ttl_seconds=60)
+    load_a, calls_a = _counting_loader([["a1"], ["a2"]])
+    load_b, calls_b = _counting_loader([["b1"]])
+
+    cache.get_or_load("teams", "e1", [teams_scope("e1")], load_a)
+    cache.get_or_load("teams", "e2", [teams_scope("e2")], load_b)
+    cache.invalidate(teams_scope("e1"), team_scope(None))
+
+    assert cache.get_or_load("teams", "e1", [teams_scope("e1")], load_a) == ["a2"]
+    assert cache.get_or_load("teams", "e2", [teams_scope("e2")], load_b) == ["b1"]
+    assert (len(calls_a), len(calls_b)) == (2, 1)
+    assert cache.snapshot()["invalidations"] == 1
+
+
+def test_write_during_load_is_not_cached_as_fresh():
+    cache = ReadCache(max_entries=10, ttl_seconds=60)
+
+    def racing_load():
+        # A writer commits and invalidates while this (older) read is in flight
+        cache.invalidate(team_scope("t1"))
+        return {"spent": 0}
+
+    cache.get_or_load("team", "t1", [team_scope("t1")], racing_load)
+    load, calls = _counting_loader([{"spent": 500}])
+    assert cache.get_or_load("team", "t1", [team_scope("t1")], load) == {"spent": 500}
+    assert len(calls) == 1
+
+
+def test_lru_bound_and_copies():
+    cache = ReadCache(max_entries=2, ttl_seconds=60)
+    for key in ("a", "b", "c"):
+        cache.get_or_load("event", key, [event_scope(key)], lambda: {"rules": {}})
+    snap = cache.snapshot()
+    assert snap["size"] == 2
+    assert snap["evictions"] == 1
+
+    got = cache.get_or_load("event", "c", [event_scope("c")], lambda: None)
+    got["rules"]["x"] = 1
+    assert cache.get_or_load("event", "c", [event_scope("c")], lambda: None) == {"rules": {}}
+
+
+def test_disabled_cache_always_loads():
+    cache = ReadCache(max_entries=10, ttl_seconds=0)
+    load, calls = _counting_loader([1, 2])
+    assert cache.get_or_load("event", "e1", [], load) == 1
+    assert cache.get_or_load("event", "e1", [], load) == 2
+    assert cache.snapshot()["misses"] == 0
+
+
+def test_ttl_for_caps_entry_lifetime():
+    clock = FakeClock()
+    cache = ReadCache(max_entries=10, ttl_seconds=60, clock=clock)
+    load, calls = _counting_loader([{"expires_in": 5}, {"expires_in": 5}, {"expires_in": 0}, None])
+
+    def ttl_for(value):
+        return value["expires_in"] if value else float("inf")
+
+    cache.get_or_load("token", "t", [], load, ttl_for=ttl_for)
+    clock.now = 4
+    cache.get_or_load("token", "t", [], load, ttl_for=ttl_for)
+    assert len(calls) == 1
+    clock.now = 6
+    cache.get_or_load("token", "t", [], load, ttl_for=ttl_for)
+    assert len(calls) == 2
+
+    # No time left: returned but not stored
+    clock.now = 12
+    assert cache.get_or_load("token", "t", [], load, ttl_for=ttl_for) == {"expires_in": 0}
+    assert cache.get_or_load("token", "t", [], load, ttl_for=ttl_for) is None
+    # Negative results fall back to the cache-wide TTL
+    assert cache.get_or_load("token", "t", [], load, ttl_for=ttl_for) is None
+    assert len(calls) == 4
@@ -0,0 +1,255 @@
+"""
+Shared cache backends: in-process and Redis protocol (against a local fake
+RESP server, no Redis required).
+
+Run:
+  cd backend
+  PYTHONPATH=. pytest tests/test_shared_cache.py -v
+"""
+
+from __future__ import annotations
+
+import socketserver
+import threading
+import time
+
+import pytest
+
+from app.read_cache import ReadCache, teams_scope
+from app.shared_cache import MemoryCache, RespCache, SharedCache, SharedCacheError
+
+
+class _FakeRedisHandler(socketserver.StreamRequestHandler):
+    """Just enough RESP2 for RespCache: MGET SET(PX/NX) GETDEL DEL INCR PEXPIRE."""
+
+    def _read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        assert line[:1] == b"*"
+        args = []
+        for _ in range(int(line[1:])):
+            size = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(size + 2)[:-2].decode())
+        return args
+
+    def _bulk(self, value):
+        if value is None:
+            return b"$-1\r\n"
+        data = value.encode()
+        return b"$%d\r\n%s\r\n" % (len(data), data)
+
+    def _live(self, key):
+        entry = self.server.data.get(key)
+        if entry and entry[0] is not None and entry[0] <= time.monotonic():
+            del self.server.data[key]
+            return None
+        return entry[1] if entry else None
+
+    def handle(self):
+        server = self.server
+        while True:
+            args = self._read_command()
+            if args is None:
+                with server.lock:
+                    server.disconnects += 1
+                return
+            cmd, rest = args[0].upper(), args[1:]
+            with server.lock:
+                server.commands.append(cmd)
+                if cmd == "AUTH":
+                    reply = b"+OK\r\n" if rest[-1] == server.password else b"-WRONGPASS\r\n"
+                elif cmd == "SELECT":
+                    reply = b"+OK\r\n"
+                elif cmd == "MGET":
+                    reply = b"*%d\r\n" % len(rest) + b"".join(self._bulk(self._live(k)) for k in rest)
+                elif cmd == "SET":
+                    key, value, opts = rest[0], rest[1], [o.upper() for o in rest[2:]]
+                    expiry = None
+                    if "PX" in opts:
+                        expiry = time.monotonic() + int(rest[2 + opts.index("PX") + 1]) / 1000
+                    if "NX" in opts and self._live(key) is not None:
+                        reply = b"$-1\r\n"
+                    else:
+                        server.data[key] = (expiry, value)
+                        reply = b"+OK\r\n"
+                elif cmd == "GETDEL":
+                    reply = self._bulk(self._live(rest[0]))
+                    server.data.pop(rest[0], None)
+                elif cmd == "DEL":
+                    removed = sum(1 for k in rest if self._live(k) is not None)
+                    for k in rest:
+                        server.data.pop(k, None)
+                    reply = b":%d\r\n" % removed
+                elif cmd == "INCR":
+                    expiry = server.data.get(rest[0], (None, None))[0]
+                    value = int(self._live(rest[0]) or 0) + 1
+                    server.data[rest[0]] = (expiry, str(value))
+                    reply = b":%d\r\n" % value
+                elif cmd == "PEXPIRE":
+                    live = self._live(rest[0]) is not None
+                    if live:
+                        server.data[rest[0]] = (
+                            time.monotonic() + int(rest[1]) / 1000,
+                            server.data[rest[0]][1],
+                        )
+                    reply = b":%d\r\n" % int(live)
+                else:
+                    reply = b"-ERR unknown command\r\n"
+                if server.garbage and cmd not in ("AUTH", "SELECT"):
+                    reply = b"?garbage\r\n"
+            self.wfile.write(reply)
+
+
+class FakeRedis(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, password=None):
+        super().__init__(("127.0.0.1", 0), _FakeRedisHandler)
+        self.data = {}
+        self.commands = []
+        self.password = password
+        self.garbage = False
+        self.disconnects = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        auth = f":{self.password}@" if self.password else ""
+        return f"redis://{auth}127.0.0.1:{self.server_address[1]}/1"
+
+
+@pytest.fixture
+def fake_redis():
+    server = FakeRedis(password="s3cret")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(params=["memory", "resp"])
+def cache(request, fake_redis):
+    if request.param == "memory":
+        return MemoryCache()
+    return RespCache(fake_redis.url, prefix="test:")
+
+
+def test_get_set_delete_and_json_values(cache):
+    assert cache.get("missing") is None
+    cache.set("k", {"email": "a@b.c", "n": 1})
+    assert cache.get("k") == {"email": "a@b.c", "n": 1}
+    assert cache.get_many(["k", "missing"]) == [{"email": "a@b.c", "n": 1}, None]
+    assert cache.delete("k", "missing") == 1
+    assert cache.get("k") is None
+
+
+def test_ttl_add_pop_and_incr(cache):
+    cache.set("short", 1, ttl=0.05)
+    assert cache.add("once", "first", ttl=10)
+    assert not cache.add("once", "second", ttl=10)
+    assert cache.pop("once") == "first"
+    assert cache.pop("once") is None
+    assert [cache.incr("ctr"), cache.incr("ctr", ttl=10)] == [1, 2]
+    time.sleep(0.08)
+    assert cache.get("short") is None
+    assert cache.get("ctr") == 2
+
+
+def test_resp_uses_prefix_auth_and_pipelines_incr(fake_redis):
+    cache = RespCache(fake_redis.url, prefix="pa:")
+    cache.incr("v", ttl=60)
+    assert "pa:v" in fake_redis.data
+    assert fake_redis.commands[:2] == ["AUTH", "SELECT"]
+    # Connection is pooled: one AUTH for several commands
+    cache.get("v")
+    assert fake_redis.commands.count("AUTH") == 1
+
+    with pytest.raises(SharedCacheError):
+        RespCache(fake_redis.url.replace("s3cret", "wrong")).get("v")
+
+
+def test_unparseable_reply_closes_the_connection(fake_redis):
+    cache = RespCache(fake_redis.url)
+    cache.set("k", 1)
+    fake_redis.garbage = True
+    # Holding the traceback keeps the frame (and an unclosed socket) alive
+    with pytest.raises(SharedCacheError) as failed:
+        cache.get("k")
+    deadline = time.monotonic() + 2
+    while fake_redis.disconnects == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert fake_redis.disconnects == 1, failed.value
+    # The next call reconnects instead of reading a desynced stream
+    fake_redis.garbage = False
+    assert cache.get("k") == 1
+    assert fake_redis.commands.count("AUTH") == 2
+
+
+def test_incomplete_backend_fails_when_instantiated():
+    class NoIncr(SharedCache):
+        def get_many(self, keys):
+            return [None for _ in keys]
+
+        def set(self, key, value, ttl=None):
+            pass
+
+        def add(self, key, value, ttl=None):
+            return True
+
+        def pop(self, key):
+            return None
+
+        def delete(self, *keys):
+            return 0
+
+    with pytest.raises(TypeError, match="incr"):
+        NoIncr()
+
+
+def test_unreachable_backend_raises_shared_cache_error():
+    cache = RespCache("redis://127.0.0.1:1/0", timeout=0.2)
+    with pytest.raises(SharedCacheError):
+        cache.get("k")
+
+
+def test_read_cache_invalidation_reaches_other_workers(fake_redis):
+    # Two ReadCache instances stand in for two worker processes
+    worker_a = ReadCache(ttl_seconds=60, versions=RespCache(fake_redis.url))
+    worker_b = ReadCache(ttl_seconds=60, versions=RespCache(fake_redis.url))
+    rows = {"teams": ["v1"]}
+
+    def load():
+        return list(rows["teams"])
+
+    assert worker_a.get_or_load("teams", "e1", [teams_scope("e1")], load) == ["v1"]
+    assert worker_b.get_or_load("teams", "e1", [teams_scope("e1")], load) == ["v1"]
+
+    rows["teams"] = ["v2"]
+    worker_a.invalidate(teams_scope("e1"))
+    assert worker_b.get_or_load("teams", "e1", [teams_scope("e1")], load) == ["v2"]
+
+
+def test_read_cache_reads_through_when_backend_is_down():
+    cache = ReadCache(ttl_seconds=60, versions=RespCache("redis://127.0.0.1:1/0", timeout=0.2))
+    calls = []
+
+    def load():
+        calls.append(1)
+        return len(calls)
+
+    assert cache.get_or_load("event", "e1", [teams_scope("e1")], load) == 1
+    assert cache.get_or_load("event", "e1", [teams_scope("e1")], load) == 2
+    assert cache.snapshot()["backend_errors"] == 2
+
+
+def test_reset_tokens_go_through_shared_cache(monkeypatch):
+    import email_service
+    from app import shared_cache as shared_cache_module
+
+    monkeypatch.setattr(shared_cache_module, "shared_cache", MemoryCache())
+    token = email_service.generate_reset_token("player@example.com")
+    assert email_service.verify_reset_token(token) == "player@example.com"
+    assert email_service.verify_reset_token("not-a-token") is None
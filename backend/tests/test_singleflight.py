@@ -0,0 +1,120 @@
+"""
+Request collapsing for hot GETs (no database required).
+
+Run:
+  cd backend
+  PYTHONPATH=. pytest tests/test_singleflight.py -v
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.singleflight import SingleFlight
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _slow_loader(result="state", delay=0.05):
+    calls = []
+    lock = threading.Lock()
+
+    def load():
+        with lock:
+            calls.append(1)
+        time.sleep(delay)
+        return {"value": result, "call": len(calls)}
+
+    return load, calls
+
+
+def test_concurrent_callers_share_one_computation():
+    flight = SingleFlight()
+    load, calls = _slow_loader()
+
+    async def burst():
+        return await asyncio.gather(*(flight.do(("state", "e1"), load) for _ in range(50)))
+
+    results = asyncio.run(burst())
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    snap = flight.snapshot()
+    assert (snap["computations"], snap["shared"], snap["in_flight"]) == (1, 49, 0)
+
+
+def test_distinct_keys_are_not_collapsed():
+    flight = SingleFlight()
+    load, calls = _slow_loader(delay=0.01)
+
+    async def burst():
+        await asyncio.gather(flight.do("a", load), flight.do("b", load))
+
+    asyncio.run(burst())
+    assert len(calls) == 2
+
+
+def test_window_reuses_result_until_it_lapses():
+    clock = FakeClock()
+    flight = SingleFlight(window_seconds=0.1, clock=clock)
+    load, calls = _slow_loader(delay=0)
+
+    async def run():
+        first = await flight.do("k", load)
+        clock.now = 0.05
+        assert await flight.do("k", load) is first
+        clock.now = 0.2
+        assert (await flight.do("k", load))["call"] == 2
+        # per-call window override: 0 means in-flight sharing only
+        await flight.do("other", load, window=0)
+        await flight.do("other", load, window=0)
+
+    asyncio.run(run())
+    assert len(calls) == 4
+    assert flight.snapshot()["window_hits"] == 1
+
+
+def test_errors_reach_waiters_but_are_not_cached():
+    flight = SingleFlight(window_seconds=10)
+    calls = []
+
+    def failing():
+        calls.append(1)
+        time.sleep(0.02)
+        raise ValueError("boom")
+
+    async def run():
+        results = await asyncio.gather(
+            *(flight.do("k", failing) for _ in range(5)), return_exceptions=True
+        )
+        assert all(isinstance(r, ValueError) for r in results)
+        with pytest.raises(ValueError):
+            await flight.do("k", failing)
+
+    asyncio.run(run())
+    assert len(calls) == 2
+
+
+def test_cancelled_caller_does_not_cancel_shared_computation():
+    flight = SingleFlight()
+    load, calls = _slow_loader(delay=0.05)
+
+    async def run():
+        leader = asyncio.ensure_future(flight.do("k", load))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do("k", load))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(run())["value"] == "state"
+    assert len(calls) == 1
@@ -0,0 +1,85 @@
+"""
+Firestore team counters moved in the sale/release transactions (no Firebase
+required; the transaction and team documents are faked).
+
+Run:
+  cd backend
+  PYTHONPATH=. pytest tests/test_team_counters.py -v
+"""
+
+from __future__ import annotations
+
+from firebase_admin import firestore
+
+from app.team_counters import counter_deltas, move_team_counters
+
+
+def _sold(team_id, price):
+    return {"status": "sold", "sold_to_team_id": team_id, "sold_price": price}
+
+
+def test_deltas_for_sale_release_resale_and_delete():
+    available = {"status": "available", "sold_to_team_id": None, "sold_price": None}
+
+    assert counter_deltas(available, _sold("t1", 500)) == {"t1": (1, 500)}
+    assert counter_deltas(_sold("t1", 500), available) == {"t1": (-1, -500)}
+    assert counter_deltas(_sold("t1", 500), {**_sold("t1", 500), "status": "unsold"}) == {"t1": (-1, -500)}
+    assert counter_deltas(_sold("t1", 500), _sold("t2", 700)) == {"t1": (-1, -500), "t2": (1, 700)}
+    assert counter_deltas(_sold("t1", 500), _sold("t1", 800)) == {"t1": (0, 300)}
+    assert counter_deltas(_sold("t1", 500), None) == {"t1": (-1, -500)}
+    # Unchanged sale and players that never counted
+    assert counter_deltas(_sold("t1", 500), _sold("t1", 500)) == {}
+    assert counter_deltas(available, {**available, "status": "unsold"}) == {}
+
+
+class FakeSnapshot:
+    def __init__(self, exists):
+        self.exists = exists
+
+
+class FakeRef:
+    def __init__(self, team_id, teams):
+        self.id = team_id
+        self.teams = teams
+
+    def get(self, transaction=None):
+        transaction.ops.append(("get", self.id))
+        return FakeSnapshot(self.id in self.teams)
+
+
+class FakeDb:
+    def __init__(self, teams):
+        self.teams = teams
+
+    def collection(self, name):
+        assert name == "teams"
+        return self
+
+    def document(self, team_id):
+        return FakeRef(team_id, self.teams)
+
+
+class FakeTransaction:
+    def __init__(self):
+        self.ops = []
+        self.updates = {}
+
+    def update(self, ref, fields):
+        self.ops.append(("update", ref.id))
+        self.updates[ref.id] = fields
+
+
+def test_counters_move_with_increments_and_skip_deleted_teams():
+    transaction = FakeTransaction()
+    touched = move_team_counters(transaction, FakeDb({"t2"}), _sold("gone", 500), _sold("t2", 700))
+
+    assert touched == ["t2"]
+    # Firestore transactions read everything before the first write
+    assert transaction.ops == [("get", "gone"), ("get", "t2"), ("update", "t2")]
+    assert transaction.updates == {
+        "t2": {
+            "players_count": firestore.Increment(1),
+            "spent": firestore.Increment(700),
+            "remaining": firestore.Increment(-700),
+        }
+    }
@@ -0,0 +1,105 @@
+"""
+Role/team resolution from custom claims with a store fallback (no Firebase
+or Postgres required; the store loader and firebase_auth are patched).
+
+Run:
+  cd backend
+  PYTHONPATH=. pytest tests/test_user_claims.py -v
+"""
+
+from __future__ import annotations
+
+import pytest
+
+import auth_middleware
+from app.read_cache import read_cache
+from app.shared_cache import MemoryCache
+
+
+class FakeFirebaseAuth:
+    def __init__(self) -> None:
+        self.claims: dict[str, dict] = {}
+
+        self.revoked: list[str] = []
+
+    def set_custom_user_claims(self, uid, claims):
+        self.claims[uid] = claims
+
+    def revoke_refresh_tokens(self, uid):
+        self.revoked.append(uid)
+
+
+@pytest.fixture
+def store(monkeypatch):
+    users = {"u1": {"role": "team_admin", "team_id": "t1"}}
+    loads = []
+
+    def load(uid):
+        loads.append(uid)
+        return dict(users[uid]) if uid in users else None
+
+    fake_auth = FakeFirebaseAuth()
+    monkeypatch.setattr(auth_middleware, "_load_user_access", load)
+    monkeypatch.setattr(auth_middleware, "firebase_auth", fake_auth)
+    monkeypatch.setattr(auth_middleware, "shared_cache", MemoryCache())
+    read_cache.clear()
+    yield users, loads, fake_auth
+    read_cache.clear()
+
+
+def test_token_without_stamp_uses_cached_store_lookup(store):
+    users, loads, _ = store
+    token = {"uid": "u1", "role": "event_organizer"}
+
+    assert auth_middleware.resolve_user_access(token) == {"role": "team_admin", "team_id": "t1"}
+    assert auth_middleware.resolve_user_access(token)["team_id"] == "t1"
+    assert loads == ["u1"]
+
+
+def test_stamped_claims_skip_the_store(store):
+    _, loads, _ = store
+    token = {"uid": "u1", "role": "team_admin", "team_id": "t1", "claims_at": 1}
+
+    assert auth_middleware.resolve_user_access(token) == {"role": "team_admin", "team_id": "t1"}
+    assert loads == []
+
+
+def test_refresh_pushes_claims_and_outdates_older_tokens(store):
+    users, loads, fake_auth = store
+    old_token = {"uid": "u1", "role": "team_admin", "team_id": "t1", "claims_at": 1}
+
+    users["u1"] = {"role": "team_admin", "team_id": "t2"}
+    auth_middleware.refresh_user_claims("u1")
+
+    pushed = fake_auth.claims["u1"]
+    assert (pushed["role"], pushed["team_id"]) == ("team_admin", "t2")
+    assert pushed["claims_at"] > 1
+    # The old token predates the change: resolved from the store instead
+    assert auth_middleware.resolve_user_access(old_token)["team_id"] == "t2"
+
+    new_token = {"uid": "u1", **pushed}
+    loads.clear()
+    assert auth_middleware.resolve_user_access(new_token)["team_id"] == "t2"
+    assert loads == []
+    assert auth_middleware.claims_are_current(new_token, users["u1"])
+    assert not auth_middleware.claims_are_current(old_token, users["u1"])
+
+
+def test_unknown_user_resolves_to_no_access(store):
+    assert auth_middleware.resolve_user_access({"uid": "ghost"}) == {"role": "", "team_id": None}
+    auth_middleware.refresh_user_claims(None)
+    auth_middleware.refresh_user_claims("ghost")
+    assert store[2].claims == {}
+
+
+def test_deleted_user_token_resolves_to_no_role(store):
+    users, _, fake_auth = store
+    auth_middleware.refresh_user_claims("u1")
+    token = {"uid": "u1", **fake_auth.claims["u1"]}
+    assert auth_middleware.resolve_user_access(token)["role"] == "team_admin"
+
+    del users["u1"]
+    auth_middleware.revoke_user_claims("u1")
+
+    assert auth_middleware.resolve_user_access(token) == {"role": "", "team_id": None}
+    assert fake_auth.revoked == ["u1"]
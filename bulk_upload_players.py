@@ -22,14 +22,29 @@ Excel Format Required:
 
 Usage:
     python bulk_upload_players.py --excel players.xlsx --token YOUR_AUTH_TOKEN
+
+Chunked mode (--chunked --event-id EVENT_ID) streams the sheet in chunks to
+the server bulk endpoint (POST /auctions/{event_id}/bulk-upload-players),
+several chunks at a time over one pooled session, and records every chunk's
+job in a checkpoint file. Re-running the same command after an interruption
+skips finished chunks and picks up running ones. The sheet then needs the
+server's columns (name, phone, email, position, specialty; category_id and
+base_price optional) and photos are ingested server-side.
 """
 
 import pandas as pd
 import requests
 import argparse
+import hashlib
+import json
+import os
 import sys
 import re
-from typing import Optional, Dict, Any
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from requests.adapters import HTTPAdapter
+from typing import Optional, Dict, Any, Iterator, List, Tuple
+from urllib3.util.retry import Retry
 import time
 
 # Backend API URL
@@ -241,6 +256,284 @@ def bulk_upload_players(
             "error": f"Failed to read Excel file: {str(e)}"
         }
 
+# ---------------------------------------------------------------------------
+# Chunked mode
+# ---------------------------------------------------------------------------
+
+CHUNK_SIZE = 100
+WORKERS = 4
+POLL_SECONDS = 1.5
+JOB_DONE = ('completed', 'failed')
+
+
+def iter_sheet_chunks(
+    excel_file: str,
+    sheet_name=0,
+    chunk_size: int = CHUNK_SIZE,
+    start_row: int = 0
+) -> Iterator[Tuple[List[int], pd.DataFrame]]:
+    """
+    Yield (sheet row numbers, DataFrame) chunks without loading the whole sheet.
+
+    .xlsx is streamed with openpyxl read-only mode and .csv with
+    read_csv(chunksize=...); legacy .xls is read at once. Row numbers are
+    the spreadsheet's (header = row 1) so errors point at the right line.
+    Fully empty rows are skipped.
+    """
+    name = excel_file.lower()
+    if isinstance(sheet_name, str) and sheet_name.isdigit():
+        sheet_name = int(sheet_name)
+
+    if name.endswith('.csv'):
+        offset = 0
+        frames = pd.read_csv(excel_file, chunksize=chunk_size, dtype=str, skip_blank_lines=False)
+        for frame in frames:
+            rows = list(range(offset + 2, offset + 2 + len(frame)))
+            offset += len(frame)
+            filled = frame.notna().any(axis=1).tolist()
+            keep = [i for i, number in enumerate(rows) if number - 2 >= start_row and filled[i]]
+            if keep:
+                yield [rows[i] for i in keep], frame.iloc[keep].reset_index(drop=True)
+        return
+
+    if not name.endswith('.xlsx'):
+        frame = pd.read_excel(excel_file, sheet_name=sheet_name).iloc[start_row:].dropna(how='all')
+        for begin in range(0, len(frame), chunk_size):
+            part = frame.iloc[begin:begin + chunk_size]
+            yield [int(i) + 2 for i in part.index], part.reset_index(drop=True)
+        return
+
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(excel_file, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[sheet_name] if isinstance(sheet_name, int) else workbook[sheet_name]
+        values = sheet.iter_rows(values_only=True)
+        header = ['' if h is None else str(h).strip() for h in next(values, ())]
+        rows, batch = [], []
+        for number, row in enumerate(values, start=2):
+            if number - 2 < start_row or all(v is None for v in row):
+                continue
+            rows.append(number)
+            batch.append(row)
+            if len(batch) >= chunk_size:
+                yield rows, pd.DataFrame.from_records(batch, columns=header)
+                rows, batch = [], []
+        if batch:
+            yield rows, pd.DataFrame.from_records(batch, columns=header)
+    finally:
+        workbook.close()
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class Checkpoint:
+    """
+    Per-chunk progress in a local JSON file, rewritten atomically after every
+    change: {"source": {...}, "chunks": {"0": {"rows", "job_id", "status",
+    "created", "errors"}}}. "source" ties it to one file, event and chunking.
+    """
+
+    def __init__(self, path: str, source: Dict[str, Any], restart: bool = False):
+        self.path = path
+        self.source = source
+        self.chunks: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path) and not restart:
+            with open(path) as f:
+                saved = json.load(f)
+            if saved.get('source') != source:
+                raise ValueError(
+                    f"Checkpoint {path} belongs to a different file, event or chunk size "
+                    "(use --restart to discard it)"
+                )
+            self.chunks = saved.get('chunks', {})
+
+    def get(self, index: int) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.chunks.get(str(index), {}))
+
+    def update(self, index: int, **fields):
+        with self._lock:
+            self.chunks.setdefault(str(index), {}).update(fields)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, 'w') as f:
+                json.dump({'source': self.source, 'chunks': self.chunks}, f, indent=1)
+            os.replace(tmp, self.path)
+
+
+def make_session(token: str, workers: int) -> requests.Session:
+    """One keep-alive connection pool shared by all worker threads."""
+    session = requests.Session()
+    session.headers["Authorization"] = f"Bearer {token}"
+    # POST is retried too: the server returns the existing job for an
+    # identical chunk instead of importing it twice
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({'GET', 'POST'}),
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _api(session: requests.Session, method: str, path: str, **kwargs) -> Dict[str, Any]:
+    response = session.request(method, f"{API_URL}{path}", timeout=60, **kwargs)
+    if response.status_code not in (200, 202):
+        raise RuntimeError(f"Status {response.status_code}: {response.text}")
+    return response.json()
+
+
+def upload_chunk(
+    session: requests.Session,
+    checkpoint: Checkpoint,
+    event_id: str,
+    index: int,
+    rows: List[int],
+    frame: pd.DataFrame,
+    stop: threading.Event
+) -> Dict[str, Any]:
+    """Import one chunk as a server job (or pick its job up again) and wait for it."""
+    entry = checkpoint.get(index)
+    if entry.get('status') == 'completed':
+        return {**entry, 'skipped': True}
+
+    job_id = entry.get('job_id')
+    if job_id:
+        job = _api(session, 'GET', f"/jobs/{job_id}")
+        if job['status'] == 'failed':
+            # The server job resumes from its own last checkpoint
+            job = _api(session, 'POST', f"/jobs/{job_id}/retry")
+    else:
+        csv = frame.to_csv(index=False).encode('utf-8')
+        job = _api(
+            session, 'POST', f"/auctions/{event_id}/bulk-upload-players",
+            files={"file": (f"chunk-{index:05d}.csv", csv, "text/csv")},
+        )
+        job_id = job['job_id']
+        checkpoint.update(index, rows=[rows[0], rows[-1]], job_id=job_id, status=job['status'])
+
+    while job['status'] not in JOB_DONE:
+        if stop.wait(POLL_SECONDS):
+            raise RuntimeError("Interrupted")
+        job = _api(session, 'GET', f"/jobs/{job_id}")
+
+    # Job errors carry the row within the chunk CSV (header = row 1)
+    errors = [
+        {**error, 'row': rows[error['row'] - 2] if 2 <= (error.get('row') or 0) < len(rows) + 2 else error.get('row')}
+        for error in job.get('errors', [])
+    ]
+    checkpoint.update(
+        index,
+        status=job['status'],
+        created=job.get('created_count', 0),
+        errors=errors,
+        message=job.get('message'),
+    )
+    return checkpoint.get(index)
+
+
+def chunked_upload_players(
+    excel_file: str,
+    token: str,
+    event_id: str,
+    sheet_name: str = 0,
+    start_row: int = 0,
+    chunk_size: int = CHUNK_SIZE,
+    workers: int = WORKERS,
+    checkpoint_path: Optional[str] = None,
+    restart: bool = False
+) -> Dict[str, Any]:
+    """
+    Upload players in chunks through the server bulk endpoint.
+
+    Up to `workers` chunks are in flight at once; reading the sheet never
+    runs further ahead than that. Progress is kept in the checkpoint file
+    (default: <excel>.checkpoint.json), so an interrupted import resumes
+    where it stopped when the same command is run again.
+
+    Returns:
+        Dict with upload results (same keys as bulk_upload_players)
+    """
+    checkpoint_path = checkpoint_path or f"{excel_file}.checkpoint.json"
+    try:
+        checkpoint = Checkpoint(
+            checkpoint_path,
+            source={
+                "sha256": file_sha256(excel_file),
+                "event_id": event_id,
+                "sheet": str(sheet_name),
+                "start_row": start_row,
+                "chunk_size": chunk_size,
+            },
+            restart=restart,
+        )
+    except (OSError, ValueError) as e:
+        return {"success": False, "error": str(e)}
+
+    done_before = sum(1 for c in checkpoint.chunks.values() if c.get('status') == 'completed')
+    if done_before:
+        print(f"♻️  Resuming: {done_before} chunk(s) already imported ({checkpoint_path})")
+
+    results = {"total": 0, "successful": 0, "failed": 0, "errors": [], "skipped_chunks": 0}
+    session = make_session(token, workers)
+    pending = {}
+    stop = threading.Event()
+
+    def collect(futures):
+        for future in futures:
+            index, count = pending.pop(future)
+            try:
+                entry = future.result()
+            except Exception as e:
+                print(f"  ❌ Chunk {index}: {e}")
+                results["failed"] += count
+                results["errors"].append({"row": f"chunk {index}", "name": "-", "error": str(e)})
+                continue
+            results["successful"] += entry.get('created', 0)
+            results["failed"] += len(entry.get('errors', []))
+            results["errors"].extend(entry.get('errors', []))
+            if entry.get('skipped'):
+                results["skipped_chunks"] += 1
+            else:
+                print(f"  ✅ Chunk {index} (rows {entry['rows'][0]}-{entry['rows'][1]}): "
+                      f"{entry.get('created', 0)} created, {len(entry.get('errors', []))} errors")
+
+    print(f"📖 Streaming {excel_file} in chunks of {chunk_size} ({workers} in parallel)\n")
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        chunks = iter_sheet_chunks(excel_file, sheet_name, chunk_size, start_row)
+        for index, (rows, frame) in enumerate(chunks):
+            results["total"] += len(rows)
+            future = executor.submit(upload_chunk, session, checkpoint, event_id, index, rows, frame, stop)
+            pending[future] = (index, len(rows))
+            if len(pending) >= workers:
+                finished, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                collect(finished)
+        collect(list(pending))
+    except KeyboardInterrupt:
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+        print(f"\n⏸️  Interrupted - progress saved to {checkpoint_path}; run the same command to resume")
+        raise
+    except Exception as e:
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+        return {"success": False, "error": f"Failed to read Excel file: {str(e)}"}
+    executor.shutdown()
+    session.close()
+    return results
+
+
 def print_results(results: Dict[str, Any]):
     """Print upload results summary."""
     
@@ -254,6 +547,8 @@ def print_results(results: Dict[str, Any]):
     print(f"Total players:      {results['total']}")
     print(f"✅ Successful:      {results['successful']}")
     print(f"❌ Failed:          {results['failed']}")
+    if results.get('skipped_chunks'):
+        print(f"♻️  Resumed chunks:  {results['skipped_chunks']} (from checkpoint)")
     print("="*60)
     
     if results['errors']:
@@ -263,6 +558,8 @@ def print_results(results: Dict[str, Any]):
             print(f"  Error: {error['error']}")
 
 def main():
+    global API_URL
+    
     parser = argparse.ArgumentParser(
         description="Bulk upload players from Excel to Auction App",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -276,6 +573,9 @@ Examples:
   
   # Upload from specific sheet, starting at row 5
   python bulk_upload_players.py --excel players.xlsx --token YOUR_TOKEN --sheet "Sheet2" --start-row 5
+  
+  # Large sheets: chunks of 100 via the bulk endpoint, 4 at a time, resumable
+  python bulk_upload_players.py --excel players.xlsx --token YOUR_TOKEN --chunked --event-id EVENT_ID
         """
     )
     
@@ -316,10 +616,50 @@ Examples:
         help=f'Backend API URL (default: {API_URL})'
     )
     
+    parser.add_argument(
+        '--chunked',
+        action='store_true',
+        help='Upload in chunks through the bulk endpoint, in parallel, with a resumable checkpoint'
+    )
+    
+    parser.add_argument(
+        '--event-id',
+        help='Event (auction) id - required with --chunked'
+    )
+    
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=CHUNK_SIZE,
+        help=f'Rows per chunk in chunked mode (default: {CHUNK_SIZE})'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=WORKERS,
+        help=f'Chunks in flight at once in chunked mode (default: {WORKERS})'
+    )
+    
+    parser.add_argument(
+        '--checkpoint',
+        help='Checkpoint file for chunked mode (default: <excel>.checkpoint.json)'
+    )
+    
+    parser.add_argument(
+        '--restart',
+        action='store_true',
+        help='Ignore an existing checkpoint and import every chunk again'
+    )
+    
     args = parser.parse_args()
     
+    if args.chunked and not args.event_id:
+        parser.error('--chunked requires --event-id')
+    if args.chunk_size < 1 or args.workers < 1:
+        parser.error('--chunk-size and --workers must be at least 1')
+    
     # Update global API URL if provided
-    global API_URL
     API_URL = args.api_url
     
     print("🎯 Auction App - Bulk Player Upload")
@@ -327,7 +667,7 @@ Examples:
     print(f"Excel file:  {args.excel}")
     print(f"Sheet:       {args.sheet}")
     print(f"Start row:   {args.start_row}")
-    print(f"Mode:        {'DRY RUN' if args.dry_run else 'UPLOAD'}")
+    print(f"Mode:        {'DRY RUN' if args.dry_run else 'CHUNKED UPLOAD' if args.chunked else 'UPLOAD'}")
     print(f"API URL:     {API_URL}")
     print("="*60)
     
@@ -339,13 +679,26 @@ Examples:
             return
     
     # Run bulk upload
-    results = bulk_upload_players(
-        excel_file=args.excel,
-        token=args.token,
-        sheet_name=args.sheet,
-        start_row=args.start_row,
-        dry_run=args.dry_run
-    )
+    if args.chunked and not args.dry_run:
+        results = chunked_upload_players(
+            excel_file=args.excel,
+            token=args.token,
+            event_id=args.event_id,
+            sheet_name=args.sheet,
+            start_row=args.start_row,
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+            checkpoint_path=args.checkpoint,
+            restart=args.restart
+        )
+    else:
+        results = bulk_upload_players(
+            excel_file=args.excel,
+            token=args.token,
+            sheet_name=args.sheet,
+            start_row=args.start_row,
+            dry_run=args.dry_run
+        )
     
     # Print results
     print_results(results)
@@ -1,5 +1,6 @@
 import { useState, useEffect, useRef } from 'react';
 import { Card } from '@/components/ui/card';
+import { getPlayerPhotoUrl } from '@/utils/imageUtils';
 
 // Web Audio API helper for generated sounds
 class SoundGenerator {
@@ -337,7 +338,7 @@ const PlayerSpinner = ({ players, winnerId, onComplete, spinKey }) => {
 
               {winner.photo_url ? (
                 <img
-                  src={winner.photo_url}
+                  src={getPlayerPhotoUrl(winner, 'card')}
                   alt={winner.name}
                   className="mb-4 h-28 w-28 rounded-full border-4 border-amber-400 object-cover shadow-xl sm:mb-6 sm:h-40 sm:w-40"
                   onError={(e) => {
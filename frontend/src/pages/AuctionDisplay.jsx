@@ -6,7 +6,7 @@ import { useParams } from 'react-router-dom';
 import axios from 'axios';
 import { Badge } from '@/components/ui/badge';
 import { Trophy, Target } from 'lucide-react';
-import { convertGoogleDriveUrl } from '@/utils/imageUtils';
+import { convertGoogleDriveUrl, getPlayerPhotoUrl } from '@/utils/imageUtils';
 import { formatTimer, useAuctionCountdown } from '@/lib/auctionTimer';
 import SoldOverlay from '@/components/broadcast/SoldOverlay';
 import BroadcastShell from '@/components/broadcast/BroadcastShell';
@@ -144,9 +144,11 @@ const AuctionDisplay = () => {
     );
   }, [currentPlayer, categories]);
 
-  const photoSrc = convertGoogleDriveUrl(
-    currentPlayer?.photo_url || currentPlayer?.image_url || soldFlash?.photoUrl
-  );
+  const photoSrc = currentPlayer?.photo_variants
+    ? getPlayerPhotoUrl(currentPlayer, 'broadcast')
+    : convertGoogleDriveUrl(
+        currentPlayer?.photo_url || currentPlayer?.image_url || soldFlash?.photoUrl
+      );
 
   const secondsLeft = useAuctionCountdown(
     auctionState?.timer_started_at,
@@ -16,6 +16,7 @@ const EventPayments = () => {
   const { token } = useAuth();
   const [loading, setLoading] = useState(true);
   const [paymentData, setPaymentData] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     if (token && eventId) {
@@ -40,6 +41,29 @@ const EventPayments = () => {
     }
   };
 
+  // The list is paged newest first; statistics come with the first page only
+  const fetchMorePayments = async () => {
+    try {
+      setLoadingMore(true);
+      const response = await axios.get(`${API}/auctions/${eventId}/payments`, {
+        params: { cursor: paymentData.next_cursor },
+        headers: {
+          Authorization: `Bearer ${token}`
+        }
+      });
+      setPaymentData((prev) => ({
+        ...prev,
+        payments: [...prev.payments, ...response.data.payments],
+        next_cursor: response.data.next_cursor
+      }));
+    } catch (error) {
+      console.error('Error fetching payments:', error);
+      toast.error('Failed to load more payments');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const formatDate = (dateString) => {
     if (!dateString) return 'N/A';
     const date = new Date(dateString);
@@ -108,7 +132,7 @@ const EventPayments = () => {
     );
   }
 
-  const { event_name, payments, statistics } = paymentData;
+  const { event_name, payments, statistics, next_cursor } = paymentData;
 
   return (
     <AppShell title="Payments" subtitle={event_name || 'Registration payments'}>
@@ -241,6 +265,18 @@ const EventPayments = () => {
                     ))}
                   </tbody>
                 </table>
+                {next_cursor && (
+                  <div className="flex justify-center pt-4">
+                    <Button
+                      variant="outline"
+                      onClick={fetchMorePayments}
+                      disabled={loadingMore}
+                      className="border-white/20 bg-white/10 text-white hover:bg-white/15"
+                    >
+                      {loadingMore ? 'Loading...' : `Load more (${payments.length} of ${statistics.total_payments})`}
+                    </Button>
+                  </div>
+                )}
               </div>
             )}
           </CardContent>
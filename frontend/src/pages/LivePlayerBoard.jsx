@@ -5,7 +5,7 @@ import SoldOverlay from '@/components/broadcast/SoldOverlay';
 import PlayerSpinner from '@/components/PlayerSpinner';
 import { formatInr, usePublicLiveBoard } from '@/lib/publicLiveApi';
 import { formatTimer, useAuctionCountdown } from '@/lib/auctionTimer';
-import { convertGoogleDriveUrl } from '@/utils/imageUtils';
+import { getPlayerPhotoUrl } from '@/utils/imageUtils';
 import { cn } from '@/lib/utils';
 
 const stateLabel = {
@@ -65,7 +65,7 @@ export default function LivePlayerBoard() {
     auction.timer_started_at &&
     secondsLeft != null;
 
-  const photoSrc = convertGoogleDriveUrl(player?.photo_url);
+  const photoSrc = getPlayerPhotoUrl(player, 'broadcast');
   const status = (auction.status || '').toLowerCase();
   const stats = player?.stats || {};
   const statEntries = Object.entries(stats).filter(([, v]) => v != null).slice(0, 4);
@@ -16,7 +16,7 @@ import { useAuth } from '@/lib/AuthContext';
 import { toast } from 'sonner';
 import ImageUpload from '@/components/ImageUpload';
 import DocumentUpload from '@/components/DocumentUpload';
-import { convertGoogleDriveUrl } from '@/utils/imageUtils';
+import { convertGoogleDriveUrl, getPlayerPhotoUrl } from '@/utils/imageUtils';
 import jsPDF from 'jspdf';
 import {
   buildAdminPlayerPayload,
@@ -900,7 +900,7 @@ const PlayerManagement = () => {
                         <div className="flex justify-center mb-4">
                           <div className="relative w-20 h-20">
                             <img
-                              src={convertGoogleDriveUrl(player.photo_url)}
+                              src={getPlayerPhotoUrl(player, 'card')}
                               alt={`${player.name} photo`}
                               className="w-20 h-20 rounded-xl object-cover border-2 border-white/30 shadow-lg bg-white/10 p-1"
                               loading="lazy"
@@ -171,17 +171,23 @@ const PlayerRegistrationManagement = () => {
         base_price: parseInt(bulkBasePrice)
       });
 
-      const promises = selectedRegistrations.map(regId =>
-        axios.post(`${API}/registrations/${regId}/approve`, {
-          category_id: bulkCategory,
-          base_price: parseInt(bulkBasePrice)
-        }, {
-          headers: { Authorization: `Bearer ${token}` }
-        })
-      );
+      // One request for the whole selection; outcomes are reported per registration
+      const response = await axios.post(`${API}/auctions/${eventId}/registrations/bulk`, {
+        action: 'approve',
+        category_id: bulkCategory,
+        base_price: parseInt(bulkBasePrice),
+        items: selectedRegistrations.map(regId => ({ registration_id: regId }))
+      }, {
+        headers: { Authorization: `Bearer ${token}` }
+      });
 
-      await Promise.all(promises);
-      toast.success(`${selectedRegistrations.length} registrations approved successfully!`);
+      const { processed, failed, results } = response.data;
+      if (failed > 0) {
+        console.error('Bulk approval errors:', results.filter(r => r.status === 'error'));
+        toast.warning(`${processed} registrations approved, ${failed} failed`);
+      } else {
+        toast.success(`${processed} registrations approved successfully!`);
+      }
       setSelectedRegistrations([]);
       setBulkCategory('');
       setBulkBasePrice('');
@@ -234,8 +240,8 @@ const PlayerRegistrationManagement = () => {
   const handleFileChange = (event) => {
     const file = event.target.files[0];
     if (file) {
-      if (!file.name.endsWith('.xlsx') && !file.name.endsWith('.xls')) {
-        toast.error('Please upload an Excel file (.xlsx or .xls)');
+      if (!/\.(xlsx|xls|csv)$/i.test(file.name)) {
+        toast.error('Please upload an Excel or CSV file (.xlsx, .xls or .csv)');
         return;
       }
       setUploadFile(file);
@@ -265,15 +271,33 @@ const PlayerRegistrationManagement = () => {
         }
       );
 
-      setUploadResults(response.data);
+      if (response.data.duplicate) {
+        toast.info('This file was already uploaded for this event. Showing that upload.');
+      }
+
+      // Rows are processed by a background job; poll until it finishes
+      let job = response.data;
+      setUploadResults(job);
+      while (job.status === 'queued' || job.status === 'running') {
+        await new Promise((resolve) => setTimeout(resolve, 1500));
+        const jobResponse = await axios.get(`${API}/jobs/${response.data.job_id}`, {
+          headers: { Authorization: `Bearer ${token}` }
+        });
+        job = jobResponse.data;
+        setUploadResults(job);
+      }
+
+      if (job.status === 'failed') {
+        toast.error(job.message || 'Bulk upload stopped. Retry to continue from where it left off.');
+      }
 
-      if (response.data.created_count > 0) {
-        toast.success(`Successfully uploaded ${response.data.created_count} players!`);
+      if (job.created_count > 0) {
+        toast.success(`Successfully uploaded ${job.created_count} players!`);
         fetchData(); // Refresh the player list
       }
 
-      if (response.data.error_count > 0) {
-        toast.warning(`${response.data.error_count} rows had errors. Check the results below.`);
+      if (job.error_count > 0) {
+        toast.warning(`${job.error_count} rows had errors. Check the results below.`);
       }
 
       // Clear the file input
@@ -789,12 +813,12 @@ const PlayerRegistrationManagement = () => {
                         {/* File Upload */}
                         <div className="space-y-2">
                           <Label htmlFor="excel-file" className="text-base font-semibold">
-                            Upload Excel File
+                            Upload Excel or CSV File
                           </Label>
                           <Input
                             id="excel-file"
                             type="file"
-                            accept=".xlsx,.xls"
+                            accept=".xlsx,.xls,.csv"
                             onChange={handleFileChange}
                             disabled={isUploading}
                             className="cursor-pointer"
@@ -816,7 +840,9 @@ const PlayerRegistrationManagement = () => {
                           {isUploading ? (
                             <>
                               <Clock className="w-4 h-4 mr-2 animate-spin" />
-                              Uploading...
+                              {uploadResults?.total
+                                ? `Processing ${uploadResults.processed} / ${uploadResults.total}...`
+                                : 'Uploading...'}
                             </>
                           ) : (
                             <>
@@ -111,6 +111,22 @@ export const getGoogleDriveThumbnail = (url, size = 'w400') => {
   return url;
 };
 
+/**
+ * Best photo URL for a player at a display size.
+ * Ingested photos have server-side WebP derivatives (photo_variants:
+ * thumb 96px, card 320px, broadcast 960px); others fall back to photo_url.
+ * @param {object} player - Player with photo_url / photo_variants
+ * @param {string} variant - 'thumb' | 'card' | 'broadcast'
+ * @returns {string|undefined}
+ */
+export const getPlayerPhotoUrl = (player, variant = 'card') => {
+  const derived = player?.photo_variants?.[variant];
+  if (derived) {
+    return `${process.env.REACT_APP_BACKEND_URL}${derived}`;
+  }
+  return convertGoogleDriveUrl(player?.photo_url);
+};
+
 /**
  * Component wrapper for img tag with Google Drive URL conversion
  * Usage: <PlayerImage src={player.photo_url} alt={player.name} className="..." />